@@ -1,20 +1,61 @@
 # encoding : UTF-8
 
+import random
+
 from Engine.AI.custom_tasks import *
+from Engine.AI.reachability import ReachabilityTable
+from Engine.snapshot import write_vector3, read_vector3
 
 
 class AIEntity:
 	"""
 	Object that represent a character played by an Artificial Intelligence
 	"""
-	def __init__(self, character):
+	def __init__(self, character, rng=None, behaviour_tree_factory=None):
+		"""
+		:param Character character: character played by this AI entity
+		:param random.Random rng: random generator used for AI decisions, a new one is created if None
+		:param callable behaviour_tree_factory: function which builds behaviour tree of given AI entity, and returns its
+		root task. Default is 1v1 behaviour tree.
+		"""
 		self.character = character
+		self.behaviour_tree_factory = behaviour_tree_factory
+		self.reachability = ReachabilityTable.get_table(character)
+		self.rng = rng if rng is not None else random.Random()
 		self.blackboard = {}
 		self.behaviour_tree = None
 		self.is_behaviour_tree_initialized = False
 		self._trajectory_changed = False
 		self._is_frame_ended = False
 	
+	def save_state(self, values):
+		"""
+		Append random generator state, flags, blackboard and behaviour tree state to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		values += [self.rng.getstate(), self.is_behaviour_tree_initialized, self._trajectory_changed,
+				   self._is_frame_ended, len(self.blackboard)]
+		for key, val in self.blackboard.items():
+			values.append(key)
+			write_vector3(values, val)
+		self.behaviour_tree.save_state(values)
+
+	def load_state(self, values):
+		"""
+		Read random generator state, flags, blackboard and behaviour tree state from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		self.rng.setstate(next(values))
+		self.is_behaviour_tree_initialized = next(values)
+		self._trajectory_changed = next(values)
+		self._is_frame_ended = next(values)
+		self.blackboard = {next(values): read_vector3(values) for _ in range(next(values))}
+		self.behaviour_tree.load_state(values)
+
 	def trajectory_changed(self):
 		"""
 		Check if ball trajectory has changed
@@ -111,7 +152,10 @@ class AIEntity:
 		self.behaviour_tree = b_tree
 
 	def create(self):
-		self._create_behaviour_tree_1v1()
+		if self.behaviour_tree_factory is not None:
+			self.behaviour_tree = self.behaviour_tree_factory(self)
+		else:
+			self._create_behaviour_tree_1v1()
 
 	def update(self):
 		"""
@@ -16,14 +16,16 @@ class AIManager:
 
 		self.entities = []
 
-	def add_entity(self, character):
+	def add_entity(self, character, rng=None, behaviour_tree_factory=None):
 		"""
 		Add an AI Entity, to link to a specific character.
 
 		:param Game.Character character: character to assign to new AIEntity
+		:param random.Random rng: random generator of new AIEntity
+		:param callable behaviour_tree_factory: function which builds behaviour tree of new AIEntity, see AIEntity
 		:return: None
 		"""
-		new_entity = AIEntity(character)
+		new_entity = AIEntity(character, rng, behaviour_tree_factory)
 		new_entity.create()
 
 		self.entities += [new_entity]
@@ -31,10 +33,19 @@ class AIManager:
 	def reset(self):
 		self.entities = []
 
-	def update(self):
+	def save_state(self, values):
+		for entity in self.entities:
+			entity.save_state(values)
+
+	def load_state(self, values):
+		for entity in self.entities:
+			entity.load_state(values)
+
+	def update(self, player_ids=None):
 		"""
-		Update all AI Entities.
+		Update AI Entities.
 
+		:param list player_ids: if specified, only AI entities which characters have these player ids are updated
 		:return: None
 		"""
 		# check if trajectory changed
@@ -45,4 +56,5 @@ class AIManager:
 				
 		# update
 		for entity in self.entities:
-			entity.update()
+			if player_ids is None or entity.character.player_id in player_ids:
+				entity.update()
@@ -4,6 +4,8 @@
 
 
 class TaskController:
+	__slots__ = ("__done", "__success", "__started", "__task")
+
 	def __init__(self, task):
 		self.__done = None
 		self.__success = None
@@ -55,6 +57,26 @@ class TaskController:
 	def reset(self):
 		self.__done = False
 
+	def save_state(self, values):
+		"""
+		Append controller flags to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		values += [self.__done, self.__success, self.__started]
+
+	def load_state(self, values):
+		"""
+		Read controller flags from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		self.__done = next(values)
+		self.__success = next(values)
+		self.__started = next(values)
+
 
 class ParentTaskController(TaskController):
 	def __init__(self, task):
@@ -70,6 +92,15 @@ class ParentTaskController(TaskController):
 		TaskController.reset(self)
 		self.set_first_ready_task()
 
+	def save_state(self, values):
+		TaskController.save_state(self, values)
+		values.append(self.subtasks.index(self.cur_task) if self.cur_task is not None else -1)
+
+	def load_state(self, values):
+		TaskController.load_state(self, values)
+		i = next(values)
+		self.cur_task = self.subtasks[i] if i >= 0 else None
+
 	def set_first_ready_task(self):
 		for task in self.subtasks:
 			if task.check_conditions():
@@ -82,8 +113,29 @@ class ParentTaskController(TaskController):
 		
 		
 class Task:
+	_state_fields = ()  # attributes saved in snapshots
+
 	def __init__(self, ai_entity):
 		self.ai_entity = ai_entity
+
+	def save_state(self, values):
+		"""
+		Append state of task, its controller and its subtasks to snapshot values, in depth-first order.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		values.extend(getattr(self, name) for name in self._state_fields)
+
+	def load_state(self, values):
+		"""
+		Read state of task, its controller and its subtasks from snapshot values, in depth-first order.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		for name in self._state_fields:
+			setattr(self, name, next(values))
 		
 	def check_conditions(self):
 		assert -1, "to implement"
@@ -114,6 +166,14 @@ class LeafTask(Task):
 		
 	def get_control(self):
 		return self._control
+
+	def save_state(self, values):
+		self._control.save_state(values)
+		Task.save_state(self, values)
+
+	def load_state(self, values):
+		self._control.load_state(values)
+		Task.load_state(self, values)
 	
 
 class ParentTask(Task):
@@ -127,6 +187,16 @@ class ParentTask(Task):
 		
 	def get_control(self):
 		return self.control
+
+	def save_state(self, values):
+		self.control.save_state(values)
+		for task in self.control.subtasks:
+			task.save_state(values)
+
+	def load_state(self, values):
+		self.control.load_state(values)
+		for task in self.control.subtasks:
+			task.load_state(values)
 	
 	def check_conditions(self):
 		# print("checking conditions")
@@ -229,6 +299,12 @@ class TaskDecorator(Task):
 	def start(self):
 		self.task.start()
 
+	def save_state(self, values):
+		self.task.save_state(values)
+
+	def load_state(self, values):
+		self.task.load_state(values)
+
 
 class ResetDecorator(TaskDecorator):
 	def do_action(self):
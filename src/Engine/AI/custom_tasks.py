@@ -5,10 +5,7 @@ from Engine.Trajectory.thrower_manager import ThrowerManager
 from Settings.general_settings import *
 from Game.character_states import Serving
 from Engine import game_engine
-
-
-import pygame as pg
-from random import randint
+from Engine.message_bus import MessageBus, ActionMessage
 
 
 def should_ai_catch_the_ball(ai_entity):
@@ -53,8 +50,7 @@ def move_to(ai_entity, target, thr=0.1):
 				  PlayerAction.MOVE_RIGHT: dxy[1] > thr, PlayerAction.MOVE_LEFT: dxy[1] < -thr}
 	for action in events_map.keys():
 		if events_map[action]:
-			ev = pg.event.Event(ACTION_EVENT, {"player_id": character.player_id, "action": action})
-			pg.event.post(ev)
+			MessageBus.get_instance().post(ActionMessage(character.player_id, action))
 
 	# if position reached
 	return abs(dxy[0]) < thr and abs(dxy[1]) < thr
@@ -105,7 +101,7 @@ def should_ai_smash(ai_entity):
 		# check if ball height at specified y is acceptable (between 2 thresholds)
 		if ball_z_at_net < net_h + ball.radius + margin_h:
 			return False
-		if ball_z_at_net - ball.radius > ai_entity.character.get_max_height_jump():
+		if ball_z_at_net - ball.radius > ai_entity.reachability.max_jump_height:
 			return False
 	else:
 		return False
@@ -119,7 +115,7 @@ def should_ai_smash(ai_entity):
 	run_time = ai_entity.character.get_time_to_run_to(target_pos)
 
 	# time to jump (in sec)
-	jump_time = ai_entity.character.get_time_to_jump_to_height(ball_z_at_net - ball.radius)
+	jump_time = ai_entity.reachability.get_time_to_jump_to_height(ball_z_at_net - ball.radius)
 
 	# remaining time (in sec)
 	remaining_time = trajectory.get_time_at_y(0) + (trajectory.t0 - ge.get_running_ticks()) / 1000
@@ -148,16 +144,12 @@ def should_ai_dive(ai_entity):
 		final_t = int(trajectory.t0 + 1000 * trajectory.get_final_time())
 		delta_t = final_t - game_engine.GameEngine.get_instance().get_running_ticks()
 
-		# distance between character and target position
+		# delta position between character and target position
 		delta_xy = ai_entity.blackboard["target_position"] - ai_entity.character.position
 		delta_xy.z = 0
-		dis = delta_xy.length()
-
-		# distance travelled by running or diving, shape of collider taken in account
-		run_distance = RUN_SPEED * delta_t / 1000 + CHARACTER_W / 2
-		dive_distance = DIVE_SPEED * min(delta_t, DIVE_SLIDE_DURATION) / 1000 + CHARACTER_H - CHARACTER_W / 2
 
-		if run_distance < dis <= dive_distance:
+		# target position only reached by diving
+		if ai_entity.reachability.get_move_to_reach(delta_xy, delta_t / 1000) == CharacterStateType.DIVING:
 			return True, delta_xy
 	return False, None
 
@@ -187,8 +179,7 @@ def dive(ai_entity, dxy):
 		dive_actions.append(PlayerAction.MOVE_RIGHT)
 
 	for act in dive_actions:
-		ev = pg.event.Event(ACTION_EVENT, {"player_id": ai_entity.character.player_id, "action": act})
-		pg.event.post(ev)
+		MessageBus.get_instance().post(ActionMessage(ai_entity.character.player_id, act))
 
 
 class FindBallTargetPosition(LeafTask):
@@ -275,6 +266,8 @@ class MoveToSmashingPosition(LeafTask):
 
 
 class JumpForSmashing(LeafTask):
+	_state_fields = ("good_time_to_jump",)
+
 	def __init__(self, ai_entity):
 		LeafTask.__init__(self, ai_entity)
 		self.good_time_to_jump = None
@@ -284,13 +277,12 @@ class JumpForSmashing(LeafTask):
 		good_time_to_smash = 1000 * trajectory.get_time_at_y(0) + trajectory.t0
 
 		z = trajectory.get_z_at_y(0)
-		self.good_time_to_jump = good_time_to_smash - 1000 * self.ai_entity.character.get_time_to_jump_to_height(z)
+		self.good_time_to_jump = good_time_to_smash - 1000 * self.ai_entity.reachability.get_time_to_jump_to_height(z)
 
 	def do_action(self):
 		ge = game_engine.GameEngine.get_instance()
 		if self.good_time_to_jump < ge.get_running_ticks():
-			ev = pg.event.Event(ACTION_EVENT, {"player_id": self.ai_entity.character.player_id, "action": PlayerAction.JUMP})
-			pg.event.post(ev)
+			MessageBus.get_instance().post(ActionMessage(self.ai_entity.character.player_id, PlayerAction.JUMP))
 			self.get_control().finish_with_success()
 
 		self.ai_entity.end_frame()
@@ -301,14 +293,13 @@ class RandomSmash(LeafTask):
 		if self.ai_entity.character.is_state_type_of(CharacterStateType.JUMPING):
 			if self.ai_entity.character.is_colliding_ball:
 				actions = [PlayerAction.THROW_BALL]
-				direction_action = (PlayerAction.MOVE_LEFT, None, PlayerAction.MOVE_RIGHT)[randint(0, 2)]
+				direction_action = (PlayerAction.MOVE_LEFT, None, PlayerAction.MOVE_RIGHT)[self.ai_entity.rng.randint(0, 2)]
 				if direction_action is not None:
 					actions.append(direction_action)
 
 				pl_id = self.ai_entity.character.player_id
 				for action in actions:
-					ev = pg.event.Event(ACTION_EVENT, {"player_id": pl_id, "action": action})
-					pg.event.post(ev)
+					MessageBus.get_instance().post(ActionMessage(pl_id, action))
 				self.get_control().finish_with_success()
 		else:
 			self.get_control().finish_with_failure()
@@ -345,16 +336,14 @@ class RandomThrow(LeafTask):
 			self.get_control().finish_with_failure()
 
 		if character.is_colliding_ball:
-			ev = pg.event.Event(ACTION_EVENT, {"player_id": character.player_id, "action": PlayerAction.THROW_BALL})
-			pg.event.post(ev)
+			MessageBus.get_instance().post(ActionMessage(character.player_id, PlayerAction.THROW_BALL))
 
 			# random direction
-			left_right_action = (PlayerAction.MOVE_LEFT, PlayerAction.MOVE_RIGHT, None)[randint(0, 2)]
-			up_down_action = (PlayerAction.MOVE_UP, PlayerAction.MOVE_DOWN, None)[randint(0, 2)]
+			left_right_action = (PlayerAction.MOVE_LEFT, PlayerAction.MOVE_RIGHT, None)[ai_entity.rng.randint(0, 2)]
+			up_down_action = (PlayerAction.MOVE_UP, PlayerAction.MOVE_DOWN, None)[ai_entity.rng.randint(0, 2)]
 			for action in (left_right_action, up_down_action):
 				if action is not None:
-					ev = pg.event.Event(ACTION_EVENT, {"player_id": character.player_id, "action": action})
-					pg.event.post(ev)
+					MessageBus.get_instance().post(ActionMessage(character.player_id, action))
 
 			self.get_control().finish_with_success()
 
@@ -381,6 +370,8 @@ class Idle(LeafTask):
 
 
 class Wait(LeafTask):
+	_state_fields = ("t0",)
+
 	def __init__(self, ai_entity, duration):
 		LeafTask.__init__(self, ai_entity)
 		self.duration = duration
@@ -0,0 +1,137 @@
+# encoding : UTF-8
+
+from math import sqrt
+
+from Settings import *
+
+
+class ReachabilityTable:
+	"""
+	Precomputed reach of a character by running, diving or jumping, according to available time.
+
+	Tables are built once for a set of character parameters, and shared by all characters with same parameters. Queries
+	are answered in constant time by linear interpolation in tables, whatever the number of AI entities.
+
+	Tables :
+		- run distance : distance travelled by running, collider shape taken in account
+		- dive distance : distance travelled by diving, collider shape taken in account
+		- jump time : time in ascending phase for top of character to reach a height
+	"""
+	s_tables = {}
+
+	@staticmethod
+	def get_table(character):
+		"""
+		Get table of a character, built at first call for its parameters.
+
+		:param Character character: character
+		:return: reachability table of character
+		:rtype ReachabilityTable:
+		"""
+		key = (character.max_velocity, character.jump_velocity, character.w, character.h)
+		if key not in ReachabilityTable.s_tables:
+			ReachabilityTable.s_tables[key] = ReachabilityTable(*key)
+		return ReachabilityTable.s_tables[key]
+
+	def __init__(self, run_speed, jump_velocity, w, h, dive_speed=DIVE_SPEED, dive_slide_duration=DIVE_SLIDE_DURATION,
+				 time_step=REACHABILITY_TIME_STEP, max_time=REACHABILITY_MAX_TIME, height_step=REACHABILITY_HEIGHT_STEP):
+		"""
+		:param float run_speed: running velocity in m/s
+		:param float jump_velocity: initial jump velocity in m/s
+		:param float w: character width in m
+		:param float h: character height in m
+		:param float dive_speed: diving velocity in m/s
+		:param float dive_slide_duration: sliding duration of a dive in ms
+		:param float time_step: time step of run and dive tables in ms
+		:param float max_time: max time of run and dive tables in ms
+		:param float height_step: height step of jump table in m
+		"""
+		self.time_step = time_step / 1000
+		self.height_step = height_step
+		self.h = h
+
+		times = [i * self.time_step for i in range(int(max_time / time_step) + 1)]
+		self._run_distances = [run_speed * t + w / 2 for t in times]
+		self._dive_distances = [dive_speed * min(t, dive_slide_duration / 1000) + h - w / 2 for t in times]
+
+		# top of character height during ascending phase : h + jump_velocity * t - G / 2 * t**2
+		self.max_jump_height = h + jump_velocity ** 2 / (2 * G)
+		heights_nb = int((self.max_jump_height - h) / height_step) + 1
+		self._jump_times = [(jump_velocity - sqrt(jump_velocity ** 2 - 2 * G * i * height_step)) / G
+							for i in range(heights_nb)]
+		self._jump_times.append(jump_velocity / G)  # max height, reached at apex
+
+	@staticmethod
+	def _interpolate(table, x, step):
+		"""
+		Get value of a table by linear interpolation.
+
+		:param list[float] table: values at 0, step, 2 * step...
+		:param float x: abscissa, clamped to table range
+		:param float step: abscissa step of table
+		:return: interpolated value
+		:rtype float:
+		"""
+		i = x / step
+		if i <= 0:
+			return table[0]
+		k = int(i)
+		if k >= len(table) - 1:
+			return table[-1]
+		return table[k] + (i - k) * (table[k + 1] - table[k])
+
+	def get_run_distance(self, t):
+		"""
+		Get distance a character can reach by running.
+
+		:param float t: available time in sec
+		:return: distance in m
+		:rtype float:
+		"""
+		return self._interpolate(self._run_distances, t, self.time_step)
+
+	def get_dive_distance(self, t):
+		"""
+		Get distance a character can reach by diving.
+
+		:param float t: available time in sec
+		:return: distance in m
+		:rtype float:
+		"""
+		return self._interpolate(self._dive_distances, t, self.time_step)
+
+	def get_time_to_jump_to_height(self, height):
+		"""
+		Get time for top of character to reach a height by jumping, in ascending phase.
+
+		:param float height: height in m
+		:return: time in sec, 0 if height is under top of standing character, None if height is not reachable
+		:rtype float or None:
+		"""
+		if height > self.max_jump_height:
+			return None
+		# last interval of table is shorter, up to max height
+		dh = height - self.h
+		heights_nb = len(self._jump_times) - 1
+		if dh >= (heights_nb - 1) * self.height_step:
+			last_step = self.max_jump_height - self.h - (heights_nb - 1) * self.height_step
+			ratio = (dh - (heights_nb - 1) * self.height_step) / last_step if last_step > 0 else 1
+			return self._jump_times[-2] + ratio * (self._jump_times[-1] - self._jump_times[-2])
+		return self._interpolate(self._jump_times, dh, self.height_step)
+
+	def get_move_to_reach(self, delta_pos, t):
+		"""
+		Get move needed by a character to reach a position in time.
+
+		:param pygame.Vector3 delta_pos: position to reach relative to character position, z is ignored
+		:param float t: available time in sec
+		:return: CharacterStateType.RUNNING if position is reached by running, CharacterStateType.DIVING if it is only
+		reached by diving, None if it is not reachable
+		:rtype CharacterStateType or None:
+		"""
+		distance = sqrt(delta_pos.x ** 2 + delta_pos.y ** 2)
+		if distance <= self.get_run_distance(t):
+			return CharacterStateType.RUNNING
+		if distance <= self.get_dive_distance(t):
+			return CharacterStateType.DIVING
+		return None
@@ -1,3 +1,4 @@
 # encoding : UTF-8
 
 from .action_object import ActionObject
+from .action_recorder import ActionRecorder
@@ -1,10 +1,13 @@
 # encoding : UTF-8
 
+from heapq import merge
+
 from Settings import *
 
 
 class ActionObject:
-	
+	__slots__ = ("player_id",)
+
 	objects = []
 	
 	def __init__(self, player_id=PlayerId.PLAYER_ID_ALL, add_to_objects_list=True):
@@ -13,7 +16,43 @@ class ActionObject:
 			ActionObject.objects.append(self)
 		
 	def update_actions(self, action_events, **kwargs):
+		"""
+		Update object with action events of its player, given by dispatch_action_events.
+
+		:param list[ActionMessage] action_events: action events of object player id and of PLAYER_ID_ALL, or all action
+		events if object player id is PLAYER_ID_ALL
+		:return: None
+		"""
 		assert -1, "method to implement"
+
+	@staticmethod
+	def dispatch_action_events(action_objects, action_events, **kwargs):
+		"""
+		Call update_actions of each action object with action events of its player only.
+
+		Action events are bucketed once by player id, then each action object gets events of its player id and of
+		PLAYER_ID_ALL, in original order. An object with PLAYER_ID_ALL gets all events. Buckets are shared by objects
+		with same player id, so cost is linear with events and objects numbers.
+
+		:param list[ActionObject] action_objects: action objects to update
+		:param list[ActionMessage] action_events: action events of frame
+		:param kwargs: parameters passed to update_actions
+		:return: None
+		"""
+		buckets = {}
+		for i, ev in enumerate(action_events):
+			buckets.setdefault(ev.player_id, []).append(i)
+		all_player_indices = buckets.get(PlayerId.PLAYER_ID_ALL, [])
+
+		slices = {PlayerId.PLAYER_ID_ALL: action_events}
+		for action_object in action_objects:
+			player_id = action_object.player_id
+			if player_id not in slices:
+				indices = buckets.get(player_id, [])
+				if all_player_indices:
+					indices = merge(indices, all_player_indices)
+				slices[player_id] = [action_events[i] for i in indices]
+			action_object.update_actions(slices[player_id], **kwargs)
 		
 	def filter_action_events_by_player_id(self, action_events, use_player_id_all=True):
 		filtered_action_events = []
@@ -0,0 +1,117 @@
+# encoding : UTF-8
+
+import json
+
+from Engine.message_bus import MessageBus, ActionMessage
+from Settings import *
+
+
+class ActionRecorder:
+	"""
+	Record action events of each frame, to replay a game.
+
+	A game is replayed bit-for-bit by creating a game engine with the same seed, players and fixed time step, and
+	by posting recorded action events instead of reading inputs and updating AI.
+
+	Recorder is defined by :
+		- :var int seed: seed of game engine random generator
+		- :var list player_id_list: ids of players (PlayerId or AIId)
+		- :var float fixed_dt: time in ms between 2 frames
+		- :var dict frames: (player_id, action) tuples list for each frame number, only frames with actions are stored
+	"""
+	def __init__(self, seed, player_id_list, fixed_dt):
+		self.seed = seed
+		self.player_id_list = list(player_id_list)
+		self.fixed_dt = fixed_dt
+		self.frames = {}
+
+	def record(self, frame, action_events):
+		"""
+		Record action events of a frame.
+
+		:param int frame: frame number
+		:param list[ActionMessage] action_events: action events of frame
+		:return: None
+		"""
+		if len(action_events) > 0:
+			self.frames.setdefault(frame, []).extend((ev.player_id, ev.action) for ev in action_events)
+
+	def post_actions(self, frame):
+		"""
+		Post recorded action events of a frame, in recording order.
+
+		:param int frame: frame number
+		:return: None
+		"""
+		message_bus = MessageBus.get_instance()
+		for player_id, action in self.frames.get(frame, ()):
+			message_bus.post(ActionMessage(player_id, action))
+
+	def get_frames_count(self):
+		"""
+		Get number of recorded frames, i.e. last frame with actions + 1.
+
+		:rtype int:
+		"""
+		return max(self.frames.keys()) + 1 if len(self.frames) > 0 else 0
+
+	def save(self, filename):
+		"""
+		Save recording in a JSON file.
+
+		:param str filename: path of file
+		:return: None
+		"""
+		data = {"seed": self.seed,
+				"player_id_list": [_encode_player_id(pl_id) for pl_id in self.player_id_list],
+				"fixed_dt": self.fixed_dt,
+				"frames": {str(frame): [[*_encode_player_id(pl_id), action.name] for pl_id, action in actions]
+						   for frame, actions in self.frames.items()}}
+		with open(filename, "w") as file:
+			json.dump(data, file)
+
+	@staticmethod
+	def load(filename):
+		"""
+		Load recording from a JSON file written by save method.
+
+		:param str filename: path of file
+		:return: loaded recording
+		:rtype ActionRecorder:
+		"""
+		with open(filename, "r") as file:
+			data = json.load(file)
+
+		recorder = ActionRecorder(data["seed"], [_decode_player_id(*pl_id) for pl_id in data["player_id_list"]],
+								  data["fixed_dt"])
+		for frame, actions in data["frames"].items():
+			recorder.frames[int(frame)] = [(_decode_player_id(enum_name, name), PlayerAction[action])
+										   for enum_name, name, action in actions]
+		return recorder
+
+
+def _encode_player_id(player_id):
+	"""
+	Encode player id, human or bot, as an (enum name, member name) pair.
+
+	usage examples :
+		>>> _encode_player_id(AIId.AI_ID_1)
+		('AIId', 'AI_ID_1')
+
+	:param PlayerId or AIId player_id: player id
+	:return: enum name and member name
+	:rtype tuple(str, str):
+	"""
+	return type(player_id).__name__, player_id.name
+
+
+def _decode_player_id(enum_name, name):
+	"""
+	Decode player id encoded by _encode_player_id.
+
+	:param str enum_name: "PlayerId" or "AIId"
+	:param str name: member name
+	:return: player id
+	:rtype PlayerId or AIId:
+	"""
+	return {"PlayerId": PlayerId, "AIId": AIId}[enum_name][name]
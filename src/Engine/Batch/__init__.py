@@ -0,0 +1,3 @@
+# encoding : UTF-8
+
+from .batch_simulator import BatchSimulator
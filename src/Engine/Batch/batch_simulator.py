@@ -0,0 +1,156 @@
+# encoding : UTF-8
+
+import numpy as np
+
+from Settings import *
+
+
+class BatchSimulator:
+	"""
+	Simulate physics and collisions of many independent matches at once.
+
+	Positions and velocities of all matches are stored in NumPy arrays (struct of arrays), and each step processes
+	all matches in one vectorized call. Physics and collisions mimic Ball.update_physics, Character.update_physics
+	and CollisionsManager.update. Characters are not driven by states, AI or inputs : their positions and velocities
+	are set by caller.
+
+	Arrays, for N matches with C characters each :
+		- :var ball_position:, :var ball_previous_position:, :var ball_velocity: : (N, 3) float
+		- :var ball_will_be_served: : (N,) bool, ball does not move if True
+		- :var character_position:, :var character_velocity: : (N, C, 3) float
+		- :var character_collider_offset:, :var character_collider_size: : (N, C, 3) float, AABB collider relative
+		center and size
+		- :var is_colliding_ground:, :var is_colliding_net: : (N,) bool, ball collisions at last step
+		- :var is_colliding_character: : (N, C) bool, ball and character collisions at last step
+	"""
+	def __init__(self, matches_nb, characters_nb=2, ball_radius=BALL_RADIUS, seed=None):
+		"""
+		:param int matches_nb: number of matches simulated at once
+		:param int characters_nb: number of characters for each match
+		:param float ball_radius: radius of balls
+		:param int seed: seed of random generator used for net collisions
+		"""
+		self.n = matches_nb
+		self.c = characters_nb
+		self.ball_radius = ball_radius
+		self.rng = np.random.default_rng(seed)
+
+		# net : finite plane at y = 0, same as Court collider
+		self.net_x_min, self.net_x_max = -COURT_DIM_X / 2, COURT_DIM_X / 2
+		self.net_z_min, self.net_z_max = NET_HEIGHT_BTM, NET_HEIGHT_TOP
+
+		# balls
+		self.ball_position = np.zeros((self.n, 3))
+		self.ball_previous_position = np.zeros((self.n, 3))
+		self.ball_velocity = np.zeros((self.n, 3))
+		self.ball_will_be_served = np.zeros(self.n, dtype=bool)
+
+		# characters, with default collider (see Character.set_default_collider)
+		self.character_position = np.zeros((self.n, self.c, 3))
+		self.character_velocity = np.zeros((self.n, self.c, 3))
+		self.character_collider_offset = np.zeros((self.n, self.c, 3))
+		self.character_collider_offset[:, :, 2] = CHARACTER_H / 2
+		self.character_collider_size = np.empty((self.n, self.c, 3))
+		self.character_collider_size[:] = (CHARACTER_W, CHARACTER_W, CHARACTER_H)
+
+		# collisions at last step
+		self.is_colliding_ground = np.zeros(self.n, dtype=bool)
+		self.is_colliding_net = np.zeros(self.n, dtype=bool)
+		self.is_colliding_character = np.zeros((self.n, self.c), dtype=bool)
+
+	def set_balls(self, position, velocity):
+		"""
+		Set position and velocity of all balls, as a throw does.
+
+		:param numpy.ndarray position: (N, 3) or (3,) ball positions
+		:param numpy.ndarray velocity: (N, 3) or (3,) ball velocities
+		:return: None
+		"""
+		self.ball_position[:] = position
+		self.ball_previous_position[:] = self.ball_position
+		self.ball_velocity[:] = velocity
+		self.ball_will_be_served[:] = False
+
+	def step(self, dt):
+		"""
+		Update physics and collisions of all matches.
+
+		:param float dt: amount of time in ms
+		:return: None
+		"""
+		self.update_physics(dt)
+		self.update_collisions()
+
+	def update_physics(self, dt):
+		"""
+		Apply gravity and move balls and characters.
+
+		:param float dt: amount of time in ms
+		:return: None
+		"""
+		k = 0.001 * dt
+
+		# balls
+		self.ball_previous_position[:] = self.ball_position
+		moving = ~self.ball_will_be_served
+		self.ball_velocity *= moving[:, None]
+		self.ball_velocity[:, 2] -= k * G * moving
+		self.ball_position += k * self.ball_velocity
+
+		# characters
+		self.character_velocity[:, :, 2] -= k * G
+		self.character_position += k * self.character_velocity
+
+	def update_collisions(self):
+		"""
+		Detect and manage ball / ground, ball / net, ball / characters and characters / ground collisions.
+
+		:return: None
+		"""
+		r = self.ball_radius
+		pos = self.ball_position
+		vel = self.ball_velocity
+
+		# ball / ground collision
+		ground = (pos[:, 2] - r < 0) & (vel[:, 2] < 0)
+		vel *= np.where(ground, 0.7, 1.0)[:, None]
+		vel[:, 2] *= np.where(ground, -1.0, 1.0)
+		pos[:, 2] = np.where(ground, np.maximum(r, pos[:, 2]), pos[:, 2])
+		self.is_colliding_ground = ground
+
+		# ball / net collision, collision point is the nearest net point from ball center
+		collision_point = np.empty_like(pos)
+		collision_point[:, 0] = np.clip(pos[:, 0], self.net_x_min, self.net_x_max)
+		collision_point[:, 1] = 0
+		collision_point[:, 2] = np.clip(pos[:, 2], self.net_z_min, self.net_z_max)
+		net = np.einsum("ij,ij->i", pos - collision_point, pos - collision_point) <= r ** 2
+		self.is_colliding_net = net
+
+		if net.any():
+			cp = collision_point[net]
+			u = cp - self.ball_previous_position[net]
+			u_norm = np.linalg.norm(u, axis=1)
+			u /= np.where(u_norm > 0, u_norm, 1.0)[:, None]
+			ball_pos_at_collision = cp - r * u
+
+			# reflect velocity and set damping, random y component to prevent unstable balance
+			normal = ball_pos_at_collision - cp
+			normal[:, 1] += 0.1 * self.rng.random(len(cp))
+			normal /= np.linalg.norm(normal, axis=1)[:, None]
+			v = vel[net]
+			v -= 2 * np.einsum("ij,ij->i", v, normal)[:, None] * normal
+			vel[net] = 0.8 * v
+
+			pos[net] = ball_pos_at_collision
+
+		# ball / characters collision : squared distance between ball center and AABB
+		center = self.character_position + self.character_collider_offset
+		half_size = self.character_collider_size / 2
+		b = pos[:, None, :]
+		d = np.maximum(np.maximum(center - half_size - b, b - center - half_size), 0)
+		self.is_colliding_character = np.einsum("ijk,ijk->ij", d, d) <= r ** 2
+
+		# characters / ground
+		under_ground = self.character_position[:, :, 2] < 0
+		self.character_position[:, :, 2] = np.where(under_ground, 0, self.character_position[:, :, 2])
+		self.character_velocity[:, :, 2] = np.where(under_ground, 0, self.character_velocity[:, :, 2])
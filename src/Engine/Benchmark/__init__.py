@@ -0,0 +1,4 @@
+# encoding : UTF-8
+
+from .benchmark import Benchmark, MemoryBenchmark, run_benchmarks, compare_to_baseline, merge_results, save_results, load_results
+from .workloads import BENCHMARKS, MEMORY_BENCHMARKS
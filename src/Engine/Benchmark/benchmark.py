@@ -0,0 +1,206 @@
+# encoding : UTF-8
+
+import gc
+import json
+import platform
+import tracemalloc
+from time import perf_counter_ns
+
+from Settings import BENCHMARK_REPEATS, BENCHMARK_REGRESSION_THRESHOLD
+
+
+class Benchmark:
+	"""
+	Repeatable workload of an engine hot path.
+
+	Workload is built by a setup generator, which yields the function to time and then cleans up what it created.
+	Timed function runs a fixed batch of operations, its inputs are drawn once from a seeded random generator, so
+	timings of different runs and of different code versions are comparable.
+	"""
+	def __init__(self, name, setup, ops_nb, number):
+		"""
+		:param str name: unique name of benchmark, key of results and baseline
+		:param callable setup: generator function, which yields the function to time
+		:param int ops_nb: number of operations run by each call of timed function
+		:param int number: number of calls of timed function in a sample
+		"""
+		self.name = name
+		self.setup = setup
+		self.ops_nb = ops_nb
+		self.number = number
+
+	def run(self, repeats=BENCHMARK_REPEATS):
+		"""
+		Time workload, with several samples of :var self.number: calls.
+
+		:param int repeats: number of timed samples
+		:return: best and median duration of an operation in µs over samples, and spread of samples: interquartile
+		range relative to median
+		:rtype dict:
+		"""
+		setup = self.setup()
+		func = next(setup)
+		func()  # warm up caches
+
+		samples = []
+		gc_enabled = gc.isenabled()
+		gc.disable()  # as timeit does, garbage collections are not timed
+		try:
+			for _ in range(repeats):
+				t0 = perf_counter_ns()
+				for _ in range(self.number):
+					func()
+				samples.append((perf_counter_ns() - t0) / (1000 * self.number * self.ops_nb))
+		finally:
+			if gc_enabled:
+				gc.enable()
+		next(setup, None)
+
+		samples.sort()
+		median = samples[len(samples) // 2]
+		spread = (samples[(3 * len(samples)) // 4] - samples[len(samples) // 4]) / median
+		return {"best_us": samples[0], "median_us": median, "spread": spread, "repeats": repeats,
+				"ops": self.ops_nb * self.number}
+
+
+class MemoryBenchmark:
+	"""
+	Memory footprint of objects of an engine class.
+
+	Objects are built by a setup generator, which yields the function building one object and then cleans up what it
+	created. Memory allocated while building objects is traced with tracemalloc, and objects are kept alive until it is
+	measured.
+	"""
+	def __init__(self, name, setup, objects_nb=200):
+		"""
+		:param str name: unique name of benchmark, key of results and baseline
+		:param callable setup: generator function, which yields the function building an object
+		:param int objects_nb: number of built objects
+		"""
+		self.name = name
+		self.setup = setup
+		self.objects_nb = objects_nb
+
+	def run(self):
+		"""
+		Measure memory allocated by building objects.
+
+		:return: allocated bytes per object
+		:rtype dict:
+		"""
+		setup = self.setup()
+		build = next(setup)
+		build()  # warm up caches, as interned strings or lazily built class data
+
+		objects = [None] * self.objects_nb  # list is allocated before tracing
+		tracemalloc.start()
+		try:
+			for i in range(self.objects_nb):
+				objects[i] = build()
+			size = tracemalloc.get_traced_memory()[0]
+		finally:
+			tracemalloc.stop()
+		del objects
+		next(setup, None)
+
+		return {"bytes_per_object": size / self.objects_nb, "objects": self.objects_nb}
+
+
+def run_benchmarks(benchmarks, names=None, repeats=BENCHMARK_REPEATS, verbose=False, memory_benchmarks=()):
+	"""
+	Run benchmarks and gather their results.
+
+	:param list(Benchmark) benchmarks: benchmarks to run
+	:param list(str) names: if specified, only benchmarks with these names are run
+	:param int repeats: number of timed samples of each benchmark
+	:param bool verbose: if True, result of each benchmark is printed as soon as it is run
+	:param list(MemoryBenchmark) memory_benchmarks: memory benchmarks to run, their results are not compared to
+	baseline
+	:return: results, with environment description, timings of each benchmark and memory footprints
+	:rtype dict:
+	"""
+	results = {"python": platform.python_version(), "machine": platform.machine(), "benchmarks": {}}
+	for benchmark in benchmarks:
+		if names is not None and benchmark.name not in names:
+			continue
+		result = benchmark.run(repeats)
+		results["benchmarks"][benchmark.name] = result
+		if verbose:
+			print("{:<40}{:>12.3f} µs/op (best {:.3f}, spread {:.0%})".format(benchmark.name, result["median_us"],
+																			 result["best_us"], result["spread"]))
+
+	results["memory"] = {}
+	for benchmark in memory_benchmarks:
+		if names is not None and benchmark.name not in names:
+			continue
+		result = benchmark.run()
+		results["memory"][benchmark.name] = result
+		if verbose:
+			print("{:<40}{:>12.0f} B/object".format(benchmark.name, result["bytes_per_object"]))
+	return results
+
+
+def compare_to_baseline(results, baseline, threshold=BENCHMARK_REGRESSION_THRESHOLD):
+	"""
+	Compare median timings of benchmarks to a baseline.
+
+	A benchmark is a regression if its median timing is slower than baseline one by more than threshold plus spreads of
+	samples of both runs, so that noisy benchmarks are not reported for a noise-level slowdown. Benchmarks missing from
+	baseline are not compared.
+
+	:param dict results: results given by run_benchmarks
+	:param dict baseline: results of a previous run, used as reference
+	:param float threshold: relative slowdown above which a benchmark is a regression, 0.2 for 20 %
+	:return: ratio of new timing to baseline timing for each compared benchmark, and names of regressed benchmarks
+	:rtype (dict, list(str)):
+	"""
+	ratios = {}
+	regressions = []
+	for name, result in results["benchmarks"].items():
+		reference = baseline["benchmarks"].get(name)
+		if reference is None:
+			continue
+		ratios[name] = result["median_us"] / reference["median_us"]
+		if ratios[name] > 1 + threshold + result.get("spread", 0) + reference.get("spread", 0):
+			regressions.append(name)
+	return ratios, regressions
+
+
+def merge_results(baseline, results):
+	"""
+	Update a baseline with new results, benchmarks and memory benchmarks which are not in new results are kept.
+
+	:param dict baseline: results of a previous run, modified in place
+	:param dict results: results given by run_benchmarks
+	:return: updated baseline
+	:rtype dict:
+	"""
+	baseline.update({key: val for key, val in results.items() if key not in ("benchmarks", "memory")})
+	for key in ("benchmarks", "memory"):
+		if key in results:
+			baseline.setdefault(key, {}).update(results[key])
+	return baseline
+
+
+def save_results(results, filename):
+	"""
+	Write benchmark results in a JSON file.
+
+	:param dict results: results given by run_benchmarks
+	:param str filename: path of JSON file
+	:return: None
+	"""
+	with open(filename, "w") as file:
+		json.dump(results, file, indent=1, sort_keys=True)
+
+
+def load_results(filename):
+	"""
+	Read benchmark results from a JSON file.
+
+	:param str filename: path of JSON file
+	:return: results
+	:rtype dict:
+	"""
+	with open(filename) as file:
+		return json.load(file)
@@ -0,0 +1,350 @@
+# encoding : UTF-8
+
+import random
+from contextlib import contextmanager, redirect_stdout
+from os import devnull
+
+import pygame as pg
+from pygame import Vector3
+
+from Engine.Benchmark.benchmark import Benchmark, MemoryBenchmark
+from Engine.message_bus import ActionMessage
+from Settings import *
+
+
+def _random_vector3(rng, x_range, y_range, z_range):
+	return Vector3(rng.uniform(*x_range), rng.uniform(*y_range), rng.uniform(*z_range))
+
+
+def sphere_and_aabb_setup():
+	from Engine.Collisions import SphereCollider, AABBCollider, are_sphere_and_aabb_colliding
+
+	rng = random.Random(0)
+	pairs = []
+	for _ in range(100):
+		sphere = SphereCollider(_random_vector3(rng, (-2, 2), (-2, 2), (0, 4)), rng.uniform(0.1, 0.5))
+		aabb = AABBCollider(_random_vector3(rng, (-2, 2), (-2, 2), (0, 4)),
+							_random_vector3(rng, (0.2, 1), (0.2, 1), (0.2, 2)))
+		pairs.append((sphere, aabb))
+
+	def func():
+		for sphere, aabb in pairs:
+			are_sphere_and_aabb_colliding(sphere, aabb)
+
+	yield func
+	for sphere, aabb in pairs:
+		sphere.release()
+		aabb.release()
+
+
+def sphere_and_finite_plane_setup():
+	from Engine.Collisions import SphereCollider, AABBCollider, are_sphere_and_finite_plane_colliding
+
+	# court net, and balls around it: about half of them collide with net
+	net = AABBCollider(Vector3(0, 0, (NET_HEIGHT_BTM + NET_HEIGHT_TOP) / 2),
+					   (COURT_DIM_X, 0, NET_HEIGHT_TOP - NET_HEIGHT_BTM))
+	rng = random.Random(0)
+	balls = []
+	for _ in range(100):
+		position = _random_vector3(rng, (-COURT_DIM_X / 2 - 0.5, COURT_DIM_X / 2 + 0.5), (-0.3, 0.3),
+								   (NET_HEIGHT_BTM - 0.5, NET_HEIGHT_TOP + 0.5))
+		balls.append((SphereCollider(position, BALL_RADIUS), position + Vector3(0, -0.2 if position.y > 0 else 0.2, 0)))
+
+	def func():
+		for sphere, previous_position in balls:
+			are_sphere_and_finite_plane_colliding(sphere, net, previous_position)
+
+	yield func
+	net.release()
+	for sphere, _ in balls:
+		sphere.release()
+
+
+def _random_throws(rng, throws_nb):
+	throws = []
+	for _ in range(throws_nb):
+		origin = _random_vector3(rng, (-COURT_DIM_X / 2, COURT_DIM_X / 2), (0.5, COURT_DIM_Y / 2), (0, 2))
+		target = _random_vector3(rng, (-COURT_DIM_X / 2, COURT_DIM_X / 2), (-COURT_DIM_Y / 2, -0.5), (0, 0))
+		throws.append((origin, target, rng.uniform(NET_HEIGHT_TOP, NET_HEIGHT_TOP + 2)))
+	return throws
+
+
+def find_initial_velocity_setup():
+	from Engine.Trajectory import find_initial_velocity
+
+	throws = _random_throws(random.Random(0), 100)
+
+	def func():
+		for origin, target, wanted_height in throws:
+			find_initial_velocity(origin, target, wanted_height)
+
+	yield func
+
+
+def find_target_position_setup():
+	from Engine.Trajectory import find_initial_velocity, find_target_position
+
+	throws = [(origin, find_initial_velocity(origin, target, wanted_height))
+			  for origin, target, wanted_height in _random_throws(random.Random(0), 100)]
+
+	def func():
+		for origin, velocity in throws:
+			find_target_position(origin, velocity, BALL_RADIUS)
+
+	yield func
+
+
+def _camera_points(rng, points_nb):
+	return [_random_vector3(rng, (-COURT_DIM_X, COURT_DIM_X), (-COURT_DIM_Y, COURT_DIM_Y), (0, 5))
+			for _ in range(points_nb)]
+
+
+def world_to_pixel_coords_setup():
+	from Engine.Actions import ActionObject
+	from Engine.Display import Camera
+
+	camera = Camera(CAMERA_POS, FOCUS_POINT, FOV_ANGLE)
+	points = _camera_points(random.Random(0), 100)
+
+	def func():
+		for point in points:
+			camera.world_to_pixel_coords(point, NOMINAL_RESOLUTION)
+
+	yield func
+	ActionObject.objects.remove(camera)
+
+
+def get_length_in_pixels_at_setup():
+	from Engine.Actions import ActionObject
+	from Engine.Display import Camera
+
+	camera = Camera(CAMERA_POS, FOCUS_POINT, FOV_ANGLE)
+	points = _camera_points(random.Random(0), 100)
+
+	def func():
+		for point in points:
+			camera.get_length_in_pixels_at(point, BALL_RADIUS, NOMINAL_RESOLUTION)
+
+	yield func
+	ActionObject.objects.remove(camera)
+
+
+def scalable_sprite_rescale_setup():
+	from Engine.Display import ScalableSprite, ScaledSurfaceCache
+
+	# display scale factor is global, and an empty cache makes each change scale sprite image again, as a window resize.
+	# Sprites of a previous game engine are put aside, so that only benchmark sprite is rescaled
+	initial_scale_factor = ScalableSprite.get_display_scale_factor()
+	cache = ScaledSurfaceCache.s_instance
+	ScaledSurfaceCache(max_size=0)
+	sprites = ScalableSprite.objects
+	ScalableSprite.objects = []
+	sprite = ScalableSprite()
+	sprite.image = pg.Surface((32, 32), pg.SRCALPHA)
+	sprite.rect = pg.Rect(0, 0, 32, 32)
+	scale_factors = [2, 3, 4, 5] * 5
+
+	def func():
+		for scale_factor in scale_factors:
+			ScalableSprite.set_display_scale_factor(scale_factor)
+
+	yield func
+	sprite.kill()
+	ScalableSprite.set_display_scale_factor(initial_scale_factor)
+	ScalableSprite.objects = sprites
+	ScaledSurfaceCache.s_instance = cache
+
+
+class _StepClock:
+	"""
+	Game engine stand-in for animations, which running ticks advance by a fixed step at each read.
+	"""
+	def __init__(self, step):
+		self.step = step
+		self.ticks = 0
+
+	def get_running_ticks(self):
+		self.ticks += self.step
+		return self.ticks
+
+
+def animated_sprite_play_setup():
+	from Engine import GameEngine
+	from Engine.Display import AnimatedSprite, ScalableSprite
+
+	class BallSprite(AnimatedSprite, ScalableSprite):
+		def __init__(self):
+			AnimatedSprite.__init__(self)
+			ScalableSprite.__init__(self)
+
+	# animation ticks are read from game engine: a deterministic clock makes each operation change frame, and a fit
+	# size rescales each new frame image as ball sprite does
+	game_engine = GameEngine.s_instance
+	GameEngine.s_instance = _StepClock(step=1000)
+	sprite = BallSprite()
+	sprite.load_aseprite_json("../assets/sprites/ball.json")
+	sprite.set_fit_size((24, 24))
+	generator = sprite.play_generator()
+
+	def func():
+		for _ in range(100):
+			next(generator)
+
+	yield func
+	sprite.kill()
+	GameEngine.s_instance = game_engine
+
+
+def ai_entity_update_setup():
+	from Engine import GameEngine
+
+	# seeded bots game, stopped while ball is thrown
+	pg.init()
+	with open(devnull, "w") as null_output, redirect_stdout(null_output):
+		game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=0)
+		for _ in range(120):
+			game_engine.step()
+	ai_entity = game_engine.ai_manager.entities[0]
+	message_bus = game_engine.message_bus
+
+	def func():
+		ai_entity.update()
+		message_bus.drain(ActionMessage)  # actions of AI entity are not used
+
+	yield func
+	GameEngine.s_instance = None
+
+
+def _throw_trajectories(trajectories_nb):
+	from Engine.Trajectory import Trajectory, find_initial_velocity
+
+	return [Trajectory(origin, target, find_initial_velocity(origin, target, wanted_height))
+			for origin, target, wanted_height in _random_throws(random.Random(0), trajectories_nb)]
+
+
+def _frame_dict(duration):
+	return {"frame": {"x": 0, "y": 0, "w": 8, "h": 8}, "duration": duration}
+
+
+@contextmanager
+def _isolated_characters():
+	from Engine.Actions import ActionObject
+	from Engine.Collisions import ColliderRegistry
+
+	# characters are not added to objects and colliders of current game engine, registry is big enough to never grow
+	action_objects, registry = ActionObject.objects, ColliderRegistry.s_default
+	ActionObject.objects = []
+	ColliderRegistry.s_default = ColliderRegistry(capacity=256)
+	yield
+	ActionObject.objects, ColliderRegistry.s_default = action_objects, registry
+
+
+# reads of attributes of slotted objects
+def trajectory_t0_setup():
+	trajectories = _throw_trajectories(100)
+
+	def func():
+		for trajectory in trajectories:
+			trajectory.t0
+
+	yield func
+
+
+def frame_duration_setup():
+	from Engine.Display import AnimatedSprite
+
+	image = pg.Surface((8, 8))
+	frames = [AnimatedSprite.Frame(_frame_dict(100), image) for _ in range(100)]
+
+	def func():
+		for frame in frames:
+			frame.duration
+
+	yield func
+
+
+def task_controller_succeeded_setup():
+	from Engine.AI.behaviour_tree import TaskController
+
+	controllers = [TaskController(None) for _ in range(100)]
+
+	def func():
+		for controller in controllers:
+			controller.succeeded()
+
+	yield func
+
+
+def character_velocity_setup():
+	from Game import Character
+
+	with _isolated_characters():
+		characters = [Character(Vector3()) for _ in range(100)]
+
+		def func():
+			for char in characters:
+				char.velocity
+
+		yield func
+
+
+# objects built by memory benchmarks
+def sphere_collider_build_setup():
+	from Engine.Collisions import SphereCollider, ColliderRegistry
+
+	registry = ColliderRegistry(capacity=256)
+	yield lambda: SphereCollider(Vector3(), BALL_RADIUS, registry)
+
+
+def trajectory_build_setup():
+	from Engine.Trajectory import Trajectory
+
+	origin, target, velocity = _throw_trajectories(1)[0].origin_pos, Vector3(), Vector3(1, 1, 5)
+	yield lambda: Trajectory(origin, target, velocity)
+
+
+def frame_build_setup():
+	from Engine.Display import AnimatedSprite
+
+	frame_dict, image = _frame_dict(100), pg.Surface((8, 8))
+	yield lambda: AnimatedSprite.Frame(frame_dict, image)
+
+
+def task_controller_build_setup():
+	from Engine.AI.behaviour_tree import TaskController
+
+	yield lambda: TaskController(None)
+
+
+def character_build_setup():
+	from Game import Character
+
+	with _isolated_characters():
+		yield lambda: Character(Vector3())
+
+
+# engine hot paths, with batches sized for samples of about 10 ms
+BENCHMARKS = [
+	Benchmark("are_sphere_and_aabb_colliding", sphere_and_aabb_setup, ops_nb=100, number=20),
+	Benchmark("are_sphere_and_finite_plane_colliding", sphere_and_finite_plane_setup, ops_nb=100, number=20),
+	Benchmark("find_initial_velocity", find_initial_velocity_setup, ops_nb=100, number=40),
+	Benchmark("find_target_position", find_target_position_setup, ops_nb=100, number=40),
+	Benchmark("Camera.world_to_pixel_coords", world_to_pixel_coords_setup, ops_nb=100, number=40),
+	Benchmark("Camera.get_length_in_pixels_at", get_length_in_pixels_at_setup, ops_nb=100, number=20),
+	Benchmark("ScalableSprite.set_display_scale_factor", scalable_sprite_rescale_setup, ops_nb=20, number=80),
+	Benchmark("AnimatedSprite.play_generator", animated_sprite_play_setup, ops_nb=100, number=200),
+	Benchmark("AIEntity.update", ai_entity_update_setup, ops_nb=1, number=1000),
+	Benchmark("Trajectory.t0", trajectory_t0_setup, ops_nb=100, number=4000),
+	Benchmark("AnimatedSprite.Frame.duration", frame_duration_setup, ops_nb=100, number=4000),
+	Benchmark("TaskController.succeeded", task_controller_succeeded_setup, ops_nb=100, number=2000),
+	Benchmark("Character.velocity", character_velocity_setup, ops_nb=100, number=4000),
+]
+
+# memory footprint of objects built at each frame or for each character
+MEMORY_BENCHMARKS = [
+	MemoryBenchmark("SphereCollider", sphere_collider_build_setup),
+	MemoryBenchmark("Trajectory", trajectory_build_setup),
+	MemoryBenchmark("AnimatedSprite.Frame", frame_build_setup),
+	MemoryBenchmark("TaskController", task_controller_build_setup),
+	MemoryBenchmark("Character", character_build_setup),
+]
@@ -2,3 +2,5 @@
 
 from .collisions_manager import CollisionsManager
 from .collider import *
+from .broadphase import BroadphaseGrid
+from .collider_registry import ColliderKind, ColliderRegistry
@@ -0,0 +1,57 @@
+# encoding : UTF-8
+
+import numpy as np
+
+from Settings import *
+
+
+class BroadphaseGrid:
+	"""
+	Uniform grid over court area, in XY plane, to find pairs of colliders which could collide.
+
+	Each collider is inserted in grid cells overlapped by its bounds, and only colliders sharing a cell are candidate
+	pairs. Cost is then near-linear with colliders number, instead of quadratic. Colliders outside of grid are inserted
+	in border cells.
+	"""
+	def __init__(self, cell_size=BROADPHASE_CELL_SIZE, x_range=None, y_range=None):
+		"""
+		:param float cell_size: size of cells in m
+		:param tuple(float, float) x_range: min and max x of grid, default is court area with out of bounds margins
+		:param tuple(float, float) y_range: min and max y of grid, default is court area with out of bounds margins
+		"""
+		self.cell_size = cell_size
+		self.x_range = x_range if x_range is not None else (-0.75 * COURT_DIM_X, 0.75 * COURT_DIM_X)
+		self.y_range = y_range if y_range is not None else (-0.75 * COURT_DIM_Y, 0.75 * COURT_DIM_Y)
+		self.cells_nb = (max(1, int((self.x_range[1] - self.x_range[0]) / cell_size + 0.5)),
+						 max(1, int((self.y_range[1] - self.y_range[0]) / cell_size + 0.5)))
+		self._origin = np.array((self.x_range[0], self.y_range[0]))
+		self._max_cells_indices = np.array(self.cells_nb) - 1
+
+	def get_candidate_pairs(self, colliders):
+		"""
+		Get pairs of colliders which bounds share a grid cell.
+
+		:param list[Collider] colliders: sphere or AABB colliders, stored in the same ColliderRegistry
+		:return: sorted pairs (i, j) of colliders indices, with i < j
+		:rtype list[tuple(int, int)]:
+		"""
+		if not colliders:
+			return []
+
+		# cells indices of min and max bounds of each collider, in XY plane
+		bounds_min, bounds_max = colliders[0].registry.get_bounds(colliders)
+		cells_indices = (np.stack((bounds_min[:, :2], bounds_max[:, :2]), axis=1) - self._origin) // self.cell_size
+		cells_indices = np.minimum(np.maximum(cells_indices, 0), self._max_cells_indices).astype(int).tolist()
+
+		cells = {}
+		for index, ((i_min, j_min), (i_max, j_max)) in enumerate(cells_indices):
+			for i in range(i_min, i_max + 1):
+				for j in range(j_min, j_max + 1):
+					cells.setdefault((i, j), []).append(index)
+
+		pairs = set()
+		for indices in cells.values():
+			for k, index_a in enumerate(indices):
+				for index_b in indices[k + 1:]:
+					pairs.add((index_a, index_b))
+		return sorted(pairs)
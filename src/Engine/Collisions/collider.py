@@ -2,53 +2,108 @@
 
 from pygame import Vector3
 from Engine.Display import debug3D_utils
+from Engine.Collisions.collider_registry import ColliderKind, ColliderRegistry
 
 
 class Collider:
-	def __init__(self):
-		pass
-	
+	"""
+	Base class of colliders, which shape is stored in a row of a ColliderRegistry.
+
+	Row is not released when collider is garbage collected: release method has to be called when collider is not
+	used anymore.
+	"""
+	__slots__ = ("registry", "index")
+
+	def __init__(self, kind, registry=None):
+		"""
+		:param int kind: kind of collider, in ColliderKind
+		:param ColliderRegistry registry: registry storing collider shape, default one is used if None
+		"""
+		self.registry = registry if registry is not None else ColliderRegistry.get_default()
+		self.index = self.registry.add(kind)
+
+	def release(self):
+		"""
+		Release registry row of collider, collider must not be used anymore.
+
+		:return: None
+		"""
+		if self.index is not None:
+			self.registry.remove(self.index)
+			self.index = None
+
+	@property
+	def center(self):
+		return Vector3(self.registry.centers[self.index].tolist())
+
+	@center.setter
+	def center(self, value):
+		self.registry.centers[self.index] = (value[0], value[1], value[2])
+
 	def draw_debug(self):
 		pass
 
 	def get_bound_coords(self, axis=0, m_to_p=True):
-		pass
+		if m_to_p:
+			return float(self.registry.centers[self.index, axis] + self.registry.half_sizes[self.index, axis])
+		else:
+			return float(self.registry.centers[self.index, axis] - self.registry.half_sizes[self.index, axis])
+
+	def get_bounds(self):
+		"""
+		Get min and max corners of collider bounds.
+
+		:return: min and max corners
+		:rtype (pygame.Vector3, pygame.Vector3):
+		"""
+		center = self.registry.centers[self.index]
+		half_size = self.registry.half_sizes[self.index]
+		return Vector3((center - half_size).tolist()), Vector3((center + half_size).tolist())
 
 	
 class SphereCollider(Collider):
-	def __init__(self, center, radius):
-		super().__init__()
+	__slots__ = ()
+
+	def __init__(self, center, radius, registry=None):
+		super().__init__(ColliderKind.SPHERE, registry)
 		self.center = center
 		self.radius = radius
+
+	@property
+	def radius(self):
+		return float(self.registry.radii[self.index])
+
+	@radius.setter
+	def radius(self, value):
+		self.registry.radii[self.index] = value
+		self.registry.half_sizes[self.index] = value
 		
 	def draw_debug(self):
 		return debug3D_utils.draw_sphere(self.center, self.radius, width=2)
 
-	def get_bound_coords(self, axis=0, m_to_p=True):
-		if m_to_p:
-			return self.center[axis] + self.radius
-		else:
-			return self.center[axis] - self.radius
-
 		
 class AABBCollider(Collider):
 	"""
 	AABB Collider centered to :var self.center:.
 	"""
-	def __init__(self, center, size3):
-		super().__init__()
+	__slots__ = ()
+
+	def __init__(self, center, size3, registry=None):
+		super().__init__(ColliderKind.AABB, registry)
 		self.center = center
 		self.size3 = size3
+
+	@property
+	def size3(self):
+		return Vector3((2 * self.registry.half_sizes[self.index]).tolist())
+
+	@size3.setter
+	def size3(self, value):
+		self.registry.half_sizes[self.index] = (value[0] / 2, value[1] / 2, value[2] / 2)
 		
 	def draw_debug(self):
 		return debug3D_utils.draw_aligned_axis_box(self.center, *self.size3)
 
-	def get_bound_coords(self, axis=0, m_to_p=True):
-		if m_to_p:
-			return self.center[axis] + self.size3[axis] / 2
-		else:
-			return self.center[axis] - self.size3[axis] / 2
-
 
 def are_spheres_colliding(sphere_a, sphere_b):
 	"""
@@ -71,14 +126,12 @@ def are_aabb_colliding(a, b):
 	:return: True if AABB are colliding
 	:rtype bool:
 	"""
-	a_min = [a.center[i] - a.size3[i] / 2 for i in range(3)]
-	a_max = [a.center[i] + a.size3[i] / 2 for i in range(3)]
-	b_min = [b.center[i] - b.size3[i] / 2 for i in range(3)]
-	b_max = [b.center[i] + b.size3[i] / 2 for i in range(3)]
+	a_min, a_max = a.get_bounds()
+	b_min, b_max = b.get_bounds()
 
-	return (a_min[0] <= b_max[0] and a_max[0] >= b_min[0]) and \
-	       (a_min[1] <= b_max[1] and a_max[1] >= b_min[1]) and \
-	       (a_min[2] <= b_max[2] and a_max[2] >= b_min[2])
+	return (a_min.x <= b_max.x and a_max.x >= b_min.x) and \
+	       (a_min.y <= b_max.y and a_max.y >= b_min.y) and \
+	       (a_min.z <= b_max.z and a_max.z >= b_min.z)
 
 
 def are_sphere_and_aabb_colliding(sphere, aabb):
@@ -92,13 +145,15 @@ def are_sphere_and_aabb_colliding(sphere, aabb):
 	"""
 	
 	# compute sq_dist, squared distance between sphere center and AABB
+	center = sphere.center
+	aabb_min, aabb_max = aabb.get_bounds()
 	sq_dist = 0.0
 	for i in range(3):
-		v = sphere.center[i]
-		if v < aabb.center[i] - aabb.size3[i] / 2:
-			sq_dist += (aabb.center[i] - aabb.size3[i] / 2 - v)**2
-		if v > aabb.center[i] + aabb.size3[i] / 2:
-			sq_dist += (aabb.center[i] + aabb.size3[i] / 2 - v)**2
+		v = center[i]
+		if v < aabb_min[i]:
+			sq_dist += (aabb_min[i] - v)**2
+		if v > aabb_max[i]:
+			sq_dist += (aabb_max[i] - v)**2
 	
 	return sq_dist <= sphere.radius**2
 
@@ -118,39 +173,37 @@ def are_sphere_and_finite_plane_colliding(sphere, aabb, previous_sphere_position
 	    or (False, None, None)          according to first bool:
 	"""
 	if are_sphere_and_aabb_colliding(sphere, aabb):
-		x_min = aabb.center.x - aabb.size3[0] / 2
-		x_max = aabb.center.x + aabb.size3[0] / 2
-		y = aabb.center.y
-		z_min = aabb.center.z - aabb.size3[2] / 2
-		z_max = aabb.center.z + aabb.size3[2] / 2
+		(x_min, y, z_min), (x_max, _, z_max) = aabb.get_bounds()
+		center = sphere.center
+		radius = sphere.radius
 		
 		# find collision point
 		
 		# center of net
-		if (x_min <= sphere.center.x <= x_max) & (z_min <= sphere.center.z <= z_max):
-			collision_point = Vector3(sphere.center.x, y, sphere.center.z)
-		elif (x_min <= sphere.center.x <= x_max):
+		if (x_min <= center.x <= x_max) & (z_min <= center.z <= z_max):
+			collision_point = Vector3(center.x, y, center.z)
+		elif (x_min <= center.x <= x_max):
 			# top
-			if (Vector3(0, sphere.center.y - y, sphere.center.z - z_max).length_squared() <= sphere.radius ** 2):
-				collision_point = Vector3(sphere.center.x, y, z_max)
+			if (Vector3(0, center.y - y, center.z - z_max).length_squared() <= radius ** 2):
+				collision_point = Vector3(center.x, y, z_max)
 			# bottom
-			elif (Vector3(0, sphere.center.y - y, sphere.center.z - z_min).length_squared() <= sphere.radius ** 2):
-				collision_point = Vector3(sphere.center.x, y, z_min)
-		elif (z_min <= sphere.center.z <= z_max):
+			elif (Vector3(0, center.y - y, center.z - z_min).length_squared() <= radius ** 2):
+				collision_point = Vector3(center.x, y, z_min)
+		elif (z_min <= center.z <= z_max):
 			# left
-			if (Vector3(sphere.center.x - x_max, sphere.center.y - y, 0).length_squared() <= sphere.radius ** 2):
-				collision_point = Vector3(x_max, y, sphere.center.z)
+			if (Vector3(center.x - x_max, center.y - y, 0).length_squared() <= radius ** 2):
+				collision_point = Vector3(x_max, y, center.z)
 			# right
-			elif (Vector3(sphere.center.x - x_min, sphere.center.y - y, 0).length_squared() <= sphere.radius ** 2):
-				collision_point = Vector3(x_min, y, sphere.center.z)
+			elif (Vector3(center.x - x_min, center.y - y, 0).length_squared() <= radius ** 2):
+				collision_point = Vector3(x_min, y, center.z)
 		# corners of net
-		elif (Vector3(x_min, y, z_min) - sphere.center).length_squared() <= sphere.radius ** 2:
+		elif (Vector3(x_min, y, z_min) - center).length_squared() <= radius ** 2:
 			collision_point = Vector3(x_min, y, z_min)
-		elif (Vector3(x_min, y, z_max) - sphere.center).length_squared() <= sphere.radius ** 2:
+		elif (Vector3(x_min, y, z_max) - center).length_squared() <= radius ** 2:
 			collision_point = Vector3(x_min, y, z_max)
-		elif (Vector3(x_max, y, z_min) - sphere.center).length_squared() <= sphere.radius ** 2:
+		elif (Vector3(x_max, y, z_min) - center).length_squared() <= radius ** 2:
 			collision_point = Vector3(x_max, y, z_min)
-		elif (Vector3(x_max, y, z_max) - sphere.center).length_squared() <= sphere.radius ** 2:
+		elif (Vector3(x_max, y, z_max) - center).length_squared() <= radius ** 2:
 			collision_point = Vector3(x_max, y, z_max)
 		# there's a collision but collision point not found !
 		else:
@@ -158,8 +211,101 @@ def are_sphere_and_finite_plane_colliding(sphere, aabb, previous_sphere_position
 			
 		# u vect
 		u_vect = Vector3(collision_point - previous_sphere_position).normalize()
-		ball_pos_at_collision = -sphere.radius * u_vect + collision_point
+		ball_pos_at_collision = -radius * u_vect + collision_point
 		
 		return True, collision_point, ball_pos_at_collision
 	return False, None, None
 	
+
+
+def _get_first_root_in_unit_interval(a, b, c):
+	"""
+	Get smallest root in [0, 1] of a.t^2 + b.t + c = 0.
+
+	:param float a: coefficient of t^2
+	:param float b: coefficient of t
+	:param float c: constant coefficient
+	:return: smallest root in [0, 1], or None if there is no root in this interval
+	:rtype float or None:
+	"""
+	if a == 0:
+		return None
+	delta = b ** 2 - 4 * a * c
+	if delta < 0:
+		return None
+	t = (-b - delta ** 0.5) / (2 * a)
+	return t if 0 <= t <= 1 else None
+
+
+def sweep_sphere_and_finite_plane(sphere, aabb, previous_sphere_position):
+	"""
+	Continuous collision detection between a sphere moving from a previous position to its current center, and a
+	finite plane.
+
+	Sphere is swept along its displacement segment, so a collision is detected even if sphere crossed plane during
+	displacement (tunnel effect). Volume where sphere center touches plane is a rounded rectangle: a slab on plane
+	faces, cylinders around plane edges and spheres around plane corners. First time of impact with these volumes is
+	returned.
+	If sphere already touches plane at previous position, a collision is detected only if sphere moves towards plane.
+
+	Given AABB collider is supposed to have y size equals to 0 (for finite plane).
+	:param SphereCollider sphere: sphere collider, at end of displacement
+	:param AABBCollider aabb: AABB collider, size along y axis is supposed to be 0
+	:param pygame.Vector3 previous_sphere_position: sphere center at beginning of displacement
+	:return: True if sphere and plane are colliding during displacement, time of impact in [0, 1] as a fraction of
+	displacement, collision point and sphere position at collision moment if there is a collision
+	:rtype (True, float, Vector3, Vector3)
+		or (False, None, None, None)          according to first bool:
+	"""
+	(x_min, y, z_min), (x_max, _, z_max) = aabb.get_bounds()
+	r = sphere.radius
+
+	p0 = Vector3(previous_sphere_position)
+	d = sphere.center - p0
+
+	# sphere already touching plane at beginning of displacement
+	nearest_point = Vector3(min(max(p0.x, x_min), x_max), y, min(max(p0.z, z_min), z_max))
+	if (p0 - nearest_point).length_squared() <= r ** 2:
+		if d.dot(p0 - nearest_point) < 0:
+			return True, 0., nearest_point, p0
+		return False, None, None, None
+
+	first_t = None
+	collision_point = None
+
+	# plane faces
+	if d.y != 0:
+		side = 1 if p0.y > y else -1
+		t = (y + side * r - p0.y) / d.y
+		if 0 <= t <= 1:
+			p = p0 + t * d
+			if x_min <= p.x <= x_max and z_min <= p.z <= z_max:
+				first_t, collision_point = t, Vector3(p.x, y, p.z)
+
+	# edges along x axis (bottom and top) and along z axis (sides)
+	for z_edge in (z_min, z_max):
+		oy, oz = p0.y - y, p0.z - z_edge
+		t = _get_first_root_in_unit_interval(d.y ** 2 + d.z ** 2, 2 * (oy * d.y + oz * d.z), oy ** 2 + oz ** 2 - r ** 2)
+		if t is not None and (first_t is None or t < first_t):
+			x = p0.x + t * d.x
+			if x_min <= x <= x_max:
+				first_t, collision_point = t, Vector3(x, y, z_edge)
+	for x_edge in (x_min, x_max):
+		ox, oy = p0.x - x_edge, p0.y - y
+		t = _get_first_root_in_unit_interval(d.x ** 2 + d.y ** 2, 2 * (ox * d.x + oy * d.y), ox ** 2 + oy ** 2 - r ** 2)
+		if t is not None and (first_t is None or t < first_t):
+			z = p0.z + t * d.z
+			if z_min <= z <= z_max:
+				first_t, collision_point = t, Vector3(x_edge, y, z)
+
+	# corners
+	for corner in (Vector3(x_min, y, z_min), Vector3(x_min, y, z_max), Vector3(x_max, y, z_min),
+				   Vector3(x_max, y, z_max)):
+		o = p0 - corner
+		t = _get_first_root_in_unit_interval(d.length_squared(), 2 * o.dot(d), o.length_squared() - r ** 2)
+		if t is not None and (first_t is None or t < first_t):
+			first_t, collision_point = t, corner
+
+	if first_t is None:
+		return False, None, None, None
+	return True, first_t, collision_point, p0 + first_t * d
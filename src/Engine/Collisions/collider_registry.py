@@ -0,0 +1,211 @@
+# encoding : UTF-8
+
+import numpy as np
+
+from Settings import BATCHED_COLLISIONS_MIN_PAIRS_NB
+
+
+class ColliderKind:
+	NONE = 0
+	SPHERE = 1
+	AABB = 2
+
+
+class ColliderRegistry:
+	"""
+	Store of colliders shapes in contiguous NumPy arrays (structure of arrays).
+
+	Centers and half sizes of all colliders are stored in (N, 3) arrays, radii in a (N,) array. A sphere has a half size
+	equal to its radius along each axis, so bounds of any collider are center +/- half size. SphereCollider and
+	AABBCollider objects are views on a row of these arrays, and rows of released colliders are reused.
+	"""
+	s_default = None
+
+	@staticmethod
+	def get_default():
+		"""
+		Get registry used by colliders created without registry, it is created at first call. Each game engine replaces
+		it by its own registry.
+
+		:return: default registry
+		:rtype ColliderRegistry:
+		"""
+		if ColliderRegistry.s_default is None:
+			ColliderRegistry.s_default = ColliderRegistry()
+		return ColliderRegistry.s_default
+
+	def __init__(self, capacity=16):
+		"""
+		:param int capacity: initial number of rows, arrays are doubled when full
+		"""
+		self.centers = np.zeros((capacity, 3))
+		self.half_sizes = np.zeros((capacity, 3))
+		self.radii = np.zeros(capacity)
+		self.kinds = np.zeros(capacity, dtype=np.int8)
+		self._free_indices = list(range(capacity - 1, -1, -1))
+
+	def __len__(self):
+		return len(self.kinds) - len(self._free_indices)
+
+	def add(self, kind):
+		"""
+		Reserve a row for a new collider.
+
+		:param int kind: kind of collider, in ColliderKind
+		:return: index of row
+		:rtype int:
+		"""
+		if not self._free_indices:
+			capacity = len(self.kinds)
+			self.centers = np.concatenate((self.centers, np.zeros((capacity, 3))))
+			self.half_sizes = np.concatenate((self.half_sizes, np.zeros((capacity, 3))))
+			self.radii = np.concatenate((self.radii, np.zeros(capacity)))
+			self.kinds = np.concatenate((self.kinds, np.zeros(capacity, dtype=np.int8)))
+			self._free_indices = list(range(2 * capacity - 1, capacity - 1, -1))
+		index = self._free_indices.pop()
+		self.kinds[index] = kind
+		return index
+
+	def remove(self, index):
+		"""
+		Release row of a collider.
+
+		:param int index: index of row
+		:return: None
+		"""
+		self.kinds[index] = ColliderKind.NONE
+		self.centers[index] = 0
+		self.half_sizes[index] = 0
+		self.radii[index] = 0
+		self._free_indices.append(index)
+
+	def get_bounds(self, colliders):
+		"""
+		Get min and max corners of bounds of given colliders.
+
+		:param list[Collider] colliders: sphere or AABB colliders
+		:return: min corners and max corners, as (N, 3) arrays
+		:rtype (numpy.ndarray, numpy.ndarray):
+		"""
+		indices = self._get_indices(colliders)
+		centers, half_sizes = self.centers[indices], self.half_sizes[indices]
+		return centers - half_sizes, centers + half_sizes
+
+	def get_sphere_pairs(self, spheres_a, spheres_b=None):
+		"""
+		Get colliding pairs between two lists of sphere colliders.
+
+		:param list[SphereCollider] spheres_a: sphere colliders
+		:param list[SphereCollider] spheres_b: sphere colliders, if None pairs inside spheres_a are tested
+		:return: sorted pairs (i, j) of indices in spheres_a and spheres_b lists (i < j if spheres_b is None)
+		:rtype list[tuple(int, int)]:
+		"""
+		a, b = self._get_indices(spheres_a), self._get_indices(spheres_a if spheres_b is None else spheres_b)
+		d = self.centers[a][:, np.newaxis, :] - self.centers[b][np.newaxis, :, :]
+		radii_sum = self.radii[a][:, np.newaxis] + self.radii[b][np.newaxis, :]
+		mask = np.sum(d ** 2, axis=2) <= radii_sum ** 2
+		return self._get_pairs(mask, spheres_b is None)
+
+	def get_sphere_aabb_pairs(self, spheres, aabbs):
+		"""
+		Get colliding pairs between a list of sphere colliders and a list of AABB colliders.
+
+		:param list[SphereCollider] spheres: sphere colliders
+		:param list[AABBCollider] aabbs: AABB colliders
+		:return: sorted pairs (i, j) of indices in spheres and aabbs lists
+		:rtype list[tuple(int, int)]:
+		"""
+		a, b = self._get_indices(spheres), self._get_indices(aabbs)
+		sphere_centers = self.centers[a][:, np.newaxis, :]
+		aabb_min = (self.centers[b] - self.half_sizes[b])[np.newaxis, :, :]
+		aabb_max = (self.centers[b] + self.half_sizes[b])[np.newaxis, :, :]
+
+		# distance between sphere center and its nearest point in AABB
+		d = sphere_centers - np.minimum(np.maximum(sphere_centers, aabb_min), aabb_max)
+		mask = np.sum(d ** 2, axis=2) <= self.radii[a][:, np.newaxis] ** 2
+		return self._get_pairs(mask, False)
+
+	def get_aabb_pairs(self, aabbs_a, aabbs_b=None):
+		"""
+		Get colliding pairs between two lists of AABB colliders.
+
+		:param list[AABBCollider] aabbs_a: AABB colliders
+		:param list[AABBCollider] aabbs_b: AABB colliders, if None pairs inside aabbs_a are tested
+		:return: sorted pairs (i, j) of indices in aabbs_a and aabbs_b lists (i < j if aabbs_b is None)
+		:rtype list[tuple(int, int)]:
+		"""
+		a, b = self._get_indices(aabbs_a), self._get_indices(aabbs_a if aabbs_b is None else aabbs_b)
+		d = np.abs(self.centers[a][:, np.newaxis, :] - self.centers[b][np.newaxis, :, :])
+		half_sizes_sum = self.half_sizes[a][:, np.newaxis, :] + self.half_sizes[b][np.newaxis, :, :]
+		mask = np.all(d <= half_sizes_sum, axis=2)
+		return self._get_pairs(mask, aabbs_b is None)
+
+	def get_colliding_pairs(self, colliders, pairs):
+		"""
+		Get colliding pairs among given candidate pairs of colliders, for any kinds of colliders.
+
+		Few pairs are tested one by one on plain floats read once from registry arrays, as NumPy calls overhead is
+		higher than the tests themselves. Pairs are tested in a batch only when there are at least
+		BATCHED_COLLISIONS_MIN_PAIRS_NB of them.
+
+		:param list[Collider] colliders: sphere or AABB colliders
+		:param list[tuple(int, int)] pairs: candidate pairs (i, j) of indices in colliders list
+		:return: colliding pairs, in candidate pairs order
+		:rtype list[tuple(int, int)]:
+		"""
+		if not pairs:
+			return []
+		indices = self._get_indices(colliders)
+		if len(pairs) < BATCHED_COLLISIONS_MIN_PAIRS_NB:
+			return self._get_colliding_pairs_scalar(indices, pairs)
+
+		pairs_array = np.array(pairs, dtype=np.intp)
+		a, b = indices[pairs_array[:, 0]], indices[pairs_array[:, 1]]
+		is_sphere_a, is_sphere_b = self.kinds[a] == ColliderKind.SPHERE, self.kinds[b] == ColliderKind.SPHERE
+		d = self.centers[a] - self.centers[b]
+
+		# sphere / AABB pairs are tested with sphere first
+		spheres, aabbs = np.where(is_sphere_a, a, b), np.where(is_sphere_a, b, a)
+		sphere_centers = self.centers[spheres]
+		q = sphere_centers - np.minimum(np.maximum(sphere_centers, self.centers[aabbs] - self.half_sizes[aabbs]),
+										self.centers[aabbs] + self.half_sizes[aabbs])
+
+		mask = np.where(is_sphere_a & is_sphere_b, np.sum(d ** 2, axis=1) <= (self.radii[a] + self.radii[b]) ** 2,
+						np.where(is_sphere_a | is_sphere_b, np.sum(q ** 2, axis=1) <= self.radii[spheres] ** 2,
+								 np.all(np.abs(d) <= self.half_sizes[a] + self.half_sizes[b], axis=1)))
+		return [pair for pair, is_colliding in zip(pairs, mask.tolist()) if is_colliding]
+
+	def _get_colliding_pairs_scalar(self, indices, pairs):
+		centers, half_sizes = self.centers[indices].tolist(), self.half_sizes[indices].tolist()
+		radii, kinds = self.radii[indices].tolist(), self.kinds[indices].tolist()
+
+		colliding_pairs = []
+		for i, j in pairs:
+			if kinds[i] == ColliderKind.SPHERE and kinds[j] == ColliderKind.SPHERE:
+				dx, dy, dz = (centers[i][k] - centers[j][k] for k in range(3))
+				is_colliding = dx * dx + dy * dy + dz * dz <= (radii[i] + radii[j]) ** 2
+			elif kinds[i] == ColliderKind.SPHERE or kinds[j] == ColliderKind.SPHERE:
+				sphere, aabb = (i, j) if kinds[i] == ColliderKind.SPHERE else (j, i)
+				sq_dist = 0.
+				for c, aabb_c, h in zip(centers[sphere], centers[aabb], half_sizes[aabb]):
+					v = abs(c - aabb_c) - h  # distance to AABB along axis, negative inside
+					if v > 0:
+						sq_dist += v * v
+				is_colliding = sq_dist <= radii[sphere] ** 2
+			else:
+				is_colliding = all(abs(c_i - c_j) <= h_i + h_j for c_i, c_j, h_i, h_j in
+								   zip(centers[i], centers[j], half_sizes[i], half_sizes[j]))
+			if is_colliding:
+				colliding_pairs.append((i, j))
+		return colliding_pairs
+
+	def _get_indices(self, colliders):
+		for collider in colliders:
+			assert collider.registry is self, "collider is not stored in this registry"
+		return np.array([collider.index for collider in colliders], dtype=np.intp)
+
+	@staticmethod
+	def _get_pairs(mask, is_same_list):
+		if is_same_list:
+			mask = np.triu(mask, k=1)
+		return list(zip(*(indices.tolist() for indices in np.nonzero(mask))))
@@ -1,11 +1,13 @@
 # encoding : UTF-8
 
+import itertools
 import pygame as pg
-from random import random
+import random
 
+from Engine.Collisions.broadphase import BroadphaseGrid
 from Engine.Collisions.collider import *
 from Engine.Trajectory.trajectory_solver import *
-from Engine.Trajectory import Trajectory
+from Engine.Trajectory import Trajectory, cached_find_target_position
 from Engine.Trajectory.thrower_manager import ThrowerManager
 from Settings import *
 
@@ -17,19 +19,79 @@ class CollisionsManager:
 	def get_instance():
 		return CollisionsManager.s_instance
 
-	def __init__(self):
+	def __init__(self, rng=None):
+		"""
+		:param random.Random rng: random generator, a new one is created if None
+		"""
 		CollisionsManager.s_instance = self
+		self.rng = rng if rng is not None else random.Random()
+		self.broadphase = BroadphaseGrid()
+
+		# contacts at last update, as pairs of indices in balls and characters lists
+		self.ball_character_contacts = []
+		self.ball_contacts = []
+		self.character_contacts = []
 	
-	def update(self, ball, court, characters_list):
+	def update(self, balls, court, characters_list):
 		"""
 		Detect and manage collision between given objects.
+
+		Ball / ground and ball / net collisions are managed for each ball. Ball / character, ball / ball and character /
+		character contacts are detected by collider registry, for pairs of objects given by broadphase grid when there
+		are many objects, or for all pairs otherwise.
 		
-		:param Ball ball: ball object.
+		:param list(Ball) balls: balls, first one is game ball which trajectory is managed by ThrowerManager
 		:param Court court: object used for net collision. Ball collision is checked.
 		:param list(Character) characters_list: list of characters. Ball and ground collision are checked for each
 		character
 		:return: None
 		"""
+		for ball in balls:
+			self.update_ball_with_court(ball, court, is_game_ball=ball is balls[0])
+
+		# contacts between balls and characters
+		self.ball_character_contacts = []
+		self.ball_contacts = []
+		self.character_contacts = []
+		for ball in balls:
+			ball.is_colliding_character = False
+		for char in characters_list:
+			char.is_colliding_ball = False
+
+		balls_nb = len(balls)
+		colliders = [ball.collider for ball in balls] + [char.collider for char in characters_list]
+		if len(colliders) < BROADPHASE_MIN_COLLIDERS_NB:
+			pairs = list(itertools.combinations(range(len(colliders)), 2))
+		else:
+			pairs = self.broadphase.get_candidate_pairs(colliders)
+		contacts = colliders[0].registry.get_colliding_pairs(colliders, pairs) if pairs else []
+		for i, j in contacts:
+			if j < balls_nb:
+				self.ball_contacts.append((i, j))
+			elif i < balls_nb:
+				self.ball_character_contacts.append((i, j - balls_nb))
+				balls[i].is_colliding_character = True
+				characters_list[j - balls_nb].is_colliding_ball = True
+			else:
+				self.character_contacts.append((i - balls_nb, j - balls_nb))
+
+		# character / ground
+		for char in characters_list:
+			if char.position.z < 0:
+				ground_pos = Vector3(char.position)
+				ground_pos.z = 0
+				char.position = ground_pos
+				char.velocity.z = 0
+
+	def update_ball_with_court(self, ball, court, is_game_ball=True):
+		"""
+		Detect and manage ball / ground and ball / net collisions.
+
+		:param Ball ball: ball
+		:param Court court: object used for net collision
+		:param bool is_game_ball: if True, current trajectory of ThrowerManager is updated after a bounce
+		:return: None
+		"""
 		b_refresh_target_ball_position = False
 	
 		# ball / ground collision
@@ -37,16 +99,15 @@ class CollisionsManager:
 		if ball.is_colliding_ground:
 			ball.velocity *= 0.7
 			ball.velocity.z *= -1
-			ball.position.z = max(ball.radius, ball.position.z)
+			ball.position = Vector3(ball.position.x, ball.position.y, max(ball.radius, ball.position.z))
 			b_refresh_target_ball_position = True
 		
-		# ball / net collision
-		ball.is_colliding_net, collision_point, ball_pos_at_collision = are_sphere_and_finite_plane_colliding(ball.collider, court.collider,
-		                                                                               ball.previous_position)
-		# TODO : manage tunnel collision ?
+		# ball / net collision, ball is swept from its previous position to prevent tunnel effect
+		ball.is_colliding_net, _, collision_point, ball_pos_at_collision = sweep_sphere_and_finite_plane(
+			ball.collider, court.collider, ball.previous_position)
 		if ball.is_colliding_net:
 			# reflect velocity and set damping
-			random_vect = Vector3(0, 0.1 * random(), 0)  # to prevent unstable balance
+			random_vect = Vector3(0, 0.1 * self.rng.random(), 0)  # to prevent unstable balance
 			normal_vect = Vector3(ball_pos_at_collision - collision_point + random_vect)
 			ball.velocity.reflect_ip(normal_vect)
 			ball.velocity *= 0.8
@@ -55,26 +116,16 @@ class CollisionsManager:
 			ball.position = ball_pos_at_collision
 			
 			b_refresh_target_ball_position = True
-		
-		# ball / character's collision
-		ball.is_colliding_character = False
-		for char in characters_list:
-			char.is_colliding_ball = are_sphere_and_aabb_colliding(ball.collider, char.collider)
-			
-			if char.is_colliding_ball:
-				ball.is_colliding_character = True
-			
-			# character / ground
-			if char.position.z < 0:
-				ground_pos = Vector3(char.position)
-				ground_pos.z = 0
-				char.position = ground_pos
-				char.velocity.z = 0
-		
-		# ball velocity checked to prevent to fill event queue
-		if b_refresh_target_ball_position and ball.velocity.length_squared() > 0.1:
-			target_pos = find_target_position(ball.position, ball.velocity, ball.radius)
 
-			# update current ball trajectory
-			ThrowerManager.get_instance().current_trajectory = Trajectory(ball.position, target_pos, ball.velocity)
-			
\ No newline at end of file
+		if b_refresh_target_ball_position:
+			# ball velocity checked to prevent to refresh trajectory of a ball at rest at each frame
+			if ball.velocity.length_squared() > 0.1:
+				target_pos = cached_find_target_position(ball.position, ball.velocity, ball.radius)
+
+				# update current ball trajectory
+				trajectory = Trajectory(ball.position, target_pos, ball.velocity)
+				if is_game_ball:
+					ThrowerManager.get_instance().current_trajectory = trajectory
+			else:
+				trajectory = Trajectory(ball.position, None, ball.velocity)
+			ball.set_trajectory(trajectory)
@@ -3,6 +3,7 @@
 from .display_manager import DisplayManager
 from .camera import Camera
 from .debug3D_utils import *
+from .scaled_surface_cache import ScaledSurfaceCache
 from .scalable_sprite import ScalableSprite
 from .animated_sprite import AnimatedSprite
 from .utils import *
@@ -31,6 +31,8 @@ class AnimatedSprite(pg.sprite.DirtySprite):
 			- :var duration: :type int: duration of the frame in ms
 			- :var image: :type pygame.Surface: sub image of corresponding sprite sheet image
 		"""
+		__slots__ = ("frame_rect", "duration", "image")
+
 		def __init__(self, frame_dict, sprite_sheet_image):
 			self.frame_rect = pg.Rect(*[frame_dict["frame"][k] for k in ('x', 'y', 'w', 'h')])
 			self.duration = frame_dict["duration"]
@@ -116,7 +118,9 @@ class AnimatedSprite(pg.sprite.DirtySprite):
 
 			# load meta data and sprite sheet
 			meta = AnimatedSprite.Meta(data["meta"])
-			self.sprite_sheet = pg.image.load(meta.image_filename).convert_alpha()
+			self.sprite_sheet = pg.image.load(meta.image_filename)
+			if pg.display.get_surface() is not None:  # no video mode in headless mode
+				self.sprite_sheet = self.sprite_sheet.convert_alpha()
 
 			# load all frames
 			_frames = []
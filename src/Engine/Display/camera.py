@@ -134,9 +134,7 @@ class Camera(ActionObject):
 		return int((pt_a - pt_b).magnitude())
 
 	def update_actions(self, action_events, **kwargs):
-		filtered_action_events = self.filter_action_events_by_player_id(action_events)
-		
-		for ev in filtered_action_events:
+		for ev in action_events:
 			action = ev.action
 			if action == PlayerAction.CAMERA_MOVE_UP:
 				self.position += (0, 0, 0.1)
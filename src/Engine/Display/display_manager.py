@@ -1,5 +1,7 @@
 # encoding : UTF-8
 
+from math import floor, ceil
+
 from Engine.Display.camera import Camera
 from Settings import *
 from Engine.Display.scalable_sprite import ScalableSprite
@@ -19,7 +21,7 @@ class DisplayManager:
 	def __init__(self):
 		DisplayManager.s_instance = self
 		# load palette
-		self.palette = load_palette_from_pal_file(PALETTE_DIR)
+		self.palette = load_palette_from_pal_file(PALETTE_PATH)
 
 		self.camera = Camera(CAMERA_POS, FOCUS_POINT, FOV_ANGLE)
 
@@ -31,6 +33,7 @@ class DisplayManager:
 		self.screen = None
 		self.screen_size = None  # size of screen
 		self.scaled_size = None  # size of scaled surface ie f * self.nominal_size
+		self.frame = None  # layers composed at nominal resolution, upscaled to screen
 		self._f_scale = 1
 		self.rect_list = []
 
@@ -42,7 +45,8 @@ class DisplayManager:
 
 	@f_scale.setter
 	def f_scale(self, val):
-		ScalableSprite.set_display_scale_factor(val)
+		# sprites are drawn at nominal resolution, whole frame is upscaled once
+		ScalableSprite.set_display_scale_factor(1)
 		self._f_scale = val
 
 
@@ -88,15 +92,20 @@ class DisplayManager:
 	def create_surfaces(self):
 		"""
 		Create different images.
+
+		Layer images and frame are at nominal resolution, frame has screen pixel format to be upscaled on it.
 		
 		:return: None
 		"""
 		self.scaled_size = [int(self.f_scale * NOMINAL_RESOLUTION[i]) for i in (0, 1)]
 
-		self.scene_3d.create_image(self.scaled_size)
-		self.debug_3d.create_image(self.scaled_size)
-		self.debug_text.create_image(self.scaled_size)
-		self.hud.create_image(self.scaled_size)
+		self.scene_3d.create_image(NOMINAL_RESOLUTION)
+		self.debug_3d.create_image(NOMINAL_RESOLUTION)
+		self.debug_text.create_image(NOMINAL_RESOLUTION)
+		self.hud.create_image(NOMINAL_RESOLUTION)
+
+		self.frame = pg.Surface(NOMINAL_RESOLUTION, 0, self.screen)
+		self.frame.fill(BKGND_SCREEN_COLOR)
 
 		self.screen.fill(BKGND_SCREEN_COLOR)
 		pg.display.flip()
@@ -115,17 +124,66 @@ class DisplayManager:
 		self.hud.update()
 		
 		# update screen
-		self.rect_list = self.debug_text.rect_list + self.hud.rect_list + self.debug_3d.rect_list + self.scene_3d.rect_list
-		for r in self.rect_list:
-			self.screen.fill(BKGND_SCREEN_COLOR, r)
-
-		self.blit_on_screen(self.scene_3d.image)
-		self.blit_on_screen(self.debug_3d.image)
-		self.blit_on_screen(self.debug_text.image)
-		self.blit_on_screen(self.hud.image)
+		rect_list = self.debug_text.rect_list + self.hud.rect_list + self.debug_3d.rect_list + self.scene_3d.rect_list
+		dirty_rects = self.compose(rect_list, [self.scene_3d.image, self.debug_3d.image, self.debug_text.image,
+											   self.hud.image])
+		self.rect_list = self.upscale(dirty_rects)
 		
 		# update screen
 		pg.display.update(self.rect_list)
+
+	def compose(self, rect_list, images):
+		"""
+		Redraw dirty areas of frame from layer images.
+
+		Overlapping dirty rects are merged, then each merged rect is cleared and only this area of each layer image is
+		blitted, so cost depends on changed area and not on frame size. Images are centered on frame.
+
+		:param list(pygame.Rect) rect_list: dirty rects, in layer images coordinates
+		:param list(pygame.Surface) images: layer images, from bottom to top
+		:return: merged dirty rects, in frame coordinates
+		:rtype list(pygame.Rect):
+		"""
+		frame_rect = self.frame.get_rect()
+		offsets = [tuple(int(self.frame.get_size()[i] / 2 - image.get_size()[i] / 2) for i in (0, 1))
+				   for image in images]
+
+		dirty_rects = [r.move(offsets[0]).clip(frame_rect) for r in merge_rects(rect_list)]
+		for r in dirty_rects:
+			self.frame.fill(BKGND_SCREEN_COLOR, r)
+			for image, (x, y) in zip(images, offsets):
+				self.frame.blit(image, r.topleft, area=r.move(-x, -y))
+		return dirty_rects
+
+	def upscale(self, rect_list):
+		"""
+		Upscale dirty areas of frame to screen, with scale factor :var self.f_scale:.
+
+		Frame is centered on screen. Each area is scaled directly in screen, with nearest neighbour scaling to keep
+		pixel art sharp. With a non integer scale factor, scaled areas are rounded outwards.
+
+		:param list(pygame.Rect) rect_list: dirty rects, in frame coordinates
+		:return: dirty rects, in screen coordinates
+		:rtype list(pygame.Rect):
+		"""
+		f = self.f_scale
+		x0, y0 = (int(self.screen.get_size()[i] / 2 - f * self.frame.get_size()[i] / 2) for i in (0, 1))
+		screen_rect = self.screen.get_rect()
+
+		screen_rects = []
+		for r in rect_list:
+			if r.w == 0 or r.h == 0:
+				continue
+			left, top = floor(f * r.left), floor(f * r.top)
+			scaled_rect = pg.Rect(x0 + left, y0 + top, ceil(f * r.right) - left, ceil(f * r.bottom) - top)
+			if f == 1:
+				self.screen.blit(self.frame, scaled_rect, area=r)
+			elif screen_rect.contains(scaled_rect):
+				pg.transform.scale(self.frame.subsurface(r), scaled_rect.size, self.screen.subsurface(scaled_rect))
+			else:  # rounded area out of screen
+				self.screen.blit(pg.transform.scale(self.frame.subsurface(r), scaled_rect.size), scaled_rect)
+			screen_rects.append(scaled_rect.clip(screen_rect))
+		return screen_rects
 	
 	def blit_on_screen(self, image, pos=None, centered=True):
 		"""
@@ -162,6 +220,29 @@ class DisplayManager:
 		return res
 
 
+def merge_rects(rect_list):
+	"""
+	Merge overlapping rects, until no rect overlaps another one.
+
+	Empty rects are ignored. Given rects are not modified.
+
+	:param list(pygame.Rect) rect_list: rects to merge
+	:return: merged rects
+	:rtype list(pygame.Rect):
+	"""
+	merged = []
+	for r in rect_list:
+		if r.w <= 0 or r.h <= 0:
+			continue
+		r = pg.Rect(r)
+		i = r.collidelist(merged)
+		while i != -1:  # union can overlap other merged rects
+			r.union_ip(merged.pop(i))
+			i = r.collidelist(merged)
+		merged.append(r)
+	return merged
+
+
 def load_palette_from_pal_file(filename):
 	"""
 	Load palette from PAL file and return list of colors.
@@ -192,8 +273,8 @@ def visualise_colors():
 	pg.init()
 
 	# parameters
-	colors = load_palette_from_pal_file("../../" + PALETTE_DIR)
-	font = pg.font.Font("../../" + FONT_DIR, 20)
+	colors = load_palette_from_pal_file("../../" + PALETTE_PATH)
+	font = pg.font.Font("../../" + FONT_PATH, 20)
 	size = 64
 
 	# open pygame window and fill it with colors
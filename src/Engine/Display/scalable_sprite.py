@@ -3,6 +3,7 @@
 import pygame as pg
 
 import Engine
+from Engine.Display.scaled_surface_cache import ScaledSurfaceCache
 
 
 class ScalableSprite(pg.sprite.DirtySprite):
@@ -11,6 +12,7 @@ class ScalableSprite(pg.sprite.DirtySprite):
 	"""
 	objects = []
 	_display_scale_factor = 1
+	_fit_size = None  # class default, used until __init__ is called by a derived class inheriting from another sprite
 
 	@staticmethod
 	def get_display_scale_factor():
@@ -58,9 +60,8 @@ class ScalableSprite(pg.sprite.DirtySprite):
 	@rect.setter
 	def rect(self, raw_val):
 		self._raw_rect = raw_val
-		if "_fit_size" in self.__dict__.keys():  # necessary if a class inherits from a class A and this class
-			if self._fit_size is not None and self._raw_rect.size != self._fit_size:
-				self._raw_rect.w, self._raw_rect.h = self._fit_size
+		if self._fit_size is not None and self._raw_rect.size != self._fit_size:
+			self._raw_rect.w, self._raw_rect.h = self._fit_size
 
 		self._scaled_rect = get_scaled_rect_from(raw_val, self.get_display_scale_factor())
 
@@ -71,13 +72,13 @@ class ScalableSprite(pg.sprite.DirtySprite):
 	@image.setter
 	def image(self, raw_val):
 		self._raw_image = raw_val
-		if "_fit_size" in self.__dict__.keys():  # necessary if a class inherits from a class A and this class
-			raw_size = raw_val.get_size() if self._fit_size is None else self._fit_size
-		else:
-			raw_size = raw_val.get_size()
+		raw_size = raw_val.get_size() if self._fit_size is None else self._fit_size
 
-		new_size = [self.get_display_scale_factor() * raw_size[i] for i in (0, 1)]
-		self._scaled_image = pg.transform.scale(raw_val, new_size)
+		new_size = tuple(self.get_display_scale_factor() * raw_size[i] for i in (0, 1))
+		if new_size == raw_val.get_size():
+			self._scaled_image = raw_val  # no scaling, raw image is drawn
+		else:
+			self._scaled_image = ScaledSurfaceCache.get_instance().get_scaled(raw_val, new_size)
 
 	def set_fit_size(self, new_size):
 		"""
@@ -0,0 +1,103 @@
+# encoding : UTF-8
+
+from collections import OrderedDict
+
+import pygame as pg
+
+from Settings import SCALED_SURFACE_CACHE_MAX_SIZE
+
+
+class ScaledSurfaceCache:
+	"""
+	Shared cache of scaled surfaces, keyed by source surface identity and target size.
+
+	Least recently used surfaces are evicted when memory of cached surfaces exceeds a cap. Source surfaces are
+	referenced by their entries, so their ids are not reused while cached. A source surface must not be modified after
+	it has been scaled, which is the case of animation frames.
+	"""
+	s_instance = None
+
+	@staticmethod
+	def get_instance():
+		"""
+		Get shared cache, it is created at first call.
+
+		:return: scaled surface cache
+		:rtype ScaledSurfaceCache:
+		"""
+		if ScaledSurfaceCache.s_instance is None:
+			ScaledSurfaceCache()
+		return ScaledSurfaceCache.s_instance
+
+	def __init__(self, max_size=SCALED_SURFACE_CACHE_MAX_SIZE):
+		"""
+		:param int max_size: max memory in bytes of cached scaled surfaces
+		"""
+		ScaledSurfaceCache.s_instance = self
+		self.max_size = max_size
+		self._entries = OrderedDict()  # (id of source, size): (source, scaled surface, bytes)
+		self.size = 0  # in bytes
+
+		self.hits = 0
+		self.misses = 0
+		self.evictions = 0
+
+	def __len__(self):
+		return len(self._entries)
+
+	def get_scaled(self, surface, size):
+		"""
+		Get surface scaled to a size, from cache or scaled with pygame.transform.scale.
+
+		:param pygame.Surface surface: source surface
+		:param tuple(int, int) size: target size in pixels
+		:return: scaled surface, to be used read-only
+		:rtype pygame.Surface:
+		"""
+		key = (id(surface), size)
+		entry = self._entries.get(key)
+		if entry is not None:
+			self.hits += 1
+			self._entries.move_to_end(key)
+			return entry[1]
+
+		self.misses += 1
+		scaled = pg.transform.scale(surface, size)
+		nbytes = scaled.get_pitch() * scaled.get_height()
+		if nbytes > self.max_size:  # too big to be cached
+			return scaled
+
+		self._entries[key] = (surface, scaled, nbytes)
+		self.size += nbytes
+		while self.size > self.max_size:
+			_, (_, _, evicted_nbytes) = self._entries.popitem(last=False)
+			self.size -= evicted_nbytes
+			self.evictions += 1
+		return scaled
+
+	def get_hit_rate(self):
+		"""
+		:return: ratio of lookups found in cache, 0 if there was no lookup
+		:rtype float:
+		"""
+		lookups = self.hits + self.misses
+		return self.hits / lookups if lookups > 0 else 0.
+
+	def get_stats(self):
+		"""
+		Get cache statistics, for profiler.
+
+		:return: hit rate, lookups counters, number of surfaces and memory in bytes
+		:rtype dict:
+		"""
+		return {"hit_rate": round(self.get_hit_rate(), 4), "hits": self.hits, "misses": self.misses,
+				"evictions": self.evictions, "surfaces": len(self._entries), "bytes": self.size}
+
+	def clear(self):
+		"""
+		Remove all cached surfaces, statistics are kept.
+
+		:return: None
+		"""
+		self._entries.clear()
+		self.size = 0
@@ -18,7 +18,7 @@ class HUD(pg.sprite.LayeredDirty):
 		def __init__(self, *groups):
 			ScalableSprite.__init__(self, *groups)
 			self.color = HUD_FONT_COLOR
-			self.font = pg.font.Font(FONT_DIR, 8)
+			self.font = pg.font.Font(FONT_PATH, 8)
 			
 			self.t = -1
 		
@@ -61,7 +61,7 @@ class HUD(pg.sprite.LayeredDirty):
 		def __init__(self, *groups, on_left=True):
 			ScalableSprite.__init__(self, *groups)
 			self.color = HUD_FONT_COLOR
-			self.font = pg.font.Font(FONT_DIR, 8)
+			self.font = pg.font.Font(FONT_PATH, 8)
 			self.center_space = 100
 			
 			self.on_left = on_left
@@ -116,7 +116,7 @@ class HUD(pg.sprite.LayeredDirty):
 
 	def __init__(self):
 		pg.sprite.LayeredDirty.__init__(self)
-		self.font = pg.font.Font(FONT_DIR, 8)
+		self.font = pg.font.Font(FONT_PATH, 8)
 		self.image = None
 		
 		self.time_sprite = None
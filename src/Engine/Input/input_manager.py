@@ -2,6 +2,7 @@
 
 import pygame as pg
 
+from Engine.message_bus import MessageBus, ActionMessage
 from Settings import *
 
 
@@ -47,7 +48,7 @@ class InputManager:
 			self.add_joystick(joy_id)
 
 	def update(self):
-		joy_input_events = pg.event.get([JOYBUTTONUP, JOYBUTTONDOWN, JOYHATMOTION])
+		joy_input_events = pg.event.get([JOYBUTTONUP, JOYBUTTONDOWN, JOYHATMOTION, JOYAXISMOTION])
 		
 		for input_device in self.input_devices:
 			input_device.update(joy_events=joy_input_events)
@@ -100,25 +101,67 @@ class InputManager:
 
 
 class InputDevice:
+	"""
+	Input device, which keys states are updated from pygame events and generate action messages.
+
+	Only changed keys are updated: keys in JUST_PRESSED or JUST_RELEASED state are aged at next update, and only keys
+	which are not released generate actions, with an action lookup precomputed from input preset.
+	"""
 	def __init__(self, player_id):
 		self.player_id = player_id
 		self.keys = {}
 		self.key_action_binds = {}
 
 		self.input_preset = None
+
+		self._key_state_actions = {}  # (key, key_state): [(binding rank, action)]
+		self._active_keys = {}  # keys which are not released, as an ordered set
+		self._transient_keys = {}  # keys in JUST_PRESSED or JUST_RELEASED state, as an ordered set
 		
 	def load_keys_and_actions_binds(self):
 		self.keys = {}
 		self.key_action_binds = {}
+		self._key_state_actions = {}
+		self._active_keys = {}
+		self._transient_keys = {}
 		
 		assert self.input_preset is not None
 		
 		# (key, key_state): action
-		for action in self.input_preset:
+		for rank, action in enumerate(self.input_preset):
 			key = self.input_preset[action]
 			self.keys[key] = KeyState.RELEASED
 			key_state = INPUT_ACTIONS[action]
 			self.key_action_binds[(key, key_state)] = action
+			self._key_state_actions.setdefault((key, key_state), []).append((rank, action))
+
+	def set_key_state(self, key, key_state):
+		"""
+		Change state of a key, if key is bound.
+
+		:param key: key, button, Pov or JoyAxis
+		:param KeyState key_state: new state, JUST_PRESSED or JUST_RELEASED
+		:return: None
+		"""
+		if key not in self.keys:
+			return
+		self.keys[key] = key_state
+		self._transient_keys[key] = None
+		self._active_keys[key] = None
+
+	def age_keys(self):
+		"""
+		Change keys pressed or released at previous update to PRESSED or RELEASED state.
+
+		:return: None
+		"""
+		for key in self._transient_keys:
+			if self.keys[key] == KeyState.JUST_PRESSED:
+				self.keys[key] = KeyState.PRESSED
+			elif self.keys[key] == KeyState.JUST_RELEASED:
+				self.keys[key] = KeyState.RELEASED
+				del self._active_keys[key]
+		self._transient_keys = {}
 	
 	def update(self, **kwargs):
 		"""
@@ -126,35 +169,33 @@ class InputDevice:
 	
 		:return: None
 		"""
-		# update state
-		for k in self.keys:
-			if self.keys[k] == KeyState.JUST_PRESSED:
-				self.keys[k] = KeyState.PRESSED
-			elif self.keys[k] == KeyState.JUST_RELEASED:
-				self.keys[k] = KeyState.RELEASED
+		self.age_keys()
 		
 		# detect a state modification (with pygame event)
 		# only catch KEYUP, KEYDOWN
 		for ev in pg.event.get([KEYUP, KEYDOWN]):
 			if ev.type == pg.KEYDOWN:
-				if ev.key in self.keys.keys():
-					self.keys[ev.key] = KeyState.JUST_PRESSED
-			
-			if ev.type == pg.KEYUP:
-				if ev.key in self.keys.keys():
-					self.keys[ev.key] = KeyState.JUST_RELEASED
+				self.set_key_state(ev.key, KeyState.JUST_PRESSED)
+			elif ev.type == pg.KEYUP:
+				self.set_key_state(ev.key, KeyState.JUST_RELEASED)
 	
 	def generate_actions(self):
 		"""
-		Generate action events from input states.
+		Generate action messages from input states, in input preset order.
+
+		Released keys do not generate actions.
 
 		:return: None
 		"""
-		for (key, key_state) in self.key_action_binds:
-			if self.keys[key] == key_state:
-				action = self.key_action_binds[(key, key_state)]
-				event = pg.event.Event(ACTION_EVENT, {"player_id": self.player_id, "action": action})
-				pg.event.post(event)
+		actions = []
+		for key in self._active_keys:
+			actions += self._key_state_actions.get((key, self.keys[key]), ())
+		if len(actions) > 1:
+			actions.sort()
+
+		message_bus = MessageBus.get_instance()
+		for _, action in actions:
+			message_bus.post(ActionMessage(self.player_id, action))
 		
 
 class KeyboardInputDevice(InputDevice):
@@ -177,68 +218,60 @@ class JoystickInputDevice(InputDevice):
 
 		self.load_keys_and_actions_binds()
 
+	def load_keys_and_actions_binds(self):
+		super().load_keys_and_actions_binds()
+
+		# bound Pov and JoyAxis keys for each hat and axis
+		self._hat_povs = {}
+		self._axis_keys = {}
+		for key in self.keys:
+			if isinstance(key, Pov):
+				self._hat_povs.setdefault(key.value.hat_id, []).append(key)
+			elif isinstance(key, JoyAxis):
+				self._axis_keys.setdefault(key.value.axis, []).append(key)
+
 	def update(self, **kwargs):
 		"""
-		Update keys state.
+		Update keys state from joystick button, hat and axis events.
 
 		:return: None
 		"""
 		joy_events = kwargs["joy_events"] if "joy_events" in kwargs.keys() else []
 		
-		# update state
-		for k in self.keys:
-			if self.keys[k] == KeyState.JUST_PRESSED:
-				self.keys[k] = KeyState.PRESSED
-			elif self.keys[k] == KeyState.JUST_RELEASED:
-				self.keys[k] = KeyState.RELEASED
+		self.age_keys()
 
 		# detect a state modification (with pygame event)
+		axis_values = {}
 		for ev in joy_events:
 			if ev.joy == self.joystick.get_id():
 				if ev.type == JOYBUTTONDOWN:
-					if ev.button in self.keys.keys():
-						self.keys[ev.button] = KeyState.JUST_PRESSED
+					self.set_key_state(ev.button, KeyState.JUST_PRESSED)
 
 				elif ev.type == JOYBUTTONUP:
-					if ev.button in self.keys.keys():
-						self.keys[ev.button] = KeyState.JUST_RELEASED
+					self.set_key_state(ev.button, KeyState.JUST_RELEASED)
 
 				elif ev.type == JOYHATMOTION:
-					hat_id = ev.hat
 					hat_value = ev.value
 
-					for pov_i in Pov.__iter__():
-						if pov_i not in self.keys.keys():
-							continue
-
+					for pov_i in self._hat_povs.get(ev.hat, ()):
 						i = 0 if pov_i.value.value[0] != 0 else 1
 						b_val = pov_i.value.value[i] == hat_value[i]  # True if pov_i pressed
-						b_val &= hat_id == pov_i.value.hat_id
-
-						prev_val = self.keys[pov_i]
-
-						if prev_val == KeyState.RELEASED and b_val:
-							self.keys[pov_i] = KeyState.JUST_PRESSED
-						elif prev_val == KeyState.PRESSED and not b_val:
-							self.keys[pov_i] = KeyState.JUST_RELEASED
+						self._update_key_with_bool(pov_i, b_val)
 
-		# update joy axis states (wo pygame event)
-		for axe_i in JoyAxis.__iter__():
-			if axe_i not in self.keys.keys():  # check if current input_presets has an axis_i key
-				continue
+				elif ev.type == JOYAXISMOTION:
+					axis_values[ev.axis] = ev.value  # only last value of frame is used
 
-			axe_id = axe_i.value.axis  # axis id (usually in [0, 3] for a pad with 2 sticks)
-			if axe_id < self.joystick.get_numaxes():
+		# joy axis states
+		for axis, real_axe_val in axis_values.items():
+			for axe_i in self._axis_keys.get(axis, ()):
 				needed_axe_val = axe_i.value.value
-				real_axe_val = self.joystick.get_axis(axe_i.value.axis)
-
-				b_val = axe_id == axe_i.value.axis \
-						and abs(real_axe_val) > abs(needed_axe_val) \
+				b_val = abs(real_axe_val) > abs(needed_axe_val) \
 						and real_axe_val * needed_axe_val > 0  # True if joystick axis value will send action event
-
-				prev_val = self.keys[axe_i]
-
-				if prev_val == KeyState.RELEASED and b_val:
-					self.keys[axe_i] = KeyState.JUST_PRESSED
-				elif prev_val == KeyState.PRESSED and not b_val:
-					self.keys[axe_i] = KeyState.JUST_RELEASED
+				self._update_key_with_bool(axe_i, b_val)
+
+	def _update_key_with_bool(self, key, b_val):
+		prev_val = self.keys[key]
+		if prev_val == KeyState.RELEASED and b_val:
+			self.set_key_state(key, KeyState.JUST_PRESSED)
+		elif prev_val == KeyState.PRESSED and not b_val:
+			self.set_key_state(key, KeyState.JUST_RELEASED)
@@ -0,0 +1,5 @@
+# encoding : UTF-8
+
+from .rollback_session import RollbackSession
+from .udp_transport import UdpTransport, encode_inputs_packet, decode_inputs_packet
+from .game_simulation import GameSimulation, encode_actions, decode_actions
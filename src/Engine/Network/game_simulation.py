@@ -0,0 +1,121 @@
+# encoding : UTF-8
+
+import zlib
+
+from Engine.message_bus import MessageBus, ActionMessage
+from Settings import *
+
+
+# actions exchanged between peers, other actions (camera, pause, quit...) stay local
+NETPLAY_ACTIONS = (PlayerAction.MOVE_LEFT, PlayerAction.MOVE_RIGHT, PlayerAction.MOVE_UP, PlayerAction.MOVE_DOWN,
+				   PlayerAction.THROW_BALL, PlayerAction.JUMP, PlayerAction.DIVE)
+
+
+def encode_actions(actions):
+	"""
+	Encode actions of a player for a frame as a bitmask.
+
+	:param iterable[PlayerAction] actions: actions, only NETPLAY_ACTIONS are encoded
+	:return: bitmask
+	:rtype int:
+	"""
+	mask = 0
+	for action in actions:
+		if action in NETPLAY_ACTIONS:
+			mask |= 1 << action.value
+	return mask
+
+
+def decode_actions(mask):
+	"""
+	Decode actions encoded by encode_actions.
+
+	:param int mask: bitmask
+	:return: actions, in PlayerAction order
+	:rtype list[PlayerAction]:
+	"""
+	return [action for action in NETPLAY_ACTIONS if mask & (1 << action.value)]
+
+
+class GameSimulation:
+	"""
+	Simulation of a game engine for RollbackSession, with an action bitmask as input for each character.
+
+	Game engine has to be created with a fixed time step. Nothing is displayed and frame rate is not managed when a
+	frame is simulated, so frames could be simulated again after a rollback.
+	"""
+	def __init__(self, game_engine):
+		"""
+		:param GameEngine game_engine: game engine to simulate, characters are players of rollback session
+		"""
+		assert game_engine.fixed_dt is not None, "netplay needs a fixed time step"
+		self.game_engine = game_engine
+
+	def get_player_id(self, player):
+		return self.game_engine.characters[player].player_id
+
+	def get_local_input(self, player):
+		"""
+		Update inputs and AI of a local player, and encode its actions.
+
+		Actions of input devices are assigned to local player, whatever their player id.
+
+		:param int player: index of local player
+		:return: bitmask of local player actions
+		:rtype int:
+		"""
+		game_engine = self.game_engine
+		player_id = self.get_player_id(player)
+
+		if game_engine.input_manager is not None:
+			game_engine.input_manager.update()
+		game_engine.ai_manager.update(player_ids=[player_id])
+
+		actions = []
+		for ev in MessageBus.get_instance().drain(ActionMessage):
+			if ev.action == PlayerAction.QUIT:
+				game_engine.request_quit()
+			actions.append(ev.action)
+		return encode_actions(actions)
+
+	# AI of local player is an input source, updated once per advance: its state is not rolled back with the world,
+	# as frames simulated again after a rollback use recorded inputs without updating AI
+	def snapshot(self):
+		return self.game_engine.snapshot(with_ai=False)
+
+	def restore(self, snapshot):
+		self.game_engine.restore(snapshot, with_ai=False)
+
+	def step(self, inputs):
+		"""
+		Simulate a frame.
+
+		:param list[int] inputs: actions bitmask of each character
+		:return: None
+		"""
+		game_engine = self.game_engine
+		action_events = [ActionMessage(char.player_id, action)
+						 for char, mask in zip(game_engine.characters, inputs) for action in decode_actions(mask)]
+
+		game_engine.get_state(GEStateType.RUNNING).simulate(game_engine.fixed_dt, action_events)
+		game_engine.add_ticks(game_engine.fixed_dt, is_running_state=True)
+		game_engine.frame_count += 1
+
+	def get_checksum(self):
+		"""
+		Get checksum of simulated world (ball, characters, trajectory, scores, rules and random generator), to check
+		that peers are synchronized.
+
+		:return: CRC32 checksum
+		:rtype int:
+		"""
+		game_engine = self.game_engine
+		values = [game_engine.get_running_ticks(), game_engine.rng.getstate(),
+				  game_engine.teams[TeamId.LEFT].score, game_engine.teams[TeamId.RIGHT].score]
+		game_engine.get_state(GEStateType.RUNNING).save_state(values)
+		game_engine.ball.save_state(values)
+		for char in game_engine.characters:
+			char.save_state(values)
+		if game_engine.thrower_manager.current_trajectory is not None:
+			game_engine.thrower_manager.current_trajectory.save_state(values)
+		return zlib.crc32(repr(values).encode())
@@ -0,0 +1,164 @@
+# encoding : UTF-8
+
+from Settings import *
+
+
+class RollbackSession:
+	"""
+	Rollback session to play a simulation between several peers, each one running it locally.
+
+	Only inputs are exchanged between peers. When input of a remote player is not received yet for a frame, it is
+	predicted by repeating its last known input. When a received input differs from its prediction, simulation is
+	restored at this frame and following frames are simulated again.
+
+	Simulation has to implement these methods :
+		- snapshot() : return simulation state
+		- restore(snapshot) : restore simulation state
+		- step(inputs) : simulate a frame with a list of inputs, one for each player
+
+	Inputs are integers, default input is 0.
+	"""
+	def __init__(self, simulation, players_nb, local_player, input_delay=NETPLAY_INPUT_DELAY,
+				 max_rollback_frames=NETPLAY_MAX_ROLLBACK_FRAMES):
+		"""
+		:param simulation: simulation to play
+		:param int players_nb: number of players
+		:param int local_player: index of local player
+		:param int input_delay: number of frames between local input and its use in simulation
+		:param int max_rollback_frames: maximum number of frames simulated ahead of last confirmed frame
+		"""
+		self.simulation = simulation
+		self.players_nb = players_nb
+		self.local_player = local_player
+		self.input_delay = input_delay
+		self.max_rollback_frames = max_rollback_frames
+
+		self.current_frame = 0  # next frame to simulate
+		self.rollbacks_nb = 0
+		self.rollback_frames_nb = 0
+
+		# confirmed inputs of each player, inputs of first frames are 0 because of input delay
+		self._inputs = [{frame: 0 for frame in range(input_delay)} for _ in range(players_nb)]
+		self._confirmed_frames = [input_delay - 1] * players_nb  # last frame of contiguous confirmed inputs
+		self._predicted_inputs = [{} for _ in range(players_nb)]
+		self._snapshots = {}  # simulation state before each frame which is not confirmed
+		self._rollback_frame = None
+
+	def get_confirmed_frame(self, player=None):
+		"""
+		Get last frame which inputs of all players, or of a specific player, are confirmed.
+
+		:param int player: index of player, if None all players are considered
+		:rtype int:
+		"""
+		return min(self._confirmed_frames) if player is None else self._confirmed_frames[player]
+
+	def get_local_inputs(self, first_frame):
+		"""
+		Get local inputs from a frame to last known one.
+
+		:param int first_frame: first frame
+		:return: local inputs, one for each frame
+		:rtype list[int]:
+		"""
+		inputs = self._inputs[self.local_player]
+		return [inputs[frame] for frame in range(max(first_frame, 0), self._confirmed_frames[self.local_player] + 1)]
+
+	def can_advance(self):
+		"""
+		Check if a new frame can be simulated, i.e. if simulation is not too far from confirmed inputs.
+
+		:rtype bool:
+		"""
+		return self.current_frame - self.get_confirmed_frame() <= self.max_rollback_frames
+
+	def add_local_input(self, local_input):
+		"""
+		Add local input of current frame, used in simulation after input delay.
+
+		:param int local_input: local input
+		:return: None
+		"""
+		frame = self.current_frame + self.input_delay
+		self._add_input(self.local_player, frame, local_input)
+
+	def add_remote_input(self, player, frame, remote_input):
+		"""
+		Add input of a remote player. Simulation is rolled back if input differs from predicted one.
+
+		:param int player: index of remote player
+		:param int frame: frame of input
+		:param int remote_input: remote input
+		:return: None
+		"""
+		if frame in self._inputs[player]:
+			return
+		self._add_input(player, frame, remote_input)
+
+		predicted_input = self._predicted_inputs[player].pop(frame, None)
+		if predicted_input is not None and predicted_input != remote_input:
+			if self._rollback_frame is None or frame < self._rollback_frame:
+				self._rollback_frame = frame
+
+	def _add_input(self, player, frame, player_input):
+		inputs = self._inputs[player]
+		inputs[frame] = player_input
+		while self._confirmed_frames[player] + 1 in inputs:
+			self._confirmed_frames[player] += 1
+
+	def _get_input(self, player, frame):
+		"""
+		Get confirmed input, or predicted one by repeating last known input.
+
+		:param int player: index of player
+		:param int frame: frame of input
+		:return: input
+		:rtype int:
+		"""
+		inputs = self._inputs[player]
+		if frame in inputs:
+			return inputs[frame]
+
+		predicted_input = inputs[self._confirmed_frames[player]]
+		self._predicted_inputs[player][frame] = predicted_input
+		return predicted_input
+
+	def _step(self, frame):
+		self._snapshots[frame] = self.simulation.snapshot()
+		self.simulation.step([self._get_input(player, frame) for player in range(self.players_nb)])
+
+	def advance(self):
+		"""
+		Roll back if needed, then simulate current frame.
+
+		:return: None
+		"""
+		self.synchronize()
+
+		self._step(self.current_frame)
+		self.current_frame += 1
+
+		# forget states which will not be restored anymore
+		confirmed_frame = self.get_confirmed_frame()
+		for frame in [frame for frame in self._snapshots if frame <= confirmed_frame]:
+			del self._snapshots[frame]
+
+	def synchronize(self):
+		"""
+		Roll back if a received input differs from its prediction: simulation is restored at frame of this input, and
+		following frames are simulated again until current frame.
+
+		:return: None
+		"""
+		if self._rollback_frame is None:
+			return
+
+		self.simulation.restore(self._snapshots[self._rollback_frame])
+		self.rollbacks_nb += 1
+		self.rollback_frames_nb += self.current_frame - self._rollback_frame
+
+		for frame in range(self._rollback_frame, self.current_frame):
+			for predicted_inputs in self._predicted_inputs:
+				predicted_inputs.pop(frame, None)
+			self._step(frame)
+		self._rollback_frame = None
@@ -0,0 +1,111 @@
+# encoding : UTF-8
+
+import random
+import socket
+import struct
+from collections import deque
+from time import perf_counter
+
+
+# inputs packet : acknowledged remote frame, first frame of inputs, number of inputs, then inputs
+_INPUTS_HEADER_STRUCT = struct.Struct("<iiH")
+_INPUT_STRUCT = struct.Struct("<H")
+
+
+def encode_inputs_packet(ack_frame, first_frame, inputs):
+	"""
+	Encode an inputs packet.
+
+	:param int ack_frame: last frame of contiguous inputs received from remote peer
+	:param int first_frame: frame of first input
+	:param list[int] inputs: inputs of consecutive frames
+	:return: packet
+	:rtype bytes:
+	"""
+	return _INPUTS_HEADER_STRUCT.pack(ack_frame, first_frame, len(inputs)) \
+		+ b"".join(_INPUT_STRUCT.pack(val) for val in inputs)
+
+
+def decode_inputs_packet(packet):
+	"""
+	Decode an inputs packet encoded by encode_inputs_packet.
+
+	:param bytes packet: packet
+	:return: acknowledged frame, first frame of inputs and inputs
+	:rtype tuple(int, int, list[int]):
+	"""
+	ack_frame, first_frame, inputs_nb = _INPUTS_HEADER_STRUCT.unpack_from(packet, 0)
+	inputs = [_INPUT_STRUCT.unpack_from(packet, _INPUTS_HEADER_STRUCT.size + i * _INPUT_STRUCT.size)[0]
+			  for i in range(inputs_nb)]
+	return ack_frame, first_frame, inputs
+
+
+class UdpTransport:
+	"""
+	Non-blocking UDP socket between 2 peers, with optional artificial latency and packet loss.
+
+	Outgoing packets are delayed and randomly dropped before being sent, in order to test netplay on localhost.
+	"""
+	def __init__(self, local_port, remote_address, latency=0, loss=0., rng=None):
+		"""
+		:param int local_port: port to bind on all interfaces
+		:param tuple(str, int) remote_address: host and port of remote peer
+		:param float latency: artificial delay of outgoing packets in ms
+		:param float loss: artificial probability to drop an outgoing packet, in [0, 1]
+		:param random.Random rng: random generator used for packet loss, a new one is created if None
+		"""
+		self.remote_address = remote_address
+		self.latency = latency
+		self.loss = loss
+		self.rng = rng if rng is not None else random.Random()
+
+		self.sent_packets_nb = 0
+		self.dropped_packets_nb = 0
+
+		self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+		self._socket.bind(("", local_port))
+		self._socket.setblocking(False)
+		self._delayed_packets = deque()  # (sending time in s, packet)
+
+	def send(self, packet):
+		"""
+		Send a packet to remote peer, after artificial latency, unless it is dropped.
+
+		:param bytes packet: packet to send
+		:return: None
+		"""
+		if self.loss > 0 and self.rng.random() < self.loss:
+			self.dropped_packets_nb += 1
+			return
+		self._delayed_packets.append((perf_counter() + self.latency / 1000, packet))
+		self._flush()
+
+	def receive(self):
+		"""
+		Send delayed packets which latency is elapsed, and receive all available packets.
+
+		:return: received packets
+		:rtype list[bytes]:
+		"""
+		self._flush()
+
+		packets = []
+		while True:
+			try:
+				packet, address = self._socket.recvfrom(4096)
+			except (BlockingIOError, ConnectionResetError):
+				break
+			packets.append(packet)
+		return packets
+
+	def _flush(self):
+		now = perf_counter()
+		while len(self._delayed_packets) > 0 and self._delayed_packets[0][0] <= now:
+			try:
+				self._socket.sendto(self._delayed_packets.popleft()[1], self.remote_address)
+				self.sent_packets_nb += 1
+			except ConnectionRefusedError:
+				pass  # remote peer is not started yet
+
+	def close(self):
+		self._socket.close()
@@ -0,0 +1,3 @@
+# encoding : UTF-8
+
+from .replay_file import ReplayWriter, ReplayReader, ReplayFrame, ReplayCharacterFrame
@@ -0,0 +1,293 @@
+# encoding : UTF-8
+
+import mmap
+import struct
+from collections import namedtuple
+
+from Settings import *
+from Engine.snapshot import encode_snapshot, decode_snapshot
+
+
+# binary replay file layout (little endian) :
+#	- header : magic, version, number of characters, number of frames, offset and number of action events, offset and
+#	number of keyframes index entries, keyframes interval
+#	- player id of each character
+#	- fixed-size record for each frame : running ticks, time step, ball and characters data, scores, action events indices
+#	- action events table : player id and action of each event, in frames order
+#	- keyframes : JSON encoded game state given by GameEngine.snapshot, every keyframes interval frames
+#	- keyframes index : frame, offset and size of each keyframe
+REPLAY_MAGIC = b"VBRP"
+REPLAY_VERSION = 5
+
+_HEADER_STRUCT = struct.Struct("<4sHHIQIQII")
+_PLAYER_ID_STRUCT = struct.Struct("<BB")
+_EVENT_STRUCT = struct.Struct("<BBB")
+_KEYFRAME_INDEX_STRUCT = struct.Struct("<IQI")
+
+_PLAYER_ID_ENUMS = (PlayerId, AIId)
+
+ReplayFrame = namedtuple("ReplayFrame", ["ticks", "dt", "ball_position", "ball_velocity", "ball_will_be_served",
+										 "characters", "scores", "first_event", "events_nb"])
+ReplayFrame.__doc__ = """
+Data of a recorded frame.
+
+	- :var float ticks: running ticks of game engine, in ms
+	- :var float dt: time step used to simulate frame, in ms
+	- :var tuple(float) ball_position: (x, y, z) ball position
+	- :var tuple(float) ball_velocity: (x, y, z) ball velocity
+	- :var bool ball_will_be_served: True if ball waits to be served
+	- :var tuple(ReplayCharacterFrame) characters: data of each character
+	- :var tuple(int, int) scores: left and right team scores
+	- :var int first_event: index of first action event of frame in events table
+	- :var int events_nb: number of action events of frame
+"""
+
+ReplayCharacterFrame = namedtuple("ReplayCharacterFrame", ["position", "velocity", "state_type", "direction"])
+ReplayCharacterFrame.__doc__ = """
+Data of a recorded character for a frame.
+
+	- :var tuple(float) position: (x, y, z) character position
+	- :var tuple(float) velocity: (x, y, z) character velocity
+	- :var CharacterStateType state_type: type of character state
+	- :var tuple(int, int) direction: sign of diving direction along x and y axis, (0, 0) if character is not diving
+"""
+
+
+def _get_frame_struct(characters_nb):
+	"""
+	Get struct of a frame record for a given number of characters.
+
+	:param int characters_nb: number of characters
+	:return: frame struct
+	:rtype struct.Struct:
+	"""
+	return struct.Struct("<dd3f3fB" + characters_nb * "3f3fbbb" + "HHIH")
+
+
+class ReplayWriter:
+	"""
+	Write a game in a compact binary replay file, frame after frame.
+
+	Each frame is written as a fixed-size record. Action events and world state keyframes are gathered in tables
+	written at the end of file by close method.
+	"""
+	def __init__(self, filename, player_id_list, keyframe_interval=REPLAY_KEYFRAME_INTERVAL):
+		"""
+		:param str filename: path of replay file
+		:param list player_id_list: ids of players (PlayerId or AIId), in characters order
+		:param int keyframe_interval: number of frames between 2 world state keyframes
+		"""
+		self.player_id_list = list(player_id_list)
+		self.keyframe_interval = keyframe_interval
+		self.frames_nb = 0
+
+		self._file = open(filename, "wb")
+		self._frame_struct = _get_frame_struct(len(self.player_id_list))
+		self._events = bytearray()
+		self._events_nb = 0
+		self._keyframes = bytearray()
+		self._keyframes_index = []  # (frame, offset in self._keyframes, size) for each keyframe
+
+		# header is written again when file is closed
+		self._write_header(events_offset=0, keyframes_index_offset=0)
+		for player_id in self.player_id_list:
+			self._file.write(_PLAYER_ID_STRUCT.pack(*_encode_player_id(player_id)))
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def _write_header(self, events_offset, keyframes_index_offset):
+		self._file.write(_HEADER_STRUCT.pack(REPLAY_MAGIC, REPLAY_VERSION, len(self.player_id_list), self.frames_nb,
+											 events_offset, self._events_nb, keyframes_index_offset,
+											 len(self._keyframes_index), self.keyframe_interval))
+
+	def write_frame(self, game_engine, action_events):
+		"""
+		Write current frame of a game engine, and a keyframe every keyframe interval frames.
+
+		:param GameEngine game_engine: game engine to record
+		:param list[ActionMessage] action_events: action events of frame
+		:return: None
+		"""
+		ball = game_engine.ball
+		values = [game_engine.get_running_ticks(), game_engine.dt, *ball.position, *ball.velocity, ball.will_be_served]
+		for char in game_engine.characters:
+			direction = char.state.direction if char.is_state_type_of(CharacterStateType.DIVING) else (0, 0)
+			values += [*char.position, *char.velocity, char.state.type.value, _sign(direction[0]), _sign(direction[1])]
+		values += [game_engine.teams[TeamId.LEFT].score, game_engine.teams[TeamId.RIGHT].score,
+				   self._events_nb, len(action_events)]
+		self._file.write(self._frame_struct.pack(*values))
+
+		for ev in action_events:
+			self._events += _EVENT_STRUCT.pack(*_encode_player_id(ev.player_id), ev.action.value)
+		self._events_nb += len(action_events)
+
+		if self.frames_nb % self.keyframe_interval == 0:
+			keyframe = encode_snapshot(game_engine.snapshot())
+			self._keyframes_index.append((self.frames_nb, len(self._keyframes), len(keyframe)))
+			self._keyframes += keyframe
+		self.frames_nb += 1
+
+	def close(self):
+		"""
+		Write action events table, keyframes and their index, update header and close file.
+
+		:return: None
+		"""
+		if self._file.closed:
+			return
+		events_offset = self._file.tell()
+		self._file.write(self._events)
+
+		keyframes_offset = self._file.tell()
+		self._file.write(self._keyframes)
+		keyframes_index_offset = self._file.tell()
+		for frame, offset, size in self._keyframes_index:
+			self._file.write(_KEYFRAME_INDEX_STRUCT.pack(frame, keyframes_offset + offset, size))
+
+		self._file.seek(0)
+		self._write_header(events_offset, keyframes_index_offset)
+		self._file.close()
+
+
+class ReplayReader:
+	"""
+	Read a binary replay file written by ReplayWriter.
+
+	File is memory-mapped and frames are unpacked on demand, so random access to any frame of a long replay is cheap.
+	"""
+	def __init__(self, filename):
+		"""
+		:param str filename: path of replay file
+		"""
+		self._file = open(filename, "rb")
+		self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+		magic, version, characters_nb, frames_nb, events_offset, events_nb, keyframes_index_offset, keyframes_nb, \
+			self.keyframe_interval = _HEADER_STRUCT.unpack_from(self._mmap, 0)
+		if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+			self.close()
+			raise ValueError("{} is not a replay file of version {}".format(filename, REPLAY_VERSION))
+
+		offset = _HEADER_STRUCT.size
+		self.player_id_list = []
+		for _ in range(characters_nb):
+			self.player_id_list.append(_decode_player_id(*_PLAYER_ID_STRUCT.unpack_from(self._mmap, offset)))
+			offset += _PLAYER_ID_STRUCT.size
+
+		self._frame_struct = _get_frame_struct(characters_nb)
+		self._frames_offset = offset
+
+		# if writer was not closed, frames are still readable but action events and keyframes are lost
+		if events_offset == 0:
+			frames_nb = (len(self._mmap) - self._frames_offset) // self._frame_struct.size
+			events_offset, events_nb = len(self._mmap), 0
+			keyframes_nb = 0
+		self.frames_nb = frames_nb
+		self._events_offset = events_offset
+		self._events_nb = events_nb
+		self._keyframes_index_offset = keyframes_index_offset
+		self._keyframes_nb = keyframes_nb
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *args):
+		self.close()
+
+	def __len__(self):
+		return self.frames_nb
+
+	def read_frame(self, frame):
+		"""
+		Read a frame.
+
+		:param int frame: frame number
+		:return: frame data
+		:rtype ReplayFrame:
+		"""
+		if not 0 <= frame < self.frames_nb:
+			raise IndexError("frame {} out of replay (0 to {})".format(frame, self.frames_nb - 1))
+
+		values = self._frame_struct.unpack_from(self._mmap, self._frames_offset + frame * self._frame_struct.size)
+		characters = []
+		for i in range(9, len(values) - 4, 9):
+			characters.append(ReplayCharacterFrame(values[i:i + 3], values[i + 3:i + 6],
+												   CharacterStateType(values[i + 6]), values[i + 7:i + 9]))
+		return ReplayFrame(values[0], values[1], values[2:5], values[5:8], bool(values[8]), tuple(characters),
+						   values[-4:-2], values[-2], values[-1])
+
+	def read_events(self, frame):
+		"""
+		Read action events of a frame.
+
+		:param int frame: frame number
+		:return: (player_id, action) tuples of frame
+		:rtype list[tuple(PlayerId or AIId, PlayerAction)]:
+		"""
+		replay_frame = self.read_frame(frame)
+		first_event = min(replay_frame.first_event, self._events_nb)
+		last_event = min(replay_frame.first_event + replay_frame.events_nb, self._events_nb)
+
+		events = []
+		for i in range(first_event, last_event):
+			enum_index, value, action = _EVENT_STRUCT.unpack_from(self._mmap, self._events_offset + i * _EVENT_STRUCT.size)
+			events.append((_decode_player_id(enum_index, value), PlayerAction(action)))
+		return events
+
+	def read_keyframe(self, frame):
+		"""
+		Read nearest keyframe at or before a frame.
+
+		Keyframes are written at regular interval, so nearest keyframe is found without searching in index.
+
+		:param int frame: frame number
+		:return: frame number of keyframe and game state given by GameEngine.snapshot, or None if there is no keyframe
+		:rtype tuple(int, tuple) or None:
+		"""
+		if self._keyframes_nb == 0:
+			return None
+
+		index = max(0, min(frame // self.keyframe_interval, self._keyframes_nb - 1))
+		keyframe_frame, offset, size = _KEYFRAME_INDEX_STRUCT.unpack_from(
+			self._mmap, self._keyframes_index_offset + index * _KEYFRAME_INDEX_STRUCT.size)
+		return keyframe_frame, decode_snapshot(self._mmap[offset:offset + size])
+
+	def close(self):
+		"""
+		Close memory map and file.
+
+		:return: None
+		"""
+		self._mmap.close()
+		self._file.close()
+
+
+def _sign(x):
+	return (x > 0) - (x < 0)
+
+
+def _encode_player_id(player_id):
+	"""
+	Encode player id, human or bot, as an (enum index, value) pair.
+
+	:param PlayerId or AIId player_id: player id
+	:return: enum index and value
+	:rtype tuple(int, int):
+	"""
+	return _PLAYER_ID_ENUMS.index(type(player_id)), player_id.value
+
+
+def _decode_player_id(enum_index, value):
+	"""
+	Decode player id encoded by _encode_player_id.
+
+	:param int enum_index: index of enum in _PLAYER_ID_ENUMS
+	:param int value: value of player id
+	:return: player id
+	:rtype PlayerId or AIId:
+	"""
+	return _PLAYER_ID_ENUMS[enum_index](value)
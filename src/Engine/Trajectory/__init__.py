@@ -1,5 +1,6 @@
 # encoding : UTF-8
 
 from .trajectory_solver import *
+from .solver_cache import SolverCache, cached_find_initial_velocity, cached_find_target_position
 from .thrower_manager import ThrowerManager
 from .trajectory import Trajectory
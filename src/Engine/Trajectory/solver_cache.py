@@ -0,0 +1,100 @@
+# encoding : UTF-8
+
+from collections import OrderedDict
+
+from pygame import Vector3
+
+from Engine.Trajectory.trajectory_solver import find_initial_velocity, find_target_position
+from Settings import SOLVER_CACHE_SIZE, SOLVER_CACHE_QUANTUM
+
+
+class SolverCache:
+	"""
+	Bounded LRU cache of a solver function, keyed on its quantized arguments.
+
+	Numbers and vectors arguments are rounded to multiples of a quantum. Solver is called with rounded arguments, so a
+	result only depends on its key: cached or not, same inputs give same results, which keeps game deterministic after
+	snapshots restoration. Quantum has to be small enough to keep results within physics tolerance.
+
+	A cache can wrap any function, and is called like it:
+		>>> cached_function = SolverCache(function)
+		>>> cached_function(*args, **kwargs)
+	"""
+	def __init__(self, function, max_size=SOLVER_CACHE_SIZE, quantum=SOLVER_CACHE_QUANTUM):
+		"""
+		:param function: solver function to cache, its arguments have to be numbers, vectors or hashable values
+		:param int max_size: max number of cached results, least recently used results are dropped
+		:param float quantum: rounding step of numbers and vectors components
+		"""
+		self.function = function
+		self.max_size = max_size
+		self.quantum = quantum
+
+		self.hits_nb = 0
+		self.misses_nb = 0
+		self._results = OrderedDict()
+
+	def __call__(self, *args, **kwargs):
+		key = (tuple(self._quantize(arg) for arg in args),
+			   tuple((name, self._quantize(arg)) for name, arg in sorted(kwargs.items())))
+
+		if key in self._results:
+			self.hits_nb += 1
+			self._results.move_to_end(key)
+			result = self._results[key]
+		else:
+			self.misses_nb += 1
+			result = self.function(*(self._dequantize(arg, q_arg) for arg, q_arg in zip(args, key[0])),
+								   **{name: self._dequantize(kwargs[name], q_arg) for name, q_arg in key[1]})
+			self._results[key] = result
+			if len(self._results) > self.max_size:
+				self._results.popitem(last=False)
+
+		# results could be modified in place by caller
+		return Vector3(result) if isinstance(result, Vector3) else result
+
+	def _quantize(self, arg):
+		if isinstance(arg, bool):
+			return arg
+		if isinstance(arg, (int, float)):
+			return round(arg / self.quantum)
+		if isinstance(arg, Vector3):
+			return round(arg.x / self.quantum), round(arg.y / self.quantum), round(arg.z / self.quantum)
+		return arg
+
+	def _dequantize(self, arg, q_arg):
+		if isinstance(arg, bool):
+			return arg
+		if isinstance(arg, (int, float)):
+			return q_arg * self.quantum
+		if isinstance(arg, Vector3):
+			return Vector3(q_arg[0] * self.quantum, q_arg[1] * self.quantum, q_arg[2] * self.quantum)
+		return arg
+
+	def get_hit_rate(self):
+		"""
+		Get ratio of calls which result was cached.
+
+		:return: hit rate in [0, 1], 0 if cache was never called
+		:rtype float:
+		"""
+		calls_nb = self.hits_nb + self.misses_nb
+		return self.hits_nb / calls_nb if calls_nb > 0 else 0.
+
+	def clear(self):
+		"""
+		Forget cached results and reset counters.
+
+		:return: None
+		"""
+		self._results.clear()
+		self.hits_nb = 0
+		self.misses_nb = 0
+
+	def __len__(self):
+		return len(self._results)
+
+
+# cached solvers used by game engine
+cached_find_initial_velocity = SolverCache(find_initial_velocity)
+cached_find_target_position = SolverCache(find_target_position)
@@ -1,13 +1,11 @@
 # encoding : UTF-8
 
 import random
-from datetime import datetime
 
 from Engine.Display.debug3D_utils import *
 from Engine.Trajectory import *
 from Engine.Trajectory.trajectory import Trajectory
 from Settings import *
-random.seed(datetime.now())  # for random throwing
 
 
 class ThrowerManager:
@@ -20,7 +18,11 @@ class ThrowerManager:
 	def get_instance():
 		return ThrowerManager.s_instance
 
-	def __init__(self):
+	def __init__(self, rng=None):
+		"""
+		:param random.Random rng: random generator used for random throwing, a new one is created if None
+		"""
+		self.rng = rng if rng is not None else random.Random()
 		self._current_trajectory = None
 		
 		self.trajectory_changed = False
@@ -38,6 +40,27 @@ class ThrowerManager:
 		self._current_trajectory = value
 		self.trajectory_changed = True
 	
+	def save_state(self, values):
+		"""
+		Append current trajectory and its change flag to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		values += [self.trajectory_changed, self._current_trajectory is not None]
+		if self._current_trajectory is not None:
+			self._current_trajectory.save_state(values)
+
+	def load_state(self, values):
+		"""
+		Read current trajectory and its change flag from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		self.trajectory_changed = next(values)
+		self._current_trajectory = Trajectory.load_state(values) if next(values) else None
+
 	@staticmethod
 	def get_effective_target_position(direction, character_position):
 		"""
@@ -154,7 +177,7 @@ class ThrowerManager:
 		cen = [(corner_1[i] + corner_2[i]) / 2 for i in (0, 1)]
 		amp = [(corner_1[i] - corner_2[i]) / 2 for i in (0, 1)]
 		
-		target_pos = Vector3(2 * random.random(), 2 * random.random(), ball.radius) - (1, 1, 0)  # x and y in ]-1, 1[
+		target_pos = Vector3(2 * self.rng.random(), 2 * self.rng.random(), ball.radius) - (1, 1, 0)  # x and y in ]-1, 1[
 		target_pos.x = amp[0] * target_pos.x + cen[0]
 		target_pos.y = amp[1] * target_pos.y + cen[1]
 		
@@ -203,15 +226,16 @@ class ThrowerManager:
 		:return: None
 		"""
 		velocity_efficiency = kwargs["velocity_efficiency"] if "velocity_efficiency" in kwargs.keys() else 1
-		velocity = velocity_efficiency * find_initial_velocity(initial_pos, target_pos, wanted_height)
+		velocity = velocity_efficiency * cached_find_initial_velocity(initial_pos, target_pos, wanted_height)
 		
 		# target position changed due to velocity_efficiency
-		eff_target_pos = find_target_position(initial_pos, velocity, target_pos.z)
+		eff_target_pos = cached_find_target_position(initial_pos, velocity, target_pos.z)
 		self.current_trajectory = Trajectory(initial_pos, eff_target_pos, velocity)
 		
 		# throw the ball
 		ball.position = Vector3(initial_pos)
 		ball.velocity = Vector3(velocity)
+		ball.set_trajectory(self.current_trajectory)
 		
 	def smash_ball(self, ball, initial_pos, target_pos):
 		"""
@@ -225,10 +249,10 @@ class ThrowerManager:
 		velocity = SMASH_VELOCITY * (target_pos - ball.position).normalize()
 		
 		# process real target position, target_pos was only used to process velocity vector
-		real_target_position = find_target_position(initial_pos, velocity, ball.radius)
+		real_target_position = cached_find_target_position(initial_pos, velocity, ball.radius)
 		self.current_trajectory = Trajectory(initial_pos, real_target_position, velocity)
 		
 		# throw the ball
 		ball.position = Vector3(initial_pos)
 		ball.velocity = Vector3(velocity)
-		
\ No newline at end of file
+		ball.set_trajectory(self.current_trajectory)
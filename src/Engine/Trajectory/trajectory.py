@@ -3,11 +3,14 @@
 from pygame import Vector3
 
 from Engine import game_engine
+from Engine.snapshot import write_optional_vector3, read_optional_vector3
 from Engine.Trajectory.trajectory_solver import get_time_at_z, get_z_at_y, get_x_at_y, get_time_at_y
 from Settings import G
 
 
 class Trajectory:
+	__slots__ = ("origin_pos", "target_pos", "initial_velocity", "t0", "debug_pts")
+
 	def __init__(self, origin_pos=None, target_pos=None, initial_velocity=None):
 		self.origin_pos = Vector3(origin_pos) if origin_pos is not None else None
 		self.target_pos = Vector3(target_pos) if target_pos is not None else None
@@ -23,6 +26,32 @@ class Trajectory:
 		self.t0 = g_e.get_running_ticks() if g_e is not None else 0
 		self._set_n_debug_3d_points(n=10)
 
+	def save_state(self, values):
+		"""
+		Append trajectory parameters to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		write_optional_vector3(values, self.origin_pos)
+		write_optional_vector3(values, self.target_pos)
+		write_optional_vector3(values, self.initial_velocity)
+		values.append(self.t0)
+
+	@staticmethod
+	def load_state(values):
+		"""
+		Create a trajectory from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: read trajectory
+		:rtype Trajectory:
+		"""
+		trajectory = Trajectory(read_optional_vector3(values), read_optional_vector3(values),
+								read_optional_vector3(values))
+		trajectory.t0 = next(values)
+		return trajectory
+
 	def _set_n_debug_3d_points(self, n):
 		"""
 		Process n 3D-points in ball trajectory.
@@ -52,6 +81,28 @@ class Trajectory:
 				z_i = -t_i ** 2 / 2 * G + t_i * self.initial_velocity.z
 				self.debug_pts.append(Vector3(u_i * u + self.origin_pos + Vector3(0, 0, z_i)))
 
+	def get_position_at(self, t):
+		"""
+		Get position of a ball following trajectory.
+
+		:param float t: time in sec since trajectory origin
+		:return: position at t
+		:rtype pygame.Vector3:
+		"""
+		o, v = self.origin_pos, self.initial_velocity
+		return Vector3(o.x + t * v.x, o.y + t * v.y, o.z + t * (v.z - G / 2 * t))
+
+	def get_velocity_at(self, t):
+		"""
+		Get velocity of a ball following trajectory.
+
+		:param float t: time in sec since trajectory origin
+		:return: velocity at t
+		:rtype pygame.Vector3:
+		"""
+		v = self.initial_velocity
+		return Vector3(v.x, v.y, v.z - G * t)
+
 	def get_final_time(self):
 		"""
 		Get final time for trajectory.
@@ -1,5 +1,6 @@
 # encoding : UTF-8
 
+import numpy as np
 from pygame import Vector3
 from math import sqrt
 from Settings import G
@@ -160,6 +161,139 @@ def get_x_at_y(origin_pos, initial_velocity, y):
 		return None
 
 
+def find_initial_velocity_array(origin_pos, target_pos, wanted_height):
+	"""
+	Vectorized version of find_initial_velocity, for N throws at once.
+
+	Throws without solution (wanted height not above origin or target, no real velocity) are not valid, their velocity
+	is NaN.
+
+	:param numpy.ndarray origin_pos: (N, 3) origin positions
+	:param numpy.ndarray target_pos: (N, 3) target positions
+	:param float|numpy.ndarray wanted_height: height desired on net place, middle of trajectory or at apogee, a float or
+	(N,) array
+	:return: (N, 3) velocities to apply to the ball, and (N,) mask of valid throws
+	:rtype tuple(numpy.ndarray, numpy.ndarray):
+	"""
+	origin_pos = np.asarray(origin_pos, dtype=float)
+	target_pos = np.asarray(target_pos, dtype=float)
+	wanted_height = np.asarray(wanted_height, dtype=float)
+
+	with np.errstate(divide="ignore", invalid="ignore"):
+		# u vector : unit vector in XY plane from origin to target position, ut and zt : target coordinates in (u, z) ref
+		to_vect = target_pos[:, :2] - origin_pos[:, :2]
+		ut = np.hypot(to_vect[:, 0], to_vect[:, 1])
+		u = to_vect / ut[:, None]
+		zt = target_pos[:, 2] - origin_pos[:, 2]
+
+		# uh, zh : coordinates of point above the net in (u, z) ref
+		different_sides = origin_pos[:, 1] * target_pos[:, 1] < 0
+		alpha = np.where(different_sides, np.abs(origin_pos[:, 1] / (target_pos[:, 1] - origin_pos[:, 1])), 0.5)
+		uh = alpha * ut
+		zh = wanted_height - origin_pos[:, 2]
+
+		# initial velocity in (u, z) ref, see find_initial_velocity
+		a = ut / uh * zh - zt
+		c = G * ut / 2 * (uh - ut)
+		delta = -4 * a * c
+		vo_u = np.sqrt(delta) / (2 * a)
+		vo_z = zh * (vo_u / uh) + uh / vo_u * G / 2
+
+		velocity = np.empty_like(origin_pos)
+		velocity[:, :2] = vo_u[:, None] * u
+		velocity[:, 2] = vo_z
+
+		# vertical throws
+		vertical = ut == 0
+		velocity[vertical, :2] = 0
+		velocity[vertical, 2] = np.sqrt(2 * G * zh[vertical])
+
+	valid = (zh > 0) & (wanted_height > target_pos[:, 2]) & np.isfinite(velocity).all(axis=1)
+	velocity[~valid] = np.nan
+	return velocity, valid
+
+
+def find_target_position_array(origin_pos, initial_velocity, wanted_z=0):
+	"""
+	Vectorized version of find_target_position, for N balls at once.
+
+	Balls which never reach wanted z are not valid, their target position is NaN.
+
+	:param numpy.ndarray origin_pos: (N, 3) initial ball positions
+	:param numpy.ndarray initial_velocity: (N, 3) initial ball velocities
+	:param float|numpy.ndarray wanted_z: z value of target positions, a float or (N,) array
+	:return: (N, 3) target ball positions, and (N,) mask of valid target positions
+	:rtype tuple(numpy.ndarray, numpy.ndarray):
+	"""
+	origin_pos = np.asarray(origin_pos, dtype=float)
+	initial_velocity = np.asarray(initial_velocity, dtype=float)
+
+	t_t, valid = get_time_at_z_array(initial_velocity[:, 2], origin_pos[:, 2], wanted_z)
+
+	target_pos = np.empty_like(origin_pos)
+	target_pos[:, :2] = origin_pos[:, :2] + t_t[:, None] * initial_velocity[:, :2]
+	target_pos[:, 2] = wanted_z
+	target_pos[~valid] = np.nan
+	return target_pos, valid
+
+
+def get_time_at_z_array(vz_0, z_0, z):
+	"""
+	Vectorized version of get_time_at_z.
+
+	:param numpy.ndarray vz_0: (N,) initial vertical velocities
+	:param numpy.ndarray z_0: (N,) initial z values
+	:param float|numpy.ndarray z: target z value, a float or (N,) array
+	:return: (N,) times in sec when z is reached during descending phase, NaN if there is no solution, and (N,) mask of
+	valid times
+	:rtype tuple(numpy.ndarray, numpy.ndarray):
+	"""
+	a, b, c, delta = get_time_polynomial_fun(np.asarray(vz_0, dtype=float), np.asarray(z_0, dtype=float), z)
+
+	valid = delta >= 0
+	t = np.where(valid, (-b + np.sqrt(np.where(valid, delta, 0))) / (2 * a), np.nan)
+	return t, valid
+
+
+def get_z_at_y_array(initial_velocity, initial_position, y):
+	"""
+	Vectorized version of get_z_at_y.
+
+	:param numpy.ndarray initial_velocity: (N, 3) initial ball velocities
+	:param numpy.ndarray initial_position: (N, 3) initial ball positions
+	:param float|numpy.ndarray y: y value, a float or (N,) array
+	:return: (N,) ball heights at y, NaN if y is never reached (null velocity along y), and (N,) mask of valid heights
+	:rtype tuple(numpy.ndarray, numpy.ndarray):
+	"""
+	initial_velocity = np.asarray(initial_velocity, dtype=float)
+	initial_position = np.asarray(initial_position, dtype=float)
+
+	valid = initial_velocity[:, 1] != 0
+	with np.errstate(divide="ignore", invalid="ignore"):
+		t_y = (y - initial_position[:, 1]) / initial_velocity[:, 1]
+		z_at_y = initial_position[:, 2] + t_y * (initial_velocity[:, 2] - G / 2 * t_y)
+	return np.where(valid, z_at_y, np.nan), valid
+
+
+def get_x_at_y_array(origin_pos, initial_velocity, y):
+	"""
+	Vectorized version of get_x_at_y.
+
+	:param numpy.ndarray origin_pos: (N, 3) initial ball positions
+	:param numpy.ndarray initial_velocity: (N, 3) initial ball velocities
+	:param float|numpy.ndarray y: y value, a float or (N,) array
+	:return: (N,) ball x coordinates at y, NaN if y is never reached (null velocity along y), and (N,) mask of valid x
+	:rtype tuple(numpy.ndarray, numpy.ndarray):
+	"""
+	origin_pos = np.asarray(origin_pos, dtype=float)
+	initial_velocity = np.asarray(initial_velocity, dtype=float)
+
+	valid = initial_velocity[:, 1] != 0
+	with np.errstate(divide="ignore", invalid="ignore"):
+		x_at_y = origin_pos[:, 0] + (y - origin_pos[:, 1]) / initial_velocity[:, 1] * initial_velocity[:, 0]
+	return np.where(valid, x_at_y, np.nan), valid
+
+
 def _are_points_in_same_y_side(p1, p2):
 	"""
 	Return True if the 2 given points are on same side (y axis).
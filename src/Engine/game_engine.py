@@ -1,15 +1,20 @@
 # encoding : UTF-8
 
 import pygame as pg
+import random
+from time import perf_counter
 
 from Settings import *
 from Game import Ball, Team, Character, Court, CharacterStates
 
-from Engine.Actions import ActionObject
+from Engine.Actions import ActionObject, ActionRecorder
 from Engine.AI.ai_manager import AIManager
-from Engine.Collisions import CollisionsManager
-from Engine.Display import DisplayManager
+from Engine.Collisions import CollisionsManager, ColliderRegistry
+from Engine.Display import DisplayManager, ScaledSurfaceCache
 from Engine.Input import InputManager
+from Engine.message_bus import MessageBus, ActionMessage
+from Engine.profiler import FrameProfiler
+from Engine.Replay import ReplayWriter
 from Engine.Trajectory import ThrowerManager
 import Engine.game_engine_states as GEStates
 
@@ -26,27 +31,81 @@ class GameEngine(ActionObject):
 	def get_instance():
 		return GameEngine.s_instance
 
-	def __init__(self):
+	def __init__(self, headless=False, player_id_list=None, fixed_dt=None, seed=None, record_actions=False,
+				 replay=None, replay_filename=None, playback=None, profiler_filename=None, behaviour_tree_factories=None):
+		"""
+		:param bool headless: if True, no window is created, nothing is displayed, inputs are not read and frame rate
+		is not limited: one physics step is simulated at each frame. Useful to simulate games between bots faster than
+		real time.
+		:param list player_id_list: ids of players (PlayerId or AIId) to create characters for. Default is a human
+		player against a bot.
+		:param float fixed_dt: time in ms of a physics step, default is FIXED_DT. Physics is always simulated with this
+		time step, whatever render frame rate, so results do not depend on frame rate.
+		:param int seed: seed of game engine random generator. If specified, game is deterministic.
+		:param bool record_actions: if True, action events of each frame are recorded in :var self.action_recorder:
+		:param ActionRecorder replay: recorded actions to replay, instead of reading inputs and updating AI. Seed,
+		players and time step of recording are used.
+		:param str replay_filename: if specified, each running frame is written in this binary replay file
+		:param ReplayReader playback: binary replay to play back. Recorded frames are displayed, physics, AI and inputs
+		are skipped.
+		:param str profiler_filename: if specified, phases of each frame are timed by :var self.profiler:, percentiles
+		are printed at exit and timings of last frames are exported in this CSV or JSON file
+		:param dict behaviour_tree_factories: function which builds behaviour tree of an AIEntity (see AIEntity), for
+		each AIId. Default 1v1 behaviour tree is used for missing ids.
+		"""
 		GameEngine.s_instance = self
 
+		if replay is not None:
+			seed, player_id_list, fixed_dt = replay.seed, replay.player_id_list, replay.fixed_dt
+		elif playback is not None:
+			player_id_list = playback.player_id_list
+		elif record_actions and seed is None:
+			seed = random.randrange(2**32)  # a recorded game has to be deterministic
+
+		ActionObject.objects = []  # forget action objects of a previous game engine
+		# colliders of game objects are stored in a registry owned by game engine, so rows of a previous game engine are
+		# freed with it
+		self.collider_registry = ColliderRegistry()
+		ColliderRegistry.s_default = self.collider_registry
 		ActionObject.__init__(self)
+		self.headless = headless
+		self.fixed_dt = fixed_dt if fixed_dt is not None else FIXED_DT
+
+		# unique random generator for game simulation
+		self.seed = seed
+		self.rng = random.Random(seed)
+
+		self.replay = replay
+		self.action_recorder = None
+		self.playback = playback
+		self.replay_writer = None
+		self.profiler_filename = profiler_filename
+		self.profiler = FrameProfiler() if profiler_filename is not None else None
+		self.behaviour_tree_factories = behaviour_tree_factories if behaviour_tree_factories is not None else {}
+
+		self.message_bus = MessageBus()
 		self.ai_manager = AIManager()
-		self.display_manager = DisplayManager()
-		self.input_manager = InputManager()
-		self.collisions_manager = CollisionsManager()
-		self.thrower_manager = ThrowerManager()
+		self.display_manager = DisplayManager() if not headless else None
+		if self.profiler is not None and self.display_manager is not None:
+			self.profiler.add_stats("scaled_surface_cache", ScaledSurfaceCache.get_instance().get_stats)
+		self.input_manager = InputManager() if not headless else None
+		self.collisions_manager = CollisionsManager(self.rng)
+		self.thrower_manager = ThrowerManager(self.rng)
 
 		self.done = False
 
 		self.clock = time.Clock()
-		self.dt = 0
+		self.dt = self.fixed_dt
+		self._initial_wall_time = perf_counter()
 
 		self._initial_ticks = time.get_ticks()
-		self._previous_ticks = self._initial_ticks
+		self._time_accumulator = 0  # elapsed time in ms which is not simulated yet, always < fixed_dt after a frame
+		self.interpolation_alpha = 1.  # position of displayed objects between previous and current physics steps
 
 		self._total_ticks = 0
 		self._running_ticks = 0
-		self.frame_count = 0
+		self.frame_count = 0  # number of physics steps
+		self.rendered_frame_count = 0
 
 		# game objects
 		self.ball = None
@@ -58,18 +117,23 @@ class GameEngine(ActionObject):
 		self._states = {}
 		self._current_state_type = None
 
-		self._create()
+		self._create(player_id_list)
 
-	def _create(self):
-		# allowed pygame events
-		pg.event.set_blocked([i for i in range(pg.NUMEVENTS)])
-		pg.event.set_allowed([pg.KEYDOWN, pg.KEYUP,
-							  pg.JOYBUTTONDOWN, pg.JOYBUTTONUP,
-							  pg.JOYHATMOTION,
-							  pg.QUIT, pg.VIDEORESIZE,
-		                      ACTION_EVENT, THROW_EVENT, RULES_BREAK_EVENT])
+		if record_actions:
+			self.action_recorder = ActionRecorder(seed, [char.player_id for char in self.characters], self.fixed_dt)
+		if replay_filename is not None:
+			self.replay_writer = ReplayWriter(replay_filename, [char.player_id for char in self.characters])
 
-		self.new_game([PlayerId.PLAYER_ID_1, AIId.AI_ID_1])
+	def _create(self, player_id_list=None):
+		# allowed pygame events, only used for inputs and window, pygame event module is not needed in headless mode
+		if not self.headless:
+			pg.event.set_blocked([i for i in range(pg.NUMEVENTS)])
+			pg.event.set_allowed([pg.KEYDOWN, pg.KEYUP,
+								  pg.JOYBUTTONDOWN, pg.JOYBUTTONUP,
+								  pg.JOYHATMOTION, pg.JOYAXISMOTION,
+								  pg.QUIT, pg.VIDEORESIZE])
+
+		self.new_game(player_id_list if player_id_list is not None else [PlayerId.PLAYER_ID_1, AIId.AI_ID_1])
 
 		# states
 		self._states[GEStateType.RUNNING] = GEStates.Running()
@@ -77,6 +141,10 @@ class GameEngine(ActionObject):
 
 		self._current_state_type = GEStateType.RUNNING
 
+		if self.playback is not None:
+			self._states[GEStateType.REPLAYING] = GEStates.Replaying(self.playback)
+			self._current_state_type = GEStateType.REPLAYING
+
 	def set_current_state_type(self, state_type):
 		if state_type in self._states.keys():
 			self._current_state_type = state_type
@@ -86,10 +154,24 @@ class GameEngine(ActionObject):
 	def get_current_state(self):
 		return self._states[self._current_state_type]
 
+	def get_state(self, state_type):
+		return self._states[state_type]
+
 	def new_game(self, player_id_list=None):
 		self.ai_manager.reset()
 		
 		player_id_list = player_id_list if player_id_list is not None else [AIId.AI_ID_1, AIId.AI_ID_2]
+
+		# forget objects of previous game, and release their colliders
+		for char in self.characters:
+			ActionObject.objects.remove(char)
+			char.collider.release()
+		if self.ball is not None:
+			self.ball.kill()
+			self.ball.collider.release()
+		if self.court is not None:
+			self.court.collider.release()
+
 		self.ball = Ball(radius=BALL_RADIUS)
 		self.court = Court(COURT_DIM_Y, COURT_DIM_X, NET_HEIGHT_BTM, NET_HEIGHT_TOP)
 		self.characters = []
@@ -97,9 +179,11 @@ class GameEngine(ActionObject):
 		for pl_id in player_id_list:
 			char = Character(player_id=pl_id)
 			self.characters.append(char)
-			# AI
+			# AI, with its own random generator forked from game engine one, in order to draw same numbers from game
+			# engine random generator when AI is not updated (replay)
 			if pl_id in AIId.__iter__():
-				self.ai_manager.add_entity(char)
+				self.ai_manager.add_entity(char, random.Random(self.rng.getrandbits(64)),
+										   self.behaviour_tree_factories.get(pl_id))
 
 		self.objects = [self.court, self.ball] + self.characters
 
@@ -113,15 +197,100 @@ class GameEngine(ActionObject):
 		self.teams = {TeamId.LEFT: l_team, TeamId.RIGHT: r_team}
 
 		# display manager - scene 3D
-		self.display_manager.scene_3d.set_ball_sprite(self.ball)
+		if self.display_manager is not None:
+			self.display_manager.scene_3d.set_ball_sprite(self.ball)
 
 	def update_actions(self, action_events, **kwargs):
 		for ev in action_events:
 			if ev.action == PlayerAction.QUIT:
 				self.request_quit()
-		if len(pg.event.get(pg.QUIT)) > 0:
+		if not self.headless and len(pg.event.get(pg.QUIT)) > 0:
 			self.request_quit()
 
+	def get_action_events(self, update_ai=True):
+		"""
+		Get action events of current frame, from inputs and AI or from replayed actions.
+
+		Action events are recorded if needed.
+
+		:param bool update_ai: if True, AI is updated to generate its action events
+		:return: action events of current frame
+		:rtype list[ActionMessage]:
+		"""
+		if self.replay is not None:
+			self.replay.post_actions(self.frame_count)
+		else:
+			# KB EVENTS
+			if self.input_manager is not None:
+				self.input_manager.update()
+			if self.profiler is not None:
+				self.profiler.mark("inputs")
+			# AI
+			if update_ai:
+				self.ai_manager.update()
+				if self.profiler is not None:
+					self.profiler.mark("ai")
+
+		action_events = self.message_bus.drain(ActionMessage)
+
+		if self.action_recorder is not None:
+			self.action_recorder.record(self.frame_count, action_events)
+		return action_events
+
+	def snapshot(self, with_ai=True):
+		"""
+		Get complete mutable state of game: tick counters, random generator state, game engine states, ball,
+		characters with their state, current trajectory, scores and AI entities.
+
+		Snapshot is a flat tuple of scalars, cheap to create and to store, see Engine.snapshot module.
+
+		:param bool with_ai: if False, state of AI entities is not saved, e.g. when AI is an input source which is not
+		simulated again after a rollback
+		:return: game state, to be restored with restore method, with same :var with_ai: value
+		:rtype tuple:
+		"""
+		values = [self._running_ticks, self._total_ticks, self.frame_count, self.dt, self._current_state_type,
+				  self.rng.getstate()]
+		self._states[GEStateType.RUNNING].save_state(values)
+		self._states[GEStateType.PAUSING].save_state(values)
+		self.ball.save_state(values)
+		for char in self.characters:
+			char.save_state(values)
+		self.thrower_manager.save_state(values)
+		values += [self.teams[TeamId.LEFT].score, self.teams[TeamId.RIGHT].score]
+		if with_ai:
+			self.ai_manager.save_state(values)
+		return tuple(values)
+
+	def restore(self, snapshot, with_ai=True):
+		"""
+		Restore game state.
+
+		Game has to be created with same players than game of snapshot.
+
+		:param tuple snapshot: game state given by snapshot method
+		:param bool with_ai: if False, AI entities are kept in their current state, snapshot has to be created without
+		AI state too
+		:return: None
+		"""
+		values = iter(snapshot)
+		self._running_ticks = next(values)
+		self._total_ticks = next(values)
+		self.frame_count = next(values)
+		self.dt = next(values)
+		self._current_state_type = next(values)
+		self.rng.setstate(next(values))
+		self._states[GEStateType.RUNNING].load_state(values)
+		self._states[GEStateType.PAUSING].load_state(values)
+		self.ball.load_state(values)
+		for char in self.characters:
+			char.load_state(values)
+		self.thrower_manager.load_state(values)
+		self.teams[TeamId.LEFT].score = next(values)
+		self.teams[TeamId.RIGHT].score = next(values)
+		if with_ai:
+			self.ai_manager.load_state(values)
+
 	def request_quit(self):
 		"""
 		Call this method to quit main loop and game.
@@ -130,18 +299,40 @@ class GameEngine(ActionObject):
 		"""
 		self.done = True
 
-	def run(self):
+	def run(self, duration=None):
 		"""
 		Main loop, call different managers (input, display...) etc.
 		
+		:param float duration: if specified, loop stops when running ticks reach this duration in ms
 		:return: None
 		"""
-		while not self.done:
-			current_state = self._states[self._current_state_type]
-			current_state.run(dt=self.dt)
-			current_state.next()
+		while not self.done and (duration is None or self._running_ticks < duration):
+			self.step()
 
-		print("run with {} fps".format(self.get_average_fps()))
+		if self.replay_writer is not None:
+			self.replay_writer.close()
+
+		if self.profiler is not None:
+			print(self.profiler.get_report())
+			self.profiler.export(self.profiler_filename)
+
+		if self.headless:
+			print("simulated {} s at {} simulated s per s".format(round(self._running_ticks / 1000, 1),
+																  self.get_simulation_speed()))
+		else:
+			print("run with {} fps".format(self.get_average_fps()))
+
+	def step(self):
+		"""
+		Run current state for one frame and eventually change state.
+
+		:return: None
+		"""
+		if self.profiler is not None:
+			self.profiler.begin_frame()
+		current_state = self._states[self._current_state_type]
+		current_state.run(dt=self.dt)
+		current_state.next()
 
 	def get_character_by_player_id(self, player_id):
 		for char in self.characters:
@@ -155,6 +346,9 @@ class GameEngine(ActionObject):
 	def get_running_ticks(self):
 		return self._running_ticks
 
+	def set_running_ticks(self, val):
+		self._running_ticks = val
+
 	def get_total_ticks(self):
 		return self._total_ticks
 
@@ -163,16 +357,69 @@ class GameEngine(ActionObject):
 		if is_running_state:
 			self._running_ticks += val
 
-	def manage_framerate_and_time(self, is_running_state=True):
-		t1 = self._previous_ticks
+	def get_physics_steps_nb(self):
+		"""
+		Limit render frame rate, then get number of physics steps to simulate for current frame.
+
+		Elapsed wall-clock time is accumulated and consumed by steps of fixed_dt, remaining time is used to interpolate
+		displayed objects. In headless mode, frame rate is not limited and one step is simulated at each frame.
+
+		:return: number of physics steps to simulate
+		:rtype int:
+		"""
+		if self.headless:
+			return 1
+
 		self.clock.tick(NOMINAL_FRAME_RATE)
-		t2 = pg.time.get_ticks()
+		self._time_accumulator += min(TIME_SPEED * self.clock.get_time(), MAX_FRAME_DURATION)
+		steps_nb = int(self._time_accumulator // self.fixed_dt)
+		self._time_accumulator -= steps_nb * self.fixed_dt
+
+		if self.profiler is not None:
+			self.profiler.mark("idle")
+		return steps_nb
 
-		self.dt = TIME_SPEED * (t2 - t1)
-		self.add_ticks(self.dt, is_running_state)
+	def end_physics_step(self, is_running_state=True):
+		"""
+		Update ticks and frame count after a physics step.
+
+		:param bool is_running_state: if True, running ticks are updated too
+		:return: None
+		"""
+		self.add_ticks(self.fixed_dt, is_running_state)
 		self.frame_count += 1
-		self._previous_ticks = t2
+
+	def render(self, interpolation_alpha=None):
+		"""
+		Display game objects.
+
+		Ball and characters are displayed between their positions at previous and current physics steps, so motion is
+		smooth at any render frame rate.
+
+		:param float interpolation_alpha: interpolation factor in [0, 1], 1 to display current positions. Default is
+		deduced from elapsed time which is not simulated yet.
+		:return: None
+		"""
+		if interpolation_alpha is None:
+			interpolation_alpha = self._time_accumulator / self.fixed_dt
+		self.interpolation_alpha = interpolation_alpha
+		self.display_manager.update([*self.objects, self.thrower_manager])
+		self.rendered_frame_count += 1
+
+		if self.profiler is not None:
+			self.profiler.mark("display")
 
 	def get_average_fps(self, ndigits=1):
-		return round(1000 * self.frame_count / (time.get_ticks() - self._initial_ticks), ndigits)
+		return round(1000 * self.rendered_frame_count / (time.get_ticks() - self._initial_ticks), ndigits)
+
+	def get_simulation_speed(self, ndigits=1):
+		"""
+		Get simulation speed, i.e. simulated seconds per wall-clock second since game engine creation.
+
+		:param int ndigits: number of digits to round result
+		:return: simulated seconds per wall-clock second
+		:rtype float:
+		"""
+		wall_time = perf_counter() - self._initial_wall_time
+		return round(self._running_ticks / 1000 / wall_time, ndigits)
 	
\ No newline at end of file
@@ -5,6 +5,7 @@ import pygame as pg
 import Engine.game_engine
 from Engine.Trajectory import ThrowerManager
 from Engine.Actions import ActionObject
+from Engine.message_bus import ActionMessage, ThrowMessage, RulesBreakMessage
 from Game import CharacterStates
 from Settings import *
 
@@ -54,40 +55,78 @@ class Running(GameEngineState, ActionObject):
 		dt = kwargs["dt"] if "dt" in kwargs.keys() else 0
 		game_engine = Engine.game_engine.GameEngine.get_instance()
 
+		# as many physics steps as needed to catch up with elapsed time
+		for _ in range(game_engine.get_physics_steps_nb()):
+			actions_events = self.simulate(dt)
+
+			# REPLAY
+			if game_engine.replay_writer is not None:
+				game_engine.replay_writer.write_frame(game_engine, actions_events)
+				if game_engine.profiler is not None:
+					game_engine.profiler.mark("replay")
+
+			game_engine.end_physics_step()
+
+			# state change is applied before next step
+			if self._pause_requested or game_engine.done:
+				break
+
+		# DISPLAY
+		if not game_engine.headless:
+			game_engine.render()
+
+	def simulate(self, dt, action_events=None):
+		"""
+		Simulate game for one frame: rules, physics, collisions, inputs, AI, actions and throws.
+
+		Nothing is displayed and frame rate is not managed here.
+
+		:param float dt: time in ms to simulate
+		:param list[ActionMessage] action_events: if specified, these action events are used
+		instead of inputs and AI ones
+		:return: action events of frame
+		:rtype list[ActionMessage]:
+		"""
+		game_engine = Engine.game_engine.GameEngine.get_instance()
+		profiler = game_engine.profiler
+
 		# detect rules break
 		if not self.has_pending_rule():
 			game_engine.ball.update_rules()
+		if profiler is not None:
+			profiler.mark("rules")
 
 		# PHYSICS
 		game_engine.ball.update_physics(dt)
 		for char in game_engine.characters:
 			char.update_physics(dt)
+		if profiler is not None:
+			profiler.mark("physics")
 		
 		# COLLISIONS
-		game_engine.collisions_manager.update(game_engine.ball, game_engine.court, game_engine.characters)
-		
-		# KB EVENTS
-		game_engine.input_manager.update()
-		# AI
-		game_engine.ai_manager.update()
+		game_engine.collisions_manager.update([game_engine.ball], game_engine.court, game_engine.characters)
+		if profiler is not None:
+			profiler.mark("collisions")
 		
-		actions_events = pg.event.get(ACTION_EVENT)
+		# KB EVENTS AND AI
+		actions_events = game_engine.get_action_events() if action_events is None else action_events
 		
 		# UPDATE ACTIONS
-		for action_object in ActionObject.objects + [self]:
-			action_object.update_actions(actions_events, dt=dt)
+		ActionObject.dispatch_action_events(ActionObject.objects + [self], actions_events, dt=dt)
+		if profiler is not None:
+			profiler.mark("actions")
 
 		# throw event
-		game_engine.thrower_manager.update(pg.event.get(THROW_EVENT), game_engine.ball)
+		game_engine.thrower_manager.update(game_engine.message_bus.drain(ThrowMessage), game_engine.ball)
+		if profiler is not None:
+			profiler.mark("throws")
 		
 		# manage rules
-		self.manage_rules(pg.event.get(RULES_BREAK_EVENT))
-		
-		# DISPLAY
-		game_engine.display_manager.update([*game_engine.objects, game_engine.thrower_manager])
-		
-		# manage frame rate
-		game_engine.manage_framerate_and_time()
+		self.manage_rules(game_engine.message_bus.drain(RulesBreakMessage))
+		if profiler is not None:
+			profiler.mark("rules_management")
+
+		return actions_events
 		
 	def next(self, **kwargs):
 		if self._pause_requested:
@@ -96,9 +135,7 @@ class Running(GameEngineState, ActionObject):
 			print("game paused")
 	
 	def update_actions(self, action_events, **kwargs):
-		filtered_action_events = self.filter_action_events_by_player_id(action_events)
-		
-		for ev in filtered_action_events:
+		for ev in action_events:
 			if ev.action == PlayerAction.PAUSE:
 				self._pause_requested = True
 			elif ev.action == PlayerAction.SPACE_TEST:
@@ -121,7 +158,7 @@ class Running(GameEngineState, ActionObject):
 		These previous actions are launched after rules break with a delay, specified by PENDING_RULE_DURATION global
 		constant in ms.
 
-		:param list(pygame.event.Event of type RULES_BREAK_EVENT) rules_break_events: list containing rules break
+		:param list[RulesBreakMessage] rules_break_events: list containing rules break
 		events. Only the first one is considered.
 		:return: None
 		"""
@@ -152,6 +189,7 @@ class Running(GameEngineState, ActionObject):
 		if character.team.id == TeamId.LEFT:
 			pos.y *= -1
 		character.position = pos
+		character.previous_position = Vector3(pos)  # no interpolation from previous position
 		character.state = CharacterStates.Serving(character)
 
 		game_engine.ball.wait_to_be_served_by(character)
@@ -176,12 +214,36 @@ class Running(GameEngineState, ActionObject):
 				if char.team.id == TeamId.LEFT:
 					pos.y *= -1
 				char.position = pos
+				char.previous_position = Vector3(pos)
 				# state
 				char.state = CharacterStates.Idling(char)
 
 	def has_pending_rule(self):
 		return self._pending_rule is not None
 
+	def save_state(self, values):
+		"""
+		Append pause request and pending rule to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		values += [self._pause_requested, self.has_pending_rule()]
+		if self.has_pending_rule():
+			values += [self._pending_rule.faulty_team, self._pending_rule.rule_type, self._pending_rule.time_stamp]
+
+	def load_state(self, values):
+		"""
+		Read pause request and pending rule from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		self._pause_requested = next(values)
+		self._pending_rule = None
+		if next(values):
+			self._pending_rule = RulesBreakMessage(next(values), next(values), next(values))
+
 
 class Pausing(GameEngineState, ActionObject):
 	def __init__(self):
@@ -190,19 +252,22 @@ class Pausing(GameEngineState, ActionObject):
 	
 	def run(self, **kwargs):
 		game_engine = Engine.game_engine.GameEngine.get_instance()
-		
-		# KB EVENTS
-		game_engine.input_manager.update()
-		actions_events = pg.event.get(ACTION_EVENT)
-		# UPDATE ACTIONS
-		self.update_actions(action_events=actions_events)
-		game_engine.update_actions(action_events=actions_events)
+
+		# inputs are read at physics rate, as in Running state, so recorded frames are the same
+		for _ in range(game_engine.get_physics_steps_nb()):
+			# KB EVENTS
+			actions_events = game_engine.get_action_events(update_ai=False)
+			# UPDATE ACTIONS
+			ActionObject.dispatch_action_events([self, game_engine], actions_events)
+
+			game_engine.end_physics_step(is_running_state=False)
+
+			if self._resume_requested or game_engine.done:
+				break
 		
 		# DISPLAY
-		game_engine.display_manager.update([*game_engine.objects, game_engine.thrower_manager])
-		
-		# manage frame rate
-		game_engine.manage_framerate_and_time(is_running_state=False)
+		if not game_engine.headless:
+			game_engine.render()
 	
 	def next(self, **kwargs):
 		if self._resume_requested:
@@ -211,12 +276,118 @@ class Pausing(GameEngineState, ActionObject):
 			self._resume_requested = False
 	
 	def update_actions(self, action_events, **kwargs):
-		filtered_action_events = self.filter_action_events_by_player_id(action_events)
-		
-		for ev in filtered_action_events:
+		for ev in action_events:
 			if ev.action == PlayerAction.PAUSE:
 				self._resume_requested = True
+
+	def save_state(self, values):
+		values.append(self._resume_requested)
+
+	def load_state(self, values):
+		self._resume_requested = next(values)
 				
 
+class Replaying(GameEngineState):
+	"""
+	Game engine state to play back a binary replay.
+
+	Ball, characters, scores and time are set from recorded frames, physics, AI and inputs are skipped. Game engine
+	quits at the end of replay.
+	"""
+	def __init__(self, replay_reader):
+		"""
+		:param ReplayReader replay_reader: replay to play back
+		"""
+		GameEngineState.__init__(self)
+		self.replay_reader = replay_reader
+		self.current_frame = 0
+
+	def run(self, **kwargs):
+		game_engine = Engine.game_engine.GameEngine.get_instance()
+
+		# a recorded frame is a physics step
+		for _ in range(game_engine.get_physics_steps_nb()):
+			if self.current_frame >= len(self.replay_reader):
+				game_engine.request_quit()
+				return
+			self.apply_frame(self.current_frame)
+			self.current_frame += 1
+
+			game_engine.end_physics_step(is_running_state=False)
+
+		if not game_engine.headless and len(pg.event.get(pg.QUIT)) > 0:
+			game_engine.request_quit()
+
+		# DISPLAY
+		if not game_engine.headless:
+			game_engine.render()
+
+	def next(self, **kwargs):
+		pass
+
+	def seek(self, frame):
+		"""
+		Set next frame to play back and restore whole game state at this frame.
+
+		Nearest previous keyframe is restored, then remaining frames are simulated with recorded action events, so seek
+		duration is bounded by keyframes interval.
+
+		:param int frame: frame number
+		:return: None
+		"""
+		self.current_frame = max(0, min(frame, len(self.replay_reader) - 1))
+
+		keyframe = self.replay_reader.read_keyframe(self.current_frame)
+		if keyframe is None:
+			return
+
+		game_engine = Engine.game_engine.GameEngine.get_instance()
+		keyframe_frame, snapshot = keyframe
+		game_engine.restore(snapshot)
+		game_engine.set_current_state_type(GEStateType.REPLAYING)
+
+		running_state = game_engine.get_state(GEStateType.RUNNING)
+		for i in range(keyframe_frame + 1, self.current_frame + 1):
+			replay_frame = self.replay_reader.read_frame(i)
+			game_engine.set_running_ticks(replay_frame.ticks)
+
+			action_events = [ActionMessage(player_id, action)
+							 for player_id, action in self.replay_reader.read_events(i)]
+			running_state.simulate(replay_frame.dt, action_events)
+
+	def apply_frame(self, frame):
+		"""
+		Set ball, characters, scores and running ticks from a recorded frame.
+
+		:param int frame: frame number
+		:return: None
+		"""
+		game_engine = Engine.game_engine.GameEngine.get_instance()
+		replay_frame = self.replay_reader.read_frame(frame)
+
+		ball = game_engine.ball
+		ball.previous_position = Vector3(ball.position)
+		ball.position = Vector3(replay_frame.ball_position)
+		ball.velocity = Vector3(replay_frame.ball_velocity)
+		ball.will_be_served = replay_frame.ball_will_be_served
+
+		for char, char_frame in zip(game_engine.characters, replay_frame.characters):
+			# collider depends on state
+			if char_frame.state_type == CharacterStateType.DIVING:
+				direction = Vector3(*char_frame.direction, 0)
+				if direction.x != 0 and direction.y != 0:
+					direction *= 0.7071
+				char.set_diving_collider(direction)
+			else:
+				char.set_default_collider()
+
+			char.previous_position = Vector3(char.position)
+			char.position = Vector3(char_frame.position)
+			char.velocity = Vector3(char_frame.velocity)
+
+		game_engine.teams[TeamId.LEFT].score, game_engine.teams[TeamId.RIGHT].score = replay_frame.scores
+		game_engine.set_running_ticks(replay_frame.ticks)
+
+
 class OnMenu(GameEngineState):
 	pass
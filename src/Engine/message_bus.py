@@ -0,0 +1,153 @@
+# encoding : UTF-8
+
+from collections import namedtuple
+
+from Settings import MESSAGE_BUS_CAPACITY
+
+
+# typed messages
+ActionMessage = namedtuple("ActionMessage", ["player_id", "action"])
+ThrowMessage = namedtuple("ThrowMessage", ["throwing_type", "character", "direction", "position",
+										   "velocity_efficiency"], defaults=[1.])
+RulesBreakMessage = namedtuple("RulesBreakMessage", ["faulty_team", "rule_type", "time_stamp"])
+
+
+class RingBuffer:
+	"""
+	FIFO queue of messages in a preallocated list.
+
+	Capacity is doubled if buffer is full, so no message is lost.
+	"""
+	def __init__(self, capacity=MESSAGE_BUS_CAPACITY):
+		"""
+		:param int capacity: initial number of messages which can be stored
+		"""
+		self._items = [None] * capacity
+		self._start = 0
+		self._count = 0
+
+	def __len__(self):
+		return self._count
+
+	def push(self, item):
+		"""
+		Add an item at the end of queue.
+
+		:param item: item to add
+		:return: None
+		"""
+		capacity = len(self._items)
+		if self._count == capacity:
+			self._items = self._items[self._start:] + self._items[:self._start] + [None] * capacity
+			self._start = 0
+			capacity *= 2
+		self._items[(self._start + self._count) % capacity] = item
+		self._count += 1
+
+	def pop(self):
+		"""
+		Remove and get first item of queue.
+
+		:return: first item
+		"""
+		if self._count == 0:
+			raise IndexError("pop from an empty buffer")
+		item = self._items[self._start]
+		self._items[self._start] = None
+		self._start = (self._start + 1) % len(self._items)
+		self._count -= 1
+		return item
+
+	def drain(self):
+		"""
+		Remove and get all items, in push order.
+
+		Slots are not emptied, drained items are only referenced until they are overwritten.
+
+		:return: items
+		:rtype list:
+		"""
+		end = self._start + self._count
+		items = self._items[self._start:end]
+		if end > len(self._items):
+			items += self._items[:end - len(self._items)]
+		self._start = 0
+		self._count = 0
+		return items
+
+	def clear(self):
+		"""
+		Remove all items.
+
+		:return: None
+		"""
+		self._items[:] = [None] * len(self._items)
+		self._start = 0
+		self._count = 0
+
+
+class MessageBus:
+	"""
+	In-process queues of typed messages (actions, throws and rules breaks) exchanged during a frame.
+
+	Messages are posted by inputs, AI, characters and ball, and each type is drained once per frame by game engine.
+	Unlike pygame event queue, there is no size limit and no SDL round-trip, so it works without pygame event module.
+	"""
+	s_instance = None
+
+	@staticmethod
+	def get_instance():
+		"""
+		Get current message bus, a new one is created if there is no game engine.
+
+		:return: message bus
+		:rtype MessageBus:
+		"""
+		if MessageBus.s_instance is None:
+			MessageBus()
+		return MessageBus.s_instance
+
+	def __init__(self, capacity=MESSAGE_BUS_CAPACITY):
+		"""
+		:param int capacity: initial number of messages of each type which can be stored
+		"""
+		MessageBus.s_instance = self
+		self._buffers = {message_type: RingBuffer(capacity)
+						 for message_type in (ActionMessage, ThrowMessage, RulesBreakMessage)}
+
+	def post(self, message):
+		"""
+		Post a message, to be drained with messages of same type.
+
+		:param ActionMessage|ThrowMessage|RulesBreakMessage message: message to post
+		:return: None
+		"""
+		self._buffers[type(message)].push(message)
+
+	def drain(self, message_type):
+		"""
+		Remove and get all posted messages of a type, in post order.
+
+		:param type message_type: ActionMessage, ThrowMessage or RulesBreakMessage
+		:return: messages
+		:rtype list:
+		"""
+		return self._buffers[message_type].drain()
+
+	def get_count(self, message_type):
+		"""
+		Get number of posted messages of a type, not drained yet.
+
+		:param type message_type: ActionMessage, ThrowMessage or RulesBreakMessage
+		:rtype int:
+		"""
+		return len(self._buffers[message_type])
+
+	def clear(self):
+		"""
+		Remove all posted messages.
+
+		:return: None
+		"""
+		for buffer in self._buffers.values():
+			buffer.clear()
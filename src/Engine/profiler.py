@@ -0,0 +1,150 @@
+# encoding : UTF-8
+
+import csv
+import json
+from time import perf_counter_ns
+
+import numpy as np
+
+from Settings import PROFILER_FRAMES_NB
+
+
+# phases of a frame, in execution order
+PROFILER_PHASES = ("idle", "rules", "physics", "collisions", "inputs", "ai", "actions", "throws", "rules_management",
+				   "replay", "display")
+
+
+class FrameProfiler:
+	"""
+	Time each phase of frames with perf_counter_ns, for the last frames.
+
+	At each mark, time elapsed since previous mark (or frame beginning) is added to given phase, so only one clock read
+	is needed per phase. A frame is a game engine step: it contains all physics steps simulated before a render, so
+	phases timings of a frame can be compared to frame budget. Timings are kept in a ring buffer of the last frames.
+	"""
+	def __init__(self, frames_nb=PROFILER_FRAMES_NB, phases=PROFILER_PHASES):
+		"""
+		:param int frames_nb: number of last frames which timings are kept
+		:param tuple(str) phases: names of phases
+		"""
+		self.phases = tuple(phases)
+		self._phase_indices = {phase: i for i, phase in enumerate(self.phases)}
+		self._timings = [[0] * len(self.phases) for _ in range(frames_nb)]  # in ns
+		self._frames = [-1] * frames_nb
+		self.frames_count = 0
+
+		self._current_timings = None
+		self._last_time = None
+
+		self._stats_getters = {}  # name: function returning a dict of statistics
+
+	def begin_frame(self):
+		"""
+		Start timing of a new frame, timings of oldest kept frame are overwritten if buffer is full.
+
+		:return: None
+		"""
+		i = self.frames_count % len(self._timings)
+		self._current_timings = self._timings[i]
+		self._current_timings[:] = [0] * len(self.phases)
+		self._frames[i] = self.frames_count
+		self.frames_count += 1
+		self._last_time = perf_counter_ns()
+
+	def mark(self, phase):
+		"""
+		Add time elapsed since previous mark to a phase of current frame.
+
+		:param str phase: name of phase, which ends now
+		:return: None
+		"""
+		t = perf_counter_ns()
+		self._current_timings[self._phase_indices[phase]] += t - self._last_time
+		self._last_time = t
+
+	def add_stats(self, name, get_stats):
+		"""
+		Add statistics of a component (e.g. cache hit rate or memory), reported and exported with timings.
+
+		:param str name: name of statistics
+		:param callable get_stats: function without parameter returning current statistics as a dict
+		:return: None
+		"""
+		self._stats_getters[name] = get_stats
+
+	def get_stats(self):
+		"""
+		Get current statistics of added components.
+
+		:return: statistics of each component, as {name: statistics}
+		:rtype dict:
+		"""
+		return {name: get_stats() for name, get_stats in self._stats_getters.items()}
+
+	def get_timings(self):
+		"""
+		Get timings of kept frames, from oldest to newest.
+
+		:return: frame numbers and timings in ms, with a column per phase
+		:rtype (numpy.ndarray, numpy.ndarray):
+		"""
+		frames_nb = min(self.frames_count, len(self._timings))
+		first = self.frames_count - frames_nb
+		rows = [(first + k) % len(self._timings) for k in range(frames_nb)]
+		frames = np.array([self._frames[i] for i in rows], dtype=np.int64)
+		timings = np.array([self._timings[i] for i in rows], dtype=np.int64).reshape(frames_nb, len(self.phases))
+		return frames, timings / 1e6
+
+	def get_percentiles(self, percentiles=(50, 95, 99)):
+		"""
+		Get percentiles of each phase duration, and of total frame duration, over kept frames.
+
+		:param tuple(float) percentiles: percentiles to compute, in [0, 100]
+		:return: percentiles in ms for each phase and for "total", as {phase: {percentile: ms}}
+		:rtype dict:
+		"""
+		_, timings = self.get_timings()
+		if len(timings) == 0:
+			return {}
+		columns = dict(zip(self.phases, timings.T))
+		columns["total"] = timings.sum(axis=1)
+		return {phase: {p: float(v) for p, v in zip(percentiles, np.percentile(values, percentiles))}
+				for phase, values in columns.items()}
+
+	def get_report(self, percentiles=(50, 95, 99)):
+		"""
+		Get a text table of phases durations percentiles.
+
+		:param tuple(float) percentiles: percentiles to compute, in [0, 100]
+		:return: report, a line per phase
+		:rtype str:
+		"""
+		lines = ["{:<18}".format("phase (ms)") + "".join("{:>9}".format("p{}".format(p)) for p in percentiles)]
+		for phase, values in self.get_percentiles(percentiles).items():
+			lines.append("{:<18}".format(phase) + "".join("{:>9.3f}".format(values[p]) for p in percentiles))
+		for name, stats in self.get_stats().items():
+			lines.append("{}: {}".format(name, ", ".join("{} {}".format(k, v) for k, v in stats.items())))
+		return "\n".join(lines)
+
+	def export(self, filename):
+		"""
+		Export timings of kept frames in a CSV file, or in a JSON file with percentiles and statistics if filename ends
+		with .json.
+
+		:param str filename: path of file
+		:return: None
+		"""
+		frames, timings = self.get_timings()
+		if filename.endswith(".json"):
+			with open(filename, "w") as file:
+				json.dump({"phases": list(self.phases),
+						   "frames": frames.tolist(),
+						   "timings_ms": timings.tolist(),
+						   "percentiles_ms": self.get_percentiles(),
+						   "stats": self.get_stats()}, file)
+		else:
+			with open(filename, "w", newline="") as file:
+				writer = csv.writer(file)
+				writer.writerow(["frame", *self.phases])
+				for frame, row in zip(frames.tolist(), timings.tolist()):
+					writer.writerow([frame, *row])
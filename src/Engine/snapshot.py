@@ -0,0 +1,110 @@
+# encoding : UTF-8
+
+"""
+Helpers for game state snapshots.
+
+A snapshot is a flat tuple of scalars (numbers, booleans, enums, strings or None). Objects write their state with a
+save_state(values) method, which appends scalars to a list, and read it back in the same order with a
+load_state(values) method, which consumes an iterator on these scalars. Variable-length parts are preceded by their
+length.
+
+Snapshots are encoded as JSON to be stored, so reading a stored snapshot cannot run code: tuples are encoded as lists,
+and enums as objects with their class name, which is looked up among enums of settings only.
+"""
+
+import json
+from enum import Enum
+
+from pygame import Vector3
+
+import Settings
+
+
+_SNAPSHOT_ENUMS = {name: obj for name, obj in vars(Settings).items() if isinstance(obj, type) and issubclass(obj, Enum)
+				   and obj is not Enum}
+
+
+def write_vector3(values, vector):
+	"""
+	Append a vector to snapshot values.
+
+	:param list values: snapshot values
+	:param pygame.Vector3 vector: vector to write
+	:return: None
+	"""
+	values.extend(vector)
+
+
+def read_vector3(values):
+	"""
+	Read a vector from snapshot values.
+
+	:param iterator values: iterator on snapshot values
+	:return: read vector
+	:rtype pygame.Vector3:
+	"""
+	return Vector3(next(values), next(values), next(values))
+
+
+def write_optional_vector3(values, vector):
+	"""
+	Append a vector, which could be None, to snapshot values.
+
+	:param list values: snapshot values
+	:param pygame.Vector3 vector: vector to write or None
+	:return: None
+	"""
+	values.append(vector is not None)
+	if vector is not None:
+		values.extend(vector)
+
+
+def read_optional_vector3(values):
+	"""
+	Read a vector written by write_optional_vector3 from snapshot values.
+
+	:param iterator values: iterator on snapshot values
+	:return: read vector or None
+	:rtype pygame.Vector3 or None:
+	"""
+	return read_vector3(values) if next(values) else None
+
+
+def _encode_enum(obj):
+	if isinstance(obj, Enum) and _SNAPSHOT_ENUMS.get(type(obj).__name__) is type(obj):
+		return {"enum": type(obj).__name__, "value": obj.value}
+	raise TypeError("{!r} can not be stored in a snapshot".format(obj))
+
+
+def _decode_enum(obj):
+	return _SNAPSHOT_ENUMS[obj["enum"]](obj["value"])
+
+
+def _to_tuple(value):
+	return tuple(_to_tuple(val) for val in value) if isinstance(value, list) else value
+
+
+def encode_snapshot(snapshot):
+	"""
+	Encode a snapshot to bytes.
+
+	:param tuple snapshot: snapshot to encode
+	:return: encoded snapshot
+	:rtype bytes:
+	"""
+	return json.dumps(snapshot, default=_encode_enum, separators=(",", ":")).encode()
+
+
+def decode_snapshot(data):
+	"""
+	Decode a snapshot encoded by encode_snapshot.
+
+	:param bytes data: encoded snapshot
+	:return: decoded snapshot
+	:rtype tuple:
+	:raise ValueError: if data is not an encoded snapshot
+	"""
+	try:
+		return _to_tuple(json.loads(data, object_hook=_decode_enum))
+	except (KeyError, TypeError) as e:
+		raise ValueError("invalid encoded snapshot") from e
@@ -0,0 +1,28 @@
+# encoding : UTF-8
+
+import random
+
+from Settings import *
+from Engine.Actions import ActionObject
+from Engine.message_bus import ActionMessage
+
+
+class _Listener(ActionObject):
+	def __init__(self, player_id):
+		ActionObject.__init__(self, player_id, add_to_objects_list=False)
+		self.received_events = None
+
+	def update_actions(self, action_events, **kwargs):
+		self.received_events = action_events
+
+
+def test_dispatch_action_events_as_filter():
+	rng = random.Random(0)
+	player_ids = [PlayerId.PLAYER_ID_1, PlayerId.PLAYER_ID_2, AIId.AI_ID_1, AIId.AI_ID_2, PlayerId.PLAYER_ID_ALL]
+	action_events = [ActionMessage(rng.choice(player_ids), rng.choice(list(PlayerAction))) for _ in range(100)]
+	listeners = [_Listener(player_id) for player_id in player_ids + [AIId.AI_ID_1]]
+
+	ActionObject.dispatch_action_events(listeners, action_events)
+	for listener in listeners:
+		assert listener.received_events == listener.filter_action_events_by_player_id(action_events)
+	assert listeners[-1].received_events is listeners[2].received_events  # same player id, same bucket
@@ -0,0 +1,81 @@
+# encoding : UTF-8
+
+import numpy as np
+import pytest
+
+from Engine.Batch import BatchSimulator
+from Engine.Collisions import *
+from Settings import *
+
+
+@pytest.fixture()
+def batch_simulator():
+	return BatchSimulator(matches_nb=500, characters_nb=2, seed=0)
+
+
+def test_gravity(batch_simulator):
+	velocity = np.array([1, 2, 8])
+	batch_simulator.set_balls((0, -3, 2), velocity)
+	batch_simulator.ball_will_be_served[0] = True
+
+	dt = 10
+	for _ in range(50):
+		batch_simulator.update_physics(dt)
+
+	# explicit Euler with velocity updated first, same as Ball.update_physics
+	pos = Vector3(0, -3, 2)
+	vel = Vector3(1, 2, 8)
+	for _ in range(50):
+		vel += Vector3(0, 0, -0.001 * dt * G)
+		pos += 0.001 * dt * vel
+
+	assert tuple(batch_simulator.ball_position[1]) == pytest.approx(tuple(pos))
+	assert tuple(batch_simulator.ball_position[0]) == (0, -3, 2)  # ball waiting to be served
+	assert tuple(batch_simulator.ball_velocity[0]) == (0, 0, 0)
+
+
+def test_ground_bounce(batch_simulator):
+	batch_simulator.set_balls((0, -3, 0.4), (1, 0, -2))
+	batch_simulator.update_collisions()
+
+	assert batch_simulator.is_colliding_ground.all()
+	assert tuple(batch_simulator.ball_velocity[0]) == pytest.approx((0.7, 0, 1.4))
+	assert batch_simulator.ball_position[0, 2] == BALL_RADIUS
+
+
+def test_net_collisions_as_scalar(batch_simulator):
+	rng = np.random.default_rng(1)
+	n = batch_simulator.n
+	position = rng.uniform((-4, -1, 0.5), (4, 1, 4), (n, 3))
+	previous_position = position - (0, 0.3, 0)
+	batch_simulator.set_balls(position, (0, 3, 0))
+	batch_simulator.ball_previous_position[:] = previous_position
+	batch_simulator.update_collisions()
+
+	court_collider = AABBCollider(Vector3(0, 0, (NET_HEIGHT_BTM + NET_HEIGHT_TOP) / 2),
+								  (COURT_DIM_X, 0, NET_HEIGHT_TOP - NET_HEIGHT_BTM))
+	for i in range(n):
+		sphere = SphereCollider(Vector3(*position[i]), BALL_RADIUS)
+		is_colliding, _, ball_pos_at_collision = \
+			are_sphere_and_finite_plane_colliding(sphere, court_collider, Vector3(*previous_position[i]))
+
+		assert batch_simulator.is_colliding_net[i] == is_colliding
+		if is_colliding:
+			assert tuple(batch_simulator.ball_position[i]) == pytest.approx(tuple(ball_pos_at_collision))
+			assert np.linalg.norm(batch_simulator.ball_velocity[i]) == pytest.approx(0.8 * 3)
+
+
+def test_character_collisions_as_scalar(batch_simulator):
+	rng = np.random.default_rng(2)
+	n = batch_simulator.n
+	position = rng.uniform((-1, -1, 0), (1, 1, 2), (n, 3))
+	batch_simulator.set_balls(position, (0, 0, 0))
+	batch_simulator.character_position[:, 1] = (0.2, 0.3, 0)
+	batch_simulator.update_collisions()
+
+	for i in range(n):
+		sphere = SphereCollider(Vector3(*batch_simulator.ball_position[i]), BALL_RADIUS)  # net may move ball
+		for j in range(batch_simulator.c):
+			center = Vector3(*batch_simulator.character_position[i, j]) + Vector3(0, 0, CHARACTER_H / 2)
+			aabb = AABBCollider(center, Vector3(CHARACTER_W, CHARACTER_W, CHARACTER_H))
+			assert batch_simulator.is_colliding_character[i, j] == are_sphere_and_aabb_colliding(sphere, aabb)
@@ -0,0 +1,61 @@
+# encoding : UTF-8
+
+import pygame as pg
+import pytest
+
+from Engine.Benchmark import BENCHMARKS, MEMORY_BENCHMARKS, run_benchmarks, compare_to_baseline, merge_results, save_results, load_results
+
+
+def test_benchmarks_run(tmp_path):
+	results = run_benchmarks(BENCHMARKS, repeats=1, memory_benchmarks=MEMORY_BENCHMARKS)
+	assert list(results["benchmarks"]) == [benchmark.name for benchmark in BENCHMARKS]
+	assert all(result["best_us"] > 0 for result in results["benchmarks"].values())
+	assert list(results["memory"]) == [benchmark.name for benchmark in MEMORY_BENCHMARKS]
+	assert all(result["bytes_per_object"] > 0 for result in results["memory"].values())
+
+	filename = str(tmp_path / "results.json")
+	save_results(results, filename)
+	assert load_results(filename) == results
+
+	results = run_benchmarks(BENCHMARKS, names=["find_initial_velocity"], repeats=1)
+	assert list(results["benchmarks"]) == ["find_initial_velocity"]
+
+
+def test_scalable_sprite_workload_rescales(monkeypatch):
+	from Engine.Benchmark.workloads import scalable_sprite_rescale_setup
+	from Engine.Display import ScalableSprite, ScaledSurfaceCache
+
+	cache = ScaledSurfaceCache.get_instance()
+	scale_calls = []
+	scale = pg.transform.scale
+	monkeypatch.setattr(pg.transform, "scale", lambda surface, size: scale_calls.append(size) or scale(surface, size))
+
+	setup = scalable_sprite_rescale_setup()
+	next(setup)()
+	assert len(scale_calls) == 20
+	next(setup, None)
+
+	# global scale factor and cache are restored
+	assert ScalableSprite.get_display_scale_factor() == 1
+	assert ScaledSurfaceCache.get_instance() is cache
+
+
+def test_compare_to_baseline():
+	baseline = {"benchmarks": {"a": {"median_us": 1., "spread": 0.}, "b": {"median_us": 2., "spread": 0.},
+							   "c": {"median_us": 3., "spread": 0.1}, "e": {"median_us": 1., "spread": 0.}}}
+	results = {"benchmarks": {"a": {"median_us": 1.1, "spread": 0.}, "b": {"median_us": 3., "spread": 0.},
+							  "c": {"median_us": 4.2, "spread": 0.1}, "d": {"median_us": 1., "spread": 0.}}}
+
+	# slowdown of c is under threshold plus spreads of samples
+	ratios, regressions = compare_to_baseline(results, baseline, threshold=0.2)
+	assert ratios == pytest.approx({"a": 1.1, "b": 1.5, "c": 1.4})
+	assert regressions == ["b"]
+
+
+def test_merge_results():
+	baseline = {"python": "3.7", "benchmarks": {"a": {"best_us": 1.}, "b": {"best_us": 2.}}}
+	results = {"python": "3.11", "benchmarks": {"b": {"best_us": 3.}, "c": {"best_us": 4.}}}
+
+	assert merge_results(baseline, results) == {"python": "3.11", "benchmarks": {"a": {"best_us": 1.},
+																				   "b": {"best_us": 3.},
+																				   "c": {"best_us": 4.}}}
@@ -1,6 +1,21 @@
 # encoding : UTF-8
 
+import itertools
+import random
+
+import pytest
+
+from Settings import BATCHED_COLLISIONS_MIN_PAIRS_NB
 from Engine.Collisions import *
+from Engine.Collisions.broadphase import BroadphaseGrid
+
+
+def _are_colliding(a, b):
+	if isinstance(a, SphereCollider) and isinstance(b, SphereCollider):
+		return are_spheres_colliding(a, b)
+	if isinstance(a, AABBCollider) and isinstance(b, AABBCollider):
+		return are_aabb_colliding(a, b)
+	return are_sphere_and_aabb_colliding(*((a, b) if isinstance(a, SphereCollider) else (b, a)))
 
 
 def test_spheres_collisions():
@@ -35,3 +50,98 @@ def test_aabb_collisions():
 	
 	aabb_b.center = Vector3(2.1, 0, 0)
 	assert are_aabb_colliding(aabb_a, aabb_b) is False
+
+
+def test_sphere_and_finite_plane_sweep():
+	net = AABBCollider(Vector3(0, 0, 2), (6, 0, 2))
+
+	# fast sphere crossing net between 2 positions
+	sphere = SphereCollider(Vector3(0, 1, 2), 0.5)
+	is_colliding, t, collision_point, sphere_position = sweep_sphere_and_finite_plane(sphere, net, Vector3(0, -1, 2))
+	assert is_colliding is True
+	assert t == pytest.approx(0.25)
+	assert collision_point == Vector3(0, 0, 2)
+	assert sphere_position == Vector3(0, -0.5, 2)
+	assert are_sphere_and_finite_plane_colliding(sphere, net, Vector3(0, -1, 2))[0] is False  # tunnel effect
+
+	# top edge
+	sphere.center = Vector3(0, 1, 3.3)
+	is_colliding, t, collision_point, sphere_position = sweep_sphere_and_finite_plane(sphere, net, Vector3(0, -1, 3.3))
+	assert is_colliding is True
+	assert collision_point == Vector3(0, 0, 3)
+	assert (sphere_position - collision_point).length() == pytest.approx(0.5)
+
+	# corner
+	sphere.center = Vector3(3.3, 1, 3.3)
+	is_colliding, t, collision_point, sphere_position = sweep_sphere_and_finite_plane(sphere, net, Vector3(3.3, -1, 3.3))
+	assert is_colliding is True
+	assert collision_point == Vector3(3, 0, 3)
+
+	# over net
+	sphere.center = Vector3(0, 1, 3.6)
+	assert sweep_sphere_and_finite_plane(sphere, net, Vector3(0, -1, 3.6))[0] is False
+
+	# touching net and moving away
+	sphere.center = Vector3(0, 0.6, 2)
+	assert sweep_sphere_and_finite_plane(sphere, net, Vector3(0, 0.5, 2))[0] is False
+	sphere.center = Vector3(0, 0.4, 2)
+	assert sweep_sphere_and_finite_plane(sphere, net, Vector3(0, 0.5, 2))[:2] == (True, 0)
+
+
+def test_broadphase_candidate_pairs():
+	rng = random.Random(0)
+	colliders = [SphereCollider(Vector3(rng.uniform(-6, 6), rng.uniform(-9, 9), 1), 0.5) for _ in range(50)]
+	colliders += [AABBCollider(Vector3(rng.uniform(-6, 6), rng.uniform(-9, 9), 0.5), (0.4, 0.4, 1)) for _ in range(50)]
+	colliders.append(SphereCollider(Vector3(100, 0, 1), 0.5))  # out of grid
+
+	pairs = BroadphaseGrid(cell_size=1).get_candidate_pairs(colliders)
+	assert all(i < j for i, j in pairs)
+	assert len(pairs) < len(colliders) * (len(colliders) - 1) / 2 / 10
+
+	# every colliding pair is a candidate
+	colliding_pairs = [(i, j) for i in range(len(colliders)) for j in range(i + 1, len(colliders))
+					   if _are_colliding(colliders[i], colliders[j])]
+	assert len(colliding_pairs) > 0
+	assert set(colliding_pairs) <= set(pairs)
+
+
+def test_collider_registry_batched_tests():
+	rng = random.Random(1)
+	registry = ColliderRegistry(capacity=4)
+	spheres = [SphereCollider(Vector3(rng.uniform(-3, 3), rng.uniform(-3, 3), rng.uniform(0, 2)), rng.uniform(0.1, 0.6),
+							  registry) for _ in range(30)]
+	aabbs = [AABBCollider(Vector3(rng.uniform(-3, 3), rng.uniform(-3, 3), rng.uniform(0, 2)),
+						  Vector3(rng.uniform(0.1, 1), rng.uniform(0.1, 1), rng.uniform(0.1, 2)), registry) for _ in range(30)]
+	assert len(registry) == 60
+
+	# per-object API is a view on registry arrays
+	spheres[0].center = Vector3(1, 2, 3)
+	assert tuple(registry.centers[spheres[0].index]) == (1, 2, 3)
+	assert spheres[0].get_bounds() == (Vector3(1, 2, 3) - 3 * (spheres[0].radius,), Vector3(1, 2, 3) + 3 * (spheres[0].radius,))
+
+	# batched tests give same pairs as scalar ones
+	assert registry.get_sphere_pairs(spheres) == [(i, j) for i in range(30) for j in range(i + 1, 30)
+												  if are_spheres_colliding(spheres[i], spheres[j])]
+	assert registry.get_aabb_pairs(aabbs) == [(i, j) for i in range(30) for j in range(i + 1, 30)
+											  if are_aabb_colliding(aabbs[i], aabbs[j])]
+	sphere_aabb_pairs = registry.get_sphere_aabb_pairs(spheres, aabbs)
+	assert len(sphere_aabb_pairs) > 0
+	assert sphere_aabb_pairs == [(i, j) for i in range(30) for j in range(30)
+								 if are_sphere_and_aabb_colliding(spheres[i], aabbs[j])]
+
+	# candidate pairs of any kinds are tested in a batch or one by one, with same results
+	colliders = spheres + aabbs
+	pairs = list(itertools.combinations(range(len(colliders)), 2))
+	colliding_pairs = registry.get_colliding_pairs(colliders, pairs)
+	assert len(pairs) >= BATCHED_COLLISIONS_MIN_PAIRS_NB
+	assert colliding_pairs == [(i, j) for i, j in pairs if _are_colliding(colliders[i], colliders[j])]
+	assert registry.get_colliding_pairs(colliders, pairs[:BATCHED_COLLISIONS_MIN_PAIRS_NB - 1]) == \
+		[pair for pair in colliding_pairs if pair in pairs[:BATCHED_COLLISIONS_MIN_PAIRS_NB - 1]]
+	for i, j in colliding_pairs:
+		assert registry.get_colliding_pairs(colliders, [(i, j), (j, i)]) == [(i, j), (j, i)]
+
+	# rows of released colliders are reused
+	index = aabbs[-1].index
+	aabbs.pop().release()
+	assert len(registry) == 59
+	assert SphereCollider(Vector3(), 1, registry).index == index
@@ -0,0 +1,48 @@
+# encoding : UTF-8
+
+import pygame as pg
+import pytest
+
+from Settings import *
+from Engine import GameEngine
+from Engine.Display.display_manager import merge_rects
+
+
+@pytest.fixture()
+def game_engine():
+	pg.init()
+
+	yield GameEngine(player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=0)
+
+	pg.quit()
+
+
+def test_merge_rects():
+	rects = [pg.Rect(0, 0, 10, 10), pg.Rect(20, 0, 10, 10), pg.Rect(5, 5, 10, 10), pg.Rect(12, 0, 10, 2),
+			 pg.Rect(50, 50, 0, 10), pg.Rect(40, 40, 5, 5)]
+	merged = merge_rects(rects)
+
+	# first 4 rects are merged together as their unions overlap each other, empty rect is ignored
+	assert merged == [pg.Rect(0, 0, 30, 15), pg.Rect(40, 40, 5, 5)]
+	assert rects[0] == pg.Rect(0, 0, 10, 10)
+	assert all(merged[i].colliderect(merged[j]) == 0 for i in range(len(merged)) for j in range(i + 1, len(merged)))
+
+
+def test_compose_and_upscale_match_full_blits(game_engine):
+	display_manager = game_engine.display_manager
+	layers = [display_manager.scene_3d, display_manager.debug_3d, display_manager.debug_text, display_manager.hud]
+	f = display_manager.f_scale
+	assert all(layer.image.get_size() == NOMINAL_RESOLUTION for layer in layers)
+
+	for _ in range(30):
+		game_engine.step()
+
+		# frame is the same as if whole layer images were blitted, and screen is the upscaled frame
+		expected = display_manager.frame.copy()
+		expected.fill(BKGND_SCREEN_COLOR)
+		for layer in layers:
+			expected.blit(layer.image, (0, 0))
+		for r in display_manager.rect_list:
+			for x in range(r.left, r.right, 3):
+				for y in range(r.top, r.bottom, 3):
+					assert display_manager.screen.get_at((x, y)) == expected.get_at((int(x / f), int(y / f)))
@@ -0,0 +1,172 @@
+# encoding : UTF-8
+
+import itertools
+
+import pygame as pg
+import pytest
+
+from Settings import *
+from Engine import GameEngine
+from Engine.Actions import ActionRecorder
+from Engine.Collisions import ColliderRegistry
+
+
+@pytest.fixture()
+def headless_game_engine():
+	# pygame has to be initialized to use event module
+	pg.display.init()
+
+	yield GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2])
+
+	pg.quit()
+
+
+def test_headless_creation(headless_game_engine):
+	assert headless_game_engine.display_manager is None
+	assert headless_game_engine.input_manager is None
+	assert pg.display.get_surface() is None  # no window
+	assert len(headless_game_engine.characters) == 2
+
+
+def test_headless_fixed_time_step(headless_game_engine):
+	n = 200
+	for _ in range(n):
+		headless_game_engine.step()
+
+	assert headless_game_engine.frame_count == n
+	assert headless_game_engine.get_running_ticks() == pytest.approx(n * FIXED_DT)
+	assert headless_game_engine.get_simulation_speed() > 0
+
+
+def test_headless_run_duration(headless_game_engine):
+	headless_game_engine.run(duration=5000)
+	assert 5000 <= headless_game_engine.get_running_ticks() < 5000 + FIXED_DT
+
+
+def _get_game_state(game_engine):
+	positions = [tuple(game_engine.ball.position)]
+	positions += [tuple(char.position) for char in game_engine.characters]
+	scores = [team.score for team in game_engine.teams.values()]
+	return positions, scores, game_engine.get_running_ticks()
+
+
+def test_seeded_game_is_deterministic():
+	pg.display.init()
+	states = []
+	for _ in range(2):
+		game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=42)
+		game_engine.run(duration=20000)
+		states.append(_get_game_state(game_engine))
+	pg.quit()
+
+	assert states[0] == states[1]
+
+
+def test_record_and_replay(tmpdir):
+	pg.display.init()
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], record_actions=True)
+	game_engine.run(duration=20000)
+	recorded_state = _get_game_state(game_engine)
+
+	filename = str(tmpdir.join("actions.json"))
+	game_engine.action_recorder.save(filename)
+	recorder = ActionRecorder.load(filename)
+	assert recorder.frames == game_engine.action_recorder.frames
+	assert recorder.get_frames_count() > 0
+
+	replay_engine = GameEngine(headless=True, replay=recorder)
+	replay_engine.run(duration=20000)
+	pg.quit()
+
+	assert _get_game_state(replay_engine) == recorded_state
+
+
+def test_snapshot_and_restore(headless_game_engine):
+	for _ in range(100):
+		headless_game_engine.step()
+	snapshot = headless_game_engine.snapshot()
+	assert isinstance(snapshot, tuple)
+
+	# game continues identically after each restore, AI included
+	states = []
+	for _ in range(2):
+		headless_game_engine.restore(snapshot)
+		assert headless_game_engine.snapshot() == snapshot
+		for _ in range(600):
+			headless_game_engine.step()
+		states.append(headless_game_engine.snapshot())
+
+	assert states[0] == states[1]
+	assert states[0] != snapshot
+
+
+def test_colliders_rows_are_released(headless_game_engine):
+	registry = ColliderRegistry.get_default()
+	rows_nb = len(registry)
+
+	# restores and collider changes reuse rows of character colliders
+	snapshot = headless_game_engine.snapshot()
+	for _ in range(3):
+		headless_game_engine.restore(snapshot)
+		for char in headless_game_engine.characters:
+			char.set_diving_collider(Vector3(1, 0, 0))
+			char.set_default_collider()
+	assert len(registry) == rows_nb
+
+	# colliders of previous game are released
+	headless_game_engine.new_game([AIId.AI_ID_1, AIId.AI_ID_2])
+	assert len(registry) == rows_nb
+
+
+def test_game_engines_do_not_share_colliders():
+	pg.display.init()
+
+	# each game engine stores its colliders in its own registry, which does not grow with game engines number
+	registries = []
+	for _ in range(5):
+		game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2])
+		registry = game_engine.collider_registry
+		assert ColliderRegistry.get_default() is registry
+		assert all(obj.collider.registry is registry for obj in (game_engine.ball, *game_engine.characters))
+		assert all(registry is not other for other in registries)
+		assert len(registry) == len(game_engine.characters) + 2  # characters, ball and court
+		assert len(registry.kinds) == 16
+		registries.append(registry)
+
+	pg.quit()
+
+
+class _FakeClock:
+	"""
+	Clock which frames last given durations in ms, instead of wall-clock ones.
+	"""
+	def __init__(self, frame_durations):
+		self._frame_durations = itertools.cycle(frame_durations)
+		self._frame_duration = 0
+
+	def tick(self, framerate=0):
+		self._frame_duration = next(self._frame_durations)
+		return self._frame_duration
+
+	def get_time(self):
+		return self._frame_duration
+
+
+def test_physics_does_not_depend_on_render_frame_rate():
+	pg.init()
+	game_engine = GameEngine(player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=42)
+	game_engine.clock = _FakeClock([7, 16, 33, 70, 500])
+	game_engine.run(duration=10000)
+
+	assert game_engine.rendered_frame_count < game_engine.frame_count
+	assert 0 <= game_engine.interpolation_alpha < 1
+	assert game_engine.get_running_ticks() == pytest.approx(game_engine.frame_count * FIXED_DT)
+	rendered_state = _get_game_state(game_engine)
+
+	# same physics steps without rendering
+	headless_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=42)
+	for _ in range(game_engine.frame_count):
+		headless_engine.step()
+	pg.quit()
+
+	assert _get_game_state(headless_engine) == rendered_state
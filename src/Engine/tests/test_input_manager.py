@@ -5,6 +5,7 @@ import pytest
 
 from Settings import *
 from Engine.Input import *
+from Engine.message_bus import MessageBus, ActionMessage
 
 
 @pytest.yield_fixture()
@@ -53,6 +54,43 @@ def test_keyboard_press_key(input_manager):
 	input_manager.update()
 	assert keyboard_device.keys[key_code] == KeyState.RELEASED
 
-	
 
-	
\ No newline at end of file
+class _FakeJoystick:
+	def init(self):
+		pass
+
+	def get_id(self):
+		return 0
+
+
+def test_joystick_axis_and_button_events(input_manager):
+	joystick_device = JoystickInputDevice(PlayerId.PLAYER_ID_2, joystick_obj=_FakeJoystick())
+	message_bus = MessageBus.get_instance()
+	message_bus.clear()
+
+	def update(*joy_events):
+		joystick_device.update(joy_events=list(joy_events))
+		joystick_device.generate_actions()
+		return [ev.action for ev in message_bus.drain(ActionMessage)]
+
+	# several axis motions in a frame, only last one is used
+	left_axis = JoyAxis.LEFT_2.value.axis
+	assert update(pg.event.Event(JOYAXISMOTION, joy=0, axis=left_axis, value=-0.9),
+				  pg.event.Event(JOYAXISMOTION, joy=0, axis=left_axis, value=0.),
+				  pg.event.Event(JOYAXISMOTION, joy=0, axis=left_axis, value=-0.9)) == []  # CAMERA_MOVE_LEFT on PRESSED
+	assert joystick_device.keys[JoyAxis.LEFT_2] == KeyState.JUST_PRESSED
+	assert update() == [PlayerAction.CAMERA_MOVE_LEFT]
+	assert update() == [PlayerAction.CAMERA_MOVE_LEFT]
+
+	# button pressed while axis is held, actions in input preset order
+	throw_button = INPUT_PRESET_JOYSTICK[PlayerAction.THROW_BALL]
+	assert update(pg.event.Event(JOYBUTTONDOWN, joy=0, button=throw_button)) == [PlayerAction.THROW_BALL,
+																				  PlayerAction.CAMERA_MOVE_LEFT]
+	assert update(pg.event.Event(JOYAXISMOTION, joy=0, axis=left_axis, value=0.1),
+				  pg.event.Event(JOYBUTTONUP, joy=0, button=throw_button)) == []
+	assert joystick_device.keys[JoyAxis.LEFT_2] == KeyState.JUST_RELEASED
+	update()
+	assert all(key_state == KeyState.RELEASED for key_state in joystick_device.keys.values())
+
+	# events of another joystick are ignored
+	assert update(pg.event.Event(JOYBUTTONDOWN, joy=1, button=throw_button)) == []
@@ -0,0 +1,54 @@
+# encoding : UTF-8
+
+import pygame as pg
+
+from Settings import *
+from Engine import GameEngine
+from Engine.message_bus import MessageBus, ActionMessage, ThrowMessage, RulesBreakMessage, RingBuffer
+
+
+def test_ring_buffer_keeps_order_when_growing():
+	buffer = RingBuffer(capacity=4)
+	for i in range(3):
+		buffer.push(i)
+	assert buffer.drain() == [0, 1, 2]
+
+	# wrap around end of list, then grow
+	for i in range(3):
+		buffer.push(i)
+	assert buffer.pop() == 0
+	assert buffer.pop() == 1
+	for i in range(3, 6):
+		buffer.push(i)
+	assert buffer.drain() == [2, 3, 4, 5]
+	for i in range(3):
+		buffer.push(i)
+	buffer.pop()
+	for i in range(3, 10):
+		buffer.push(i)
+	assert len(buffer) == 9
+	assert buffer.drain() == list(range(1, 10))
+	assert len(buffer) == 0
+
+
+def test_message_bus_drains_by_type():
+	message_bus = MessageBus(capacity=2)
+	assert MessageBus.get_instance() is message_bus
+
+	for i in range(5):
+		message_bus.post(ActionMessage(PlayerId.PLAYER_ID_1, PlayerAction.JUMP))
+	message_bus.post(RulesBreakMessage(TeamId.LEFT, RuleType.GROUND, 0))
+	assert message_bus.get_count(ActionMessage) == 5
+
+	assert message_bus.drain(ThrowMessage) == []
+	assert message_bus.drain(RulesBreakMessage) == [RulesBreakMessage(TeamId.LEFT, RuleType.GROUND, 0)]
+	actions = message_bus.drain(ActionMessage)
+	assert len(actions) == 5 and actions[0].action == PlayerAction.JUMP
+	assert message_bus.get_count(ActionMessage) == 0
+
+
+def test_headless_game_without_pygame_events():
+	pg.quit()
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=0)
+	game_engine.run(5000)
+	assert game_engine.frame_count > 0
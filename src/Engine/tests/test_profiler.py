@@ -0,0 +1,51 @@
+# encoding : UTF-8
+
+import csv
+import json
+
+from Settings import *
+from Engine.game_engine import GameEngine
+from Engine.profiler import FrameProfiler, PROFILER_PHASES
+
+
+def test_profiler_keeps_last_frames(tmp_path):
+	profiler = FrameProfiler(frames_nb=4, phases=("physics", "display"))
+	for _ in range(6):
+		profiler.begin_frame()
+		profiler.mark("physics")
+		profiler.mark("display")
+		profiler.mark("physics")
+
+	frames, timings = profiler.get_timings()
+	assert frames.tolist() == [2, 3, 4, 5]
+	assert timings.shape == (4, 2) and (timings >= 0).all()
+
+	percentiles = profiler.get_percentiles()
+	assert set(percentiles) == {"physics", "display", "total"}
+	assert percentiles["total"][50] <= percentiles["total"][99]
+
+	csv_filename = str(tmp_path / "timings.csv")
+	profiler.export(csv_filename)
+	with open(csv_filename) as file:
+		rows = list(csv.reader(file))
+	assert rows[0] == ["frame", "physics", "display"] and len(rows) == 5
+
+	json_filename = str(tmp_path / "timings.json")
+	profiler.export(json_filename)
+	with open(json_filename) as file:
+		data = json.load(file)
+	assert data["frames"] == [2, 3, 4, 5] and "total" in data["percentiles_ms"]
+
+
+def test_headless_game_profiling(tmp_path):
+	filename = str(tmp_path / "timings.csv")
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=0,
+							 profiler_filename=filename)
+	game_engine.run(50)
+
+	frames, timings = game_engine.profiler.get_timings()
+	assert len(frames) == game_engine.profiler.frames_count > 0
+	assert timings[:, PROFILER_PHASES.index("physics")].sum() > 0
+	assert timings[:, PROFILER_PHASES.index("ai")].sum() > 0
+	with open(filename) as file:
+		assert len(list(csv.reader(file))) == len(frames) + 1
@@ -0,0 +1,43 @@
+# encoding : UTF-8
+
+import pytest
+
+from Settings import *
+from Engine.AI.reachability import ReachabilityTable
+from Game.character import Character
+
+
+@pytest.fixture()
+def character():
+	return Character(Vector3(), max_velocity=4, jump_velocity=8)
+
+
+def test_table_is_shared_by_characters_with_same_parameters(character):
+	table = ReachabilityTable.get_table(character)
+	assert ReachabilityTable.get_table(Character(Vector3(1, 2, 0), max_velocity=4, jump_velocity=8)) is table
+	assert ReachabilityTable.get_table(Character(Vector3(), max_velocity=5, jump_velocity=8)) is not table
+
+
+def test_jump_time_matches_character_one(character):
+	table = ReachabilityTable.get_table(character)
+	assert table.max_jump_height == pytest.approx(character.get_max_height_jump())
+
+	for i in range(1, 100):
+		h = character.h + i / 100 * (character.get_max_height_jump() - character.h)
+		assert table.get_time_to_jump_to_height(h) == pytest.approx(character.get_time_to_jump_to_height(h), abs=0.01)
+	assert table.get_time_to_jump_to_height(character.get_max_height_jump()) == pytest.approx(8 / G)
+	assert table.get_time_to_jump_to_height(character.get_max_height_jump() + 0.01) is None
+	assert table.get_time_to_jump_to_height(0) == 0
+
+
+def test_move_to_reach(character):
+	table = ReachabilityTable.get_table(character)
+
+	assert table.get_run_distance(0.5) == pytest.approx(4 * 0.5 + CHARACTER_W / 2)
+	assert table.get_dive_distance(0.123) == pytest.approx(DIVE_SPEED * 0.123 + CHARACTER_H - CHARACTER_W / 2)
+	assert table.get_dive_distance(10) == pytest.approx(DIVE_SPEED * DIVE_SLIDE_DURATION / 1000 + CHARACTER_H
+														- CHARACTER_W / 2)
+
+	assert table.get_move_to_reach(Vector3(1, 1, 5), 0.5) == CharacterStateType.RUNNING
+	assert table.get_move_to_reach(Vector3(0, 1.2, 0), 0.15) == CharacterStateType.DIVING
+	assert table.get_move_to_reach(Vector3(0, 3, 0), 0.15) is None
@@ -0,0 +1,122 @@
+# encoding : UTF-8
+
+import pygame as pg
+import pytest
+
+from Settings import *
+from Engine import GameEngine
+from Engine.Replay import ReplayReader, ReplayWriter
+from Engine.snapshot import encode_snapshot, decode_snapshot
+
+
+@pytest.fixture()
+def replay_filename(tmpdir):
+	# pygame has to be initialized to use event module, and font module for playback display
+	pg.init()
+
+	filename = str(tmpdir.join("game.replay"))
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=7,
+							 replay_filename=filename)
+	game_engine.run(duration=10000)
+
+	yield filename
+
+	pg.quit()
+
+
+def test_replay_file(replay_filename):
+	game_engine = GameEngine.get_instance()
+
+	with ReplayReader(replay_filename) as reader:
+		assert reader.player_id_list == [AIId.AI_ID_1, AIId.AI_ID_2]
+		assert len(reader) == game_engine.frame_count
+
+		last_frame = reader.read_frame(len(reader) - 1)
+		assert last_frame.ticks == pytest.approx(game_engine.get_running_ticks() - game_engine.fixed_dt)
+		assert last_frame.scores == (game_engine.teams[TeamId.LEFT].score, game_engine.teams[TeamId.RIGHT].score)
+
+		# ball position after last frame, stored in float32
+		assert last_frame.ball_position == pytest.approx(tuple(game_engine.ball.position), abs=1e-5)
+		for char, char_frame in zip(game_engine.characters, last_frame.characters):
+			assert char_frame.position == pytest.approx(tuple(char.position), abs=1e-5)
+			assert char_frame.state_type == char.state.type
+
+		events = [ev for i in range(len(reader)) for ev in reader.read_events(i)]
+		assert len(events) > 0
+		assert all(pl_id in reader.player_id_list for pl_id, _ in events)
+
+		with pytest.raises(IndexError):
+			reader.read_frame(len(reader))
+
+
+def test_replay_playback(replay_filename):
+	with ReplayReader(replay_filename) as reader:
+		game_engine = GameEngine(playback=reader)
+		game_engine.get_current_state().seek(len(reader) - 20)  # display is limited to nominal frame rate
+		game_engine.run()
+
+		last_frame = reader.read_frame(len(reader) - 1)
+		assert game_engine.get_current_state().current_frame == len(reader)
+		assert tuple(game_engine.ball.position) == pytest.approx(last_frame.ball_position)
+		assert game_engine.get_running_ticks() == last_frame.ticks
+
+
+def _get_world_state(game_engine):
+	# AI state is not compared: AI is not updated when frames are simulated again with recorded actions
+	values = [game_engine.rng.getstate(), game_engine.teams[TeamId.LEFT].score, game_engine.teams[TeamId.RIGHT].score]
+	game_engine.get_state(GEStateType.RUNNING).save_state(values)
+	game_engine.ball.save_state(values)
+	for char in game_engine.characters:
+		char.save_state(values)
+
+	# trajectory change flag is reset by AI
+	thrower_values = []
+	game_engine.thrower_manager.save_state(thrower_values)
+	return values + thrower_values[1:]
+
+
+def test_replay_seek(tmpdir):
+	pg.init()
+
+	# record a game with frequent keyframes, and keep world state after some frames
+	filename = str(tmpdir.join("game.replay"))
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=3)
+	game_engine.replay_writer = ReplayWriter(filename, [AIId.AI_ID_1, AIId.AI_ID_2], keyframe_interval=100)
+
+	frames = (0, 99, 100, 250, 399)
+	world_states = {}
+	while game_engine.frame_count < 400:
+		game_engine.step()
+		if game_engine.frame_count - 1 in frames:
+			world_states[game_engine.frame_count - 1] = _get_world_state(game_engine)
+	game_engine.replay_writer.close()
+
+	# seek in any order
+	with ReplayReader(filename) as reader:
+		assert reader.read_keyframe(250)[0] == 200
+
+		game_engine = GameEngine(headless=True, playback=reader)
+		for frame in reversed(frames):
+			game_engine.get_current_state().seek(frame)
+			assert game_engine.get_current_state() is game_engine.get_state(GEStateType.REPLAYING)
+			assert _get_world_state(game_engine) == world_states[frame]
+
+	pg.quit()
+
+
+def test_keyframe_encoding():
+	pg.init()
+
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=5)
+	for _ in range(200):
+		game_engine.step()
+	snapshot = game_engine.snapshot()
+	assert decode_snapshot(encode_snapshot(snapshot)) == snapshot
+
+	# only scalars and enums of settings are decoded
+	with pytest.raises(ValueError):
+		decode_snapshot(b'[{"enum": "Path", "value": "/"}]')
+	with pytest.raises(TypeError):
+		encode_snapshot((object(),))
+
+	pg.quit()
@@ -0,0 +1,169 @@
+# encoding : UTF-8
+
+import random
+import socket
+import subprocess
+import sys
+from os import environ, path
+
+import pytest
+
+from Engine.Network import RollbackSession, encode_inputs_packet, decode_inputs_packet, encode_actions, \
+	decode_actions
+from Settings import *
+
+
+class ToySimulation:
+	"""
+	Simulation which state depends on every input of every frame.
+	"""
+	def __init__(self):
+		self.state = (0, 0)
+		self.steps_nb = 0
+
+	def snapshot(self):
+		return self.state
+
+	def restore(self, snapshot):
+		self.state = snapshot
+
+	def step(self, inputs):
+		frame, h = self.state
+		for i, val in enumerate(inputs):
+			h = (31 * h + (i + 1) * val) % 1000003
+		self.state = (frame + 1, h)
+		self.steps_nb += 1
+
+
+def _play(latency, loss, frames_nb=300, seed=0):
+	"""
+	Play a session between 2 peers, with scripted inputs sent with latency (in frames) and packet loss.
+	"""
+	rng = random.Random(seed)
+	scripted_inputs = [[rng.choice((0, 0, 0, 1, 2, 5)) for _ in range(frames_nb)] for _ in range(2)]
+
+	sessions = [RollbackSession(ToySimulation(), 2, player, input_delay=2, max_rollback_frames=8) for player in (0, 1)]
+	channels = [[], []]  # (reception frame, first frame, inputs) packets for each peer
+	acks = [-1, -1]
+
+	tick = 0
+	while min(session.current_frame for session in sessions) < frames_nb \
+			or min(session.get_confirmed_frame() for session in sessions) < frames_nb - 1:
+		for player, session in enumerate(sessions):
+			# receive
+			for packet in [packet for packet in channels[player] if packet[0] <= tick]:
+				channels[player].remove(packet)
+				_, ack, first_frame, inputs = packet
+				acks[player] = max(acks[player], ack)
+				for i, val in enumerate(inputs):
+					session.add_remote_input(1 - player, first_frame + i, val)
+
+			if session.current_frame < frames_nb and session.can_advance():
+				session.add_local_input(scripted_inputs[player][min(session.current_frame, frames_nb - 1)])
+				session.advance()
+
+			# send
+			if rng.random() >= loss:
+				channels[1 - player].append((tick + latency, session.get_confirmed_frame(1 - player), acks[player] + 1,
+											 session.get_local_inputs(acks[player] + 1)))
+		tick += 1
+		assert tick < 10 * frames_nb, "peers are blocked"
+
+	for session in sessions:
+		session.synchronize()
+
+	# reference simulation with all inputs known in advance
+	reference = ToySimulation()
+	delay = sessions[0].input_delay
+	for frame in range(frames_nb):
+		reference.step([scripted_inputs[player][frame - delay] if frame >= delay else 0 for player in (0, 1)])
+
+	return sessions, reference
+
+
+def test_rollback_session_without_latency():
+	sessions, reference = _play(latency=0, loss=0)
+	for session in sessions:
+		assert session.simulation.state == reference.state
+
+
+@pytest.mark.parametrize("latency, loss", [(3, 0), (6, 0.2), (12, 0.5)])
+def test_rollback_session_with_latency_and_loss(latency, loss):
+	sessions, reference = _play(latency, loss)
+
+	for session in sessions:
+		assert session.simulation.state == reference.state
+		assert session.rollbacks_nb > 0
+		# each frame is simulated once, plus frames simulated again after rollbacks
+		assert session.simulation.steps_nb == 300 + session.rollback_frames_nb
+
+
+def test_inputs_packet():
+	packet = encode_inputs_packet(12, 10, [0, 3, 65535])
+	assert decode_inputs_packet(packet) == (12, 10, [0, 3, 65535])
+	assert decode_inputs_packet(encode_inputs_packet(-1, 0, [])) == (-1, 0, [])
+
+
+def test_actions_encoding():
+	actions = [PlayerAction.MOVE_LEFT, PlayerAction.JUMP, PlayerAction.PAUSE]
+	assert decode_actions(encode_actions(actions)) == [PlayerAction.MOVE_LEFT, PlayerAction.JUMP]
+	assert encode_actions([]) == 0
+
+
+def _get_free_port():
+	with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+		sock.bind(("127.0.0.1", 0))
+		return sock.getsockname()[1]
+
+
+def test_netplay_processes_are_synchronized():
+	ports = [_get_free_port(), _get_free_port()]
+	script = path.join(path.dirname(__file__), "..", "..", "netplay.py")
+	env = dict(environ, SDL_VIDEODRIVER="dummy")
+	processes = [subprocess.Popen([sys.executable, script, str(player), "--bots", "--headless", "-f", "200",
+								   "--fps", "200", "--latency", "30", "--loss", "0.1", "--timeout", "30",
+								   "--port", str(ports[player]), "--remote-port", str(ports[1 - player])],
+								  stdout=subprocess.PIPE, universal_newlines=True, env=env)
+				 for player in (0, 1)]
+
+	results = []
+	for process in processes:
+		out, _ = process.communicate(timeout=60)
+		assert process.returncode == 0
+		results.append([line for line in out.splitlines() if line.startswith("frame")][-1])
+
+	# same frame and checksum for both peers
+	assert results[0].split()[:4] == results[1].split()[:4]
+
+
+def _get_ai_state(game_engine):
+	values = []
+	game_engine.ai_manager.save_state(values)
+	return values
+
+
+def test_rollback_keeps_local_ai_state():
+	from Engine import GameEngine
+	from Engine.Network import GameSimulation
+
+	game_engine = GameEngine(headless=True, player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=0)
+	simulation = GameSimulation(game_engine)
+	session = RollbackSession(simulation, 2, 0, input_delay=2, max_rollback_frames=64)
+
+	for _ in range(50):
+		session.add_local_input(simulation.get_local_input(0))
+		session.advance()
+	rollback_state = _get_ai_state(game_engine)
+	for _ in range(20):
+		session.add_local_input(simulation.get_local_input(0))
+		session.advance()
+
+	ai_state = _get_ai_state(game_engine)
+	assert ai_state != rollback_state  # AI state changed since rollback frame
+
+	# remote input of a predicted frame differs from prediction
+	session.add_remote_input(1, 50, encode_actions([PlayerAction.JUMP]))
+	session.synchronize()
+
+	assert session.rollbacks_nb == 1
+	assert _get_ai_state(game_engine) == ai_state
@@ -0,0 +1,65 @@
+# encoding : UTF-8
+
+import pygame as pg
+
+from Settings import *
+from Engine import GameEngine
+from Engine.Display import ScaledSurfaceCache, ScalableSprite
+
+
+def test_scaled_surface_cache_lru_eviction():
+	surfaces = [pg.Surface((4, 4)) for _ in range(3)]
+	nbytes = pg.Surface((8, 8)).get_pitch() * 8
+	cache = ScaledSurfaceCache(max_size=2 * nbytes)
+	assert ScaledSurfaceCache.get_instance() is cache
+
+	scaled = cache.get_scaled(surfaces[0], (8, 8))
+	assert scaled.get_size() == (8, 8)
+	assert cache.get_scaled(surfaces[0], (8, 8)) is scaled
+	assert cache.get_scaled(surfaces[0], (6, 6)) is not scaled  # another size
+	assert (cache.hits, cache.misses) == (1, 2)
+
+	# memory cap reached, least recently used surface is evicted
+	cache.clear()
+	cache.get_scaled(surfaces[0], (8, 8))
+	cache.get_scaled(surfaces[1], (8, 8))
+	cache.get_scaled(surfaces[0], (8, 8))
+	cache.get_scaled(surfaces[2], (8, 8))
+	assert len(cache) == 2 and cache.size == 2 * nbytes and cache.evictions == 1
+	cache.get_scaled(surfaces[0], (8, 8))
+	cache.get_scaled(surfaces[1], (8, 8))
+	assert cache.get_stats()["misses"] == 2 + 4  # surface 1 was evicted by surface 2
+	assert cache.get_hit_rate() == cache.hits / (cache.hits + cache.misses)
+
+	# surface bigger than cap is not cached
+	cache.get_scaled(surfaces[0], (100, 100))
+	assert cache.size <= cache.max_size
+
+
+def test_scalable_sprite_uses_cache():
+	cache = ScaledSurfaceCache()
+	sprite = ScalableSprite()
+	frames = [pg.Surface((4, 4)), pg.Surface((4, 4))]
+	sprite.set_fit_size((8, 8))
+	misses = cache.misses
+
+	for _ in range(5):
+		for frame in frames:
+			sprite.image = frame
+	assert sprite.image.get_size() == (8, 8)
+	assert cache.misses - misses == 2
+	sprite.kill()
+
+
+def test_profiler_reports_cache_stats(tmp_path):
+	pg.init()
+	ScaledSurfaceCache()
+	game_engine = GameEngine(player_id_list=[AIId.AI_ID_1, AIId.AI_ID_2], seed=0,
+							 profiler_filename=str(tmp_path / "timings.json"))
+	for _ in range(60):
+		game_engine.step()
+
+	stats = game_engine.profiler.get_stats()["scaled_surface_cache"]
+	assert stats["hits"] > 0 and stats["bytes"] > 0
+	assert "scaled_surface_cache: hit_rate" in game_engine.profiler.get_report()
+	pg.quit()
@@ -0,0 +1,39 @@
+# encoding : UTF-8
+
+from Engine.Trajectory import *
+
+
+def test_solver_cache_hits_and_misses():
+	cached_solver = SolverCache(find_initial_velocity, max_size=2, quantum=1e-3)
+	origin_pos = Vector3(0, -3, 1)
+
+	velocity = cached_solver(origin_pos, Vector3(1, 3, 0.5), 4)
+	assert (cached_solver.hits_nb, cached_solver.misses_nb) == (0, 1)
+	assert velocity.distance_to(find_initial_velocity(origin_pos, Vector3(1, 3, 0.5), 4)) < 1e-9
+
+	# nearly identical inputs
+	velocity.x = 100  # cached result is not modified
+	assert cached_solver(origin_pos + Vector3(1e-5, 0, 0), Vector3(1, 3, 0.5), 4) == \
+		cached_solver(origin_pos, Vector3(1, 3, 0.5), wanted_height=4)  # keyword arguments have their own key
+	assert cached_solver.hits_nb == 1
+	assert cached_solver.misses_nb == 2
+	assert cached_solver.get_hit_rate() == 1 / 3
+
+	# least recently used result is dropped
+	cached_solver(origin_pos, Vector3(-1, 3, 0.5), 4)
+	assert len(cached_solver) == 2
+	cached_solver(origin_pos, Vector3(1, 3, 0.5), 4)
+	assert cached_solver.misses_nb == 4
+
+	cached_solver.clear()
+	assert len(cached_solver) == 0
+	assert cached_solver.get_hit_rate() == 0
+
+
+def test_solver_cache_results_only_depend_on_quantized_inputs():
+	cached_solver = SolverCache(find_target_position, quantum=0.01)
+	target_pos = cached_solver(Vector3(0, -3.001, 1), Vector3(0, 5, 5), 0.5)
+	cached_solver.clear()
+
+	assert cached_solver(Vector3(0, -2.999, 1), Vector3(0, 5, 5), 0.5) == target_pos
+	assert target_pos == find_target_position(Vector3(0, -3, 1), Vector3(0, 5, 5), 0.5)
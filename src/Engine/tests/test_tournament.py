@@ -0,0 +1,42 @@
+# encoding : UTF-8
+
+import json
+
+from Settings import *
+from tournament import AI_CONFIGURATIONS, run_tournament, play_match
+
+
+def test_tournament_writes_json_lines(tmp_path):
+	output = str(tmp_path / "results.jsonl")
+	results = run_tournament(2, target_score=1, max_duration=30000, workers=1, output=output, seed=10)
+
+	with open(output) as file:
+		lines = [json.loads(line) for line in file]
+	assert lines == results
+	assert sorted((res["match"], res["seed"]) for res in lines) == [(0, 10), (1, 11)]
+	for res in lines:
+		assert res["winner"] in (None, AIId.AI_ID_1.name, AIId.AI_ID_2.name)
+		assert max(res["score"]) <= 1 and res["duration"] <= 30
+
+
+def test_match_is_reproducible():
+	# bots configurations are given by name, a behaviour tree factory builds tree of an AI entity
+	calls = []
+
+	def build_behaviour_tree(ai_entity):
+		calls.append(ai_entity)
+		ai_entity._create_behaviour_tree_1v1()
+		return ai_entity.behaviour_tree
+
+	AI_CONFIGURATIONS["test"] = build_behaviour_tree
+	try:
+		results = [play_match(3, target_score=1, max_duration=20000, seed=42, configurations=("test", "1v1"))
+				   for _ in range(2)]
+	finally:
+		del AI_CONFIGURATIONS["test"]
+	assert [ai_entity.character.player_id for ai_entity in calls] == [AIId.AI_ID_1, AIId.AI_ID_1]
+	assert results[0]["seed"] == 42 and results[0]["configurations"] == ["test", "1v1"]
+
+	for res in results:
+		del res["wall_time"]
+	assert results[0] == results[1]
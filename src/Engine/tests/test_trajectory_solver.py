@@ -1,5 +1,8 @@
 # encoding : UTF-8
 
+import numpy as np
+import pytest
+
 from Engine.Trajectory import *
 from Engine.Trajectory import Trajectory
 
@@ -69,4 +72,63 @@ def test_get_n_points_in_trajectory():
 	assert len(points) == n
 	assert points[0] == origin_pos
 	assert points[n-1] == target_pos
-	
\ No newline at end of file
+	
+
+def test_trajectory_position_and_velocity():
+	origin_pos = Vector3(0, -3, 1)
+	target_pos = Vector3(1, 3, 0.5)
+	trajectory = Trajectory(origin_pos, target_pos, find_initial_velocity(origin_pos, target_pos, 4))
+
+	assert trajectory.get_position_at(0) == origin_pos
+	assert trajectory.get_velocity_at(0) == trajectory.initial_velocity
+	assert trajectory.get_position_at(trajectory.get_final_time()).distance_to(target_pos) < 1e-9
+
+	# height at net
+	t = trajectory.get_time_at_y(0)
+	assert abs(trajectory.get_position_at(t).z - 4) < 1e-9
+	assert abs(trajectory.get_velocity_at(t).z) > 0
+
+
+def test_array_solvers_match_scalar_ones():
+	rng = np.random.default_rng(0)
+	n = 200
+	origin_pos = rng.uniform((-3, -5, 0.5), (3, 5, 2.5), (n, 3))
+	target_pos = rng.uniform((-3, -5, 0.5), (3, 5, 2.5), (n, 3))
+	target_pos[0, :2] = origin_pos[0, :2]  # vertical throw
+	wanted_height = 4
+
+	velocity, valid = find_initial_velocity_array(origin_pos, target_pos, wanted_height)
+	assert valid.all()
+	for i in range(n):
+		expected = find_initial_velocity(Vector3(*origin_pos[i]), Vector3(*target_pos[i]), wanted_height)
+		assert np.allclose(velocity[i], tuple(expected))
+
+	target, valid = find_target_position_array(origin_pos, velocity, target_pos[:, 2])
+	assert valid.all()
+	assert np.allclose(target, target_pos)
+
+	z_at_net, valid = get_z_at_y_array(velocity, origin_pos, 0)
+	x_at_net, _ = get_x_at_y_array(origin_pos, velocity, 0)
+	for i in range(1, n):
+		assert valid[i]
+		assert z_at_net[i] == pytest.approx(get_z_at_y(Vector3(*velocity[i]), Vector3(*origin_pos[i]), 0, 0))
+		assert x_at_net[i] == pytest.approx(get_x_at_y(Vector3(*origin_pos[i]), Vector3(*velocity[i]), 0))
+
+
+def test_array_solvers_without_solution():
+	# wanted height under target
+	velocity, valid = find_initial_velocity_array([(0, -3, 1), (0, -3, 1)], [(0, 3, 0.5), (0, 3, 5)], 4)
+	assert valid.tolist() == [True, False]
+	assert np.isnan(velocity[1]).all()
+
+	# ball never reaching z, vertical throw never reaching net
+	t, valid = get_time_at_z_array(np.array([5., 1.]), np.array([1., 1.]), 2)
+	assert valid.tolist() == [True, False]
+	assert t[0] == pytest.approx(get_time_at_z(5, 1, 2))
+	assert np.isnan(t[1])
+
+	z, valid = get_z_at_y_array([(0, 2, 5), (0, 0, 5)], [(0, -3, 1), (0, -3, 1)], 0)
+	assert valid.tolist() == [True, False]
+	x, valid = get_x_at_y_array([(0, -3, 1), (0, -3, 1)], [(1, 2, 5), (1, 0, 5)], 0)
+	assert valid.tolist() == [True, False]
+	assert x[0] == pytest.approx(1.5)
@@ -7,11 +7,18 @@ from Engine.Display import debug3D_utils
 from Engine.Display.scalable_sprite import ScalableSprite
 from Engine.Display.animated_sprite import AnimatedSprite, AnimationDirectionEnum
 from Engine.Collisions import SphereCollider
+from Engine.message_bus import MessageBus, RulesBreakMessage
+from Engine.snapshot import write_vector3, read_vector3
+from Engine.Trajectory.trajectory import Trajectory
 from Settings.general_settings import *
 import Engine
 
 
 class Ball(AnimatedSprite, ScalableSprite):
+	__slots__ = ("radius", "acceleration", "velocity", "_position", "previous_position", "collider",
+				 "is_colliding_ground", "is_colliding_net", "is_colliding_character", "will_be_served", "trajectory",
+				 "_trajectory_time", "dbg_rect_shadow", "dbg_rect", "_current_team_touches")
+
 	def __init__(self, position=None, radius=0.5, sprite_groups=[]):
 		AnimatedSprite.__init__(self, *sprite_groups)
 		ScalableSprite.__init__(self, *sprite_groups)
@@ -20,13 +27,17 @@ class Ball(AnimatedSprite, ScalableSprite):
 		self.velocity = Vector3()
 		self._position = Vector3(position) if position is not None else Vector3()
 		self.previous_position = Vector3(self._position)
-		self.collider = SphereCollider(position, radius)
+		self.collider = SphereCollider(self._position, radius)
 		
 		self.is_colliding_ground = False
 		self.is_colliding_net = False
 		self.is_colliding_character = False
 		
 		self.will_be_served = False
+
+		# trajectory followed since last throw or bounce, with elapsed time in ms on it
+		self.trajectory = None
+		self._trajectory_time = 0
 		
 		# sprite
 		self.load_aseprite_json("../assets/sprites/ball.json")
@@ -47,9 +58,7 @@ class Ball(AnimatedSprite, ScalableSprite):
 			self._current_team_touches.append(team_id)
 			if len(self._current_team_touches) > MAX_TOUCHES_NB:
 				ge_ticks = Engine.GameEngine.get_instance().get_running_ticks()
-				# TODO : create form in settings for dict to pass in post(Event)
-				d = {"faulty_team": team_id, "rule_type": RuleType.TOUCHES_NB, "time_stamp": ge_ticks}
-				pg.event.post(pg.event.Event(RULES_BREAK_EVENT, d))
+				MessageBus.get_instance().post(RulesBreakMessage(team_id, RuleType.TOUCHES_NB, ge_ticks))
 				
 	def manage_touch_ground_rule(self):
 		if len(self._current_team_touches) == 0:
@@ -66,8 +75,7 @@ class Ball(AnimatedSprite, ScalableSprite):
 					faulty_team_id = TeamId.LEFT if last_team_id == TeamId.RIGHT else TeamId.RIGHT
 
 		ge_ticks = Engine.GameEngine.get_instance().get_running_ticks()
-		d = {"faulty_team": faulty_team_id, "rule_type": RuleType.GROUND, "time_stamp": ge_ticks}
-		pg.event.post(pg.event.Event(RULES_BREAK_EVENT, d))
+		MessageBus.get_instance().post(RulesBreakMessage(faulty_team_id, RuleType.GROUND, ge_ticks))
 		
 	def check_if_out_of_bounds(self):
 		game_engine = Engine.game_engine.GameEngine.get_instance()
@@ -75,8 +83,7 @@ class Ball(AnimatedSprite, ScalableSprite):
 		if abs(self.position.x) > 1.5 * court.h / 2 or abs(self.position.y) > 1.5 * court.w / 2:
 			faulty_team_id = self._current_team_touches[-1] if len(self._current_team_touches) > 0 else None
 			ge_ticks = Engine.GameEngine.get_instance().get_running_ticks()
-			d = {"faulty_team": faulty_team_id, "rule_type": RuleType.OUT_OF_BOUNDS, "time_stamp": ge_ticks}
-			pg.event.post(pg.event.Event(RULES_BREAK_EVENT, d))
+			MessageBus.get_instance().post(RulesBreakMessage(faulty_team_id, RuleType.OUT_OF_BOUNDS, ge_ticks))
 
 	def check_if_under_net(self):
 		game_engine = Engine.game_engine.GameEngine.get_instance()
@@ -89,8 +96,7 @@ class Ball(AnimatedSprite, ScalableSprite):
 					or (self.previous_position.y > 0 and self.position.y < 0):
 				faulty_team_id = self._current_team_touches[-1] if len(self._current_team_touches) > 0 else None
 				ge_ticks = game_engine.get_running_ticks()
-				d = {"faulty_team": faulty_team_id, "rule_type": RuleType.UNDER_NET, "time_stamp": ge_ticks}
-				pg.event.post(pg.event.Event(RULES_BREAK_EVENT, d))
+				MessageBus.get_instance().post(RulesBreakMessage(faulty_team_id, RuleType.UNDER_NET, ge_ticks))
 
 	def reset_rules(self):
 		self._current_team_touches = []
@@ -106,6 +112,51 @@ class Ball(AnimatedSprite, ScalableSprite):
 		self.will_be_served = True
 		self.previous_position = character.get_hands_position()
 		self.position = character.get_hands_position()
+		self.set_trajectory(None)
+
+	def set_trajectory(self, trajectory):
+		"""
+		Set trajectory followed by ball from its origin, after a throw or a bounce.
+
+		:param Trajectory trajectory: trajectory, which origin and initial velocity are current ball ones, or None
+		:return: None
+		"""
+		self.trajectory = trajectory
+		self._trajectory_time = 0
+
+	def save_state(self, values):
+		"""
+		Append physics and rules state of ball to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		write_vector3(values, self._position)
+		write_vector3(values, self.previous_position)
+		write_vector3(values, self.velocity)
+		values += [self.is_colliding_ground, self.is_colliding_net, self.is_colliding_character, self.will_be_served,
+				   len(self._current_team_touches), *self._current_team_touches]
+		values += [self._trajectory_time, self.trajectory is not None]
+		if self.trajectory is not None:
+			self.trajectory.save_state(values)
+
+	def load_state(self, values):
+		"""
+		Read physics and rules state of ball from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		self.position = read_vector3(values)
+		self.previous_position = read_vector3(values)
+		self.velocity = read_vector3(values)
+		self.is_colliding_ground = next(values)
+		self.is_colliding_net = next(values)
+		self.is_colliding_character = next(values)
+		self.will_be_served = next(values)
+		self._current_team_touches = [next(values) for _ in range(next(values))]
+		self._trajectory_time = next(values)
+		self.trajectory = Trajectory.load_state(values) if next(values) else None
 
 	@property
 	def position(self):
@@ -116,12 +167,23 @@ class Ball(AnimatedSprite, ScalableSprite):
 		self._position = value
 		self.collider.center = self._position
 	
+	def get_render_position(self):
+		"""
+		Get position to display, interpolated between positions of previous and current physics steps.
+
+		:return: interpolated position
+		:rtype pygame.Vector3:
+		"""
+		alpha = Engine.game_engine.GameEngine.get_instance().interpolation_alpha
+		return self.previous_position.lerp(self._position, alpha)
+
 	def draw_debug(self):
 		prev_rect = self.dbg_rect
 		prev_rect_shadow = self.dbg_rect_shadow
-		
-		self.dbg_rect_shadow = debug3D_utils.draw_horizontal_ellipse(Vector3(self.position[0], self.position[1], 0), self.radius)
-		self.dbg_rect = self.collider.draw_debug()
+
+		position = self.get_render_position()
+		self.dbg_rect_shadow = debug3D_utils.draw_horizontal_ellipse(Vector3(position[0], position[1], 0), self.radius)
+		self.dbg_rect = debug3D_utils.draw_sphere(position, self.radius, width=2)
 		
 		return [prev_rect.union(self.dbg_rect), prev_rect_shadow.union(self.dbg_rect_shadow)]
 	
@@ -139,7 +201,7 @@ class Ball(AnimatedSprite, ScalableSprite):
 
 	def update_rules(self):
 		"""
-		Update rules and post a RULES_BREAK_EVENT event if needed.
+		Update rules and post a RulesBreakMessage if needed.
 
 		Note that several events could be sent at a same call. See update_rules method in Running GameEngineState.
 
@@ -152,12 +214,29 @@ class Ball(AnimatedSprite, ScalableSprite):
 			self.manage_touch_ground_rule()
 
 	def update_physics(self, dt):
-		self.previous_position = Vector3(self.position)
-		if not self.will_be_served:
+		"""
+		Move ball under gravity.
+
+		If BALL_ANALYTIC_INTEGRATION is True, position and velocity are evaluated from current trajectory, so they do not
+		depend on time steps and match trajectory predictions. Else, or without trajectory, gravity is integrated with
+		explicit Euler method.
+
+		:param float dt: amount of time in ms
+		:return: None
+		"""
+		if self.will_be_served:
+			self.previous_position = Vector3(self._position)
+			self.velocity = Vector3()
+		elif BALL_ANALYTIC_INTEGRATION and self.trajectory is not None:
+			self.previous_position = self._position  # position is replaced by a new vector
+			self._trajectory_time += dt
+			t = 0.001 * self._trajectory_time
+			self.position = self.trajectory.get_position_at(t)
+			self.velocity = self.trajectory.get_velocity_at(t)
+		else:
+			self.previous_position = Vector3(self._position)
 			self.add_velocity(Vector3(0, 0, -0.001 * dt * G))
 			self.move_rel(0.001 * dt * self.velocity)
-		else:
-			self.velocity = Vector3()
 
 	def adapt_animation_speed(self):
 		"""
@@ -182,8 +261,9 @@ class Ball(AnimatedSprite, ScalableSprite):
 		camera = Engine.Display.display_manager.DisplayManager.get_instance().camera
 
 		# get top left position and size in pixels
-		center_px = camera.world_to_pixel_coords(self.position, NOMINAL_RESOLUTION)
-		radius_px = camera.get_length_in_pixels_at(self.position, self.radius, NOMINAL_RESOLUTION)
+		position = self.get_render_position()
+		center_px = camera.world_to_pixel_coords(position, NOMINAL_RESOLUTION)
+		radius_px = camera.get_length_in_pixels_at(position, self.radius, NOMINAL_RESOLUTION)
 		top_left_px = (int(center_px[0] - radius_px), int(center_px[1] - radius_px))
 		sprite_size = (2 * radius_px, 2 * radius_px)
 
@@ -2,15 +2,21 @@
 
 from Engine.Display import debug3D_utils
 from Engine.Collisions import AABBCollider
+from Engine.snapshot import write_vector3, read_vector3
 from Settings import *
 import pygame as pg
 from math import sqrt
 
 from Engine.Actions import ActionObject
 from Game.character_states import *
+import Engine
 
 
 class Character(ActionObject):
+	__slots__ = ("_position", "previous_position", "w", "h", "collider_relative_position", "collider",
+				 "is_colliding_ball", "max_velocity", "jump_velocity", "velocity", "direction", "team", "state", "rect",
+				 "rect_shadow")
+
 	def __init__(self, position=None, player_id=PlayerId.PLAYER_ID_1, max_velocity=None, jump_velocity=None):
 		ActionObject.__init__(self, player_id)
 		self._position = Vector3(position) if position is not None else Vector3()
@@ -35,6 +41,39 @@ class Character(ActionObject):
 		self.rect = pg.Rect(0, 0, 0, 0)
 		self.rect_shadow = pg.Rect(0, 0, 0, 0)
 
+	def save_state(self, values):
+		"""
+		Append physics state of character and its state to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		write_vector3(values, self._position)
+		write_vector3(values, self.previous_position)
+		write_vector3(values, self.velocity)
+		write_vector3(values, self.direction)
+		write_vector3(values, self.collider_relative_position)
+		write_vector3(values, self.collider.size3)
+		values.append(self.is_colliding_ball)
+		self.state.save_state(values)
+
+	def load_state(self, values):
+		"""
+		Read physics state of character and its state from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		position = read_vector3(values)
+		self.previous_position = read_vector3(values)
+		self.velocity = read_vector3(values)
+		self.direction = read_vector3(values)
+		self.collider_relative_position = read_vector3(values)
+		self._set_collider(position + self.collider_relative_position, read_vector3(values))
+		self.position = position
+		self.is_colliding_ball = next(values)
+		self.state = CharacterState.load_state(self, values)
+
 	@property
 	def position(self):
 		return self._position
@@ -44,14 +83,26 @@ class Character(ActionObject):
 		self._position = value
 		self.collider.center = self._position + self.collider_relative_position
 
+	def get_render_position(self):
+		"""
+		Get position to display, interpolated between positions of previous and current physics steps.
+
+		:return: interpolated position
+		:rtype pygame.Vector3:
+		"""
+		alpha = Engine.game_engine.GameEngine.get_instance().interpolation_alpha
+		return self.previous_position.lerp(self._position, alpha)
+
 	def draw_debug(self):
 		prev_rect = self.rect
 		prev_shadow_rect = self.rect_shadow
-		
-		ground_pos = Vector3(self.position)
+
+		position = self.get_render_position()
+		ground_pos = Vector3(position)
 		ground_pos.z = 0
 		self.rect_shadow = debug3D_utils.draw_horizontal_ellipse(ground_pos, self.w / 2)
-		self.rect = self.collider.draw_debug()
+		self.rect = debug3D_utils.draw_aligned_axis_box(position + self.collider_relative_position,
+														*self.collider.size3)
 		
 		return [prev_shadow_rect.union(self.rect_shadow), prev_rect.union(self.rect)]
 
@@ -116,14 +167,13 @@ class Character(ActionObject):
 		
 	def update_actions(self, action_events, **kwargs):
 		dt = kwargs["dt"] if "dt" in kwargs.keys() else 0
-		filtered_action_events = self.filter_action_events_by_player_id(action_events)
-		
+
 		# state machine :
 		# run current state
-		self.state.run(filtered_action_events, dt=dt)
+		self.state.run(action_events, dt=dt)
 
 		# eventually switch state
-		self.state = self.state.next(filtered_action_events, dt=dt)
+		self.state = self.state.next(action_events, dt=dt)
 	
 	def update_physics(self, dt, free_displacement=FREE_DISPLACEMENT):
 		self.previous_position = Vector3(self.position)
@@ -153,7 +203,7 @@ class Character(ActionObject):
 		self.collider_relative_position = Vector3(0, 0, self.h / 2)
 		collider_size3 = Vector3(self.w, self.w, self.h)
 
-		self.collider = AABBCollider(self._position + self.collider_relative_position, collider_size3)
+		self._set_collider(self._position + self.collider_relative_position, collider_size3)
 
 	def set_diving_collider(self, direction):
 		"""
@@ -182,7 +232,21 @@ class Character(ActionObject):
 			collider_rel_center.y -= self.w / 2
 
 		self.collider_relative_position	= collider_rel_center
-		self.collider = AABBCollider(self._position + self.collider_relative_position, collider_size3)
+		self._set_collider(self._position + self.collider_relative_position, collider_size3)
+
+	def _set_collider(self, center, size3):
+		"""
+		Set center and size of AABB Collider, collider is created at first call and then its registry row is reused.
+
+		:param pygame.Vector3 center: center of collider
+		:param pygame.Vector3 size3: size of collider
+		:return: None
+		"""
+		if self.collider is None:
+			self.collider = AABBCollider(center, size3)
+		else:
+			self.collider.center = center
+			self.collider.size3 = size3
 		
 	def reset(self):
 		self.set_default_collider()
@@ -1,6 +1,8 @@
 # encoding : UTF-8
 
 import Engine.game_engine
+from Engine.message_bus import MessageBus, ThrowMessage
+from Engine.snapshot import write_vector3, read_vector3
 from Settings import *
 
 
@@ -10,6 +12,7 @@ class CharacterState:
 	"""
 
 	type = CharacterStateType.NONE
+	_state_fields = ()  # attributes saved in snapshots
 
 	def __init__(self, character):
 		"""
@@ -17,12 +20,49 @@ class CharacterState:
 		"""
 		self.character = character
 		self.character.velocity = Vector3()
-		
+
+	def save_state(self, values):
+		"""
+		Append state type and state attributes listed in :var _state_fields: to snapshot values.
+
+		:param list values: snapshot values
+		:return: None
+		"""
+		values.append(self.type)
+		values.extend(getattr(self, name) for name in self._state_fields)
+
+	@staticmethod
+	def load_state(character, values):
+		"""
+		Create a state from snapshot values.
+
+		State is created without calling __init__, which could change character.
+
+		:param Character character: character which state is attached to
+		:param iterator values: iterator on snapshot values
+		:return: read state
+		:rtype CharacterState:
+		"""
+		state = object.__new__(STATES_BY_TYPE[next(values)])
+		state.character = character
+		state.load_fields(values)
+		return state
+
+	def load_fields(self, values):
+		"""
+		Read state attributes listed in :var _state_fields: from snapshot values.
+
+		:param iterator values: iterator on snapshot values
+		:return: None
+		"""
+		for name in self._state_fields:
+			setattr(self, name, next(values))
+
 	def run(self, action_events, **kwargs):
 		"""
 		Main function for this state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return: None
 		"""
@@ -32,7 +72,7 @@ class CharacterState:
 		"""
 		Function called to change (or stay same) state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return a state
 		:rtype State:
@@ -50,7 +90,7 @@ class Idling(CharacterState):
 		"""
 		Main function for this state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return: None
 		"""
@@ -60,7 +100,7 @@ class Idling(CharacterState):
 		"""
 		Function called to change (or stay at same) state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters :
 			- :var float dt: time between 2 function calls
 		:return a state
@@ -89,7 +129,7 @@ class Running(CharacterState):
 	def __init__(self, character, action_events=None, **kwargs):
 		"""
 		:param Character character: character which state is attached to
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters :
 			- :var float dt: time between 2 function calls
 		"""
@@ -104,7 +144,7 @@ class Running(CharacterState):
 		"""
 		Main function for this state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters :
 			- :var float dt: time between 2 function calls
 		"""
@@ -116,7 +156,7 @@ class Running(CharacterState):
 		"""
 		Function called to change (or stay same) state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return a state
 		:rtype State:
@@ -141,6 +181,7 @@ class Throwing(CharacterState):
 	"""
 
 	type = CharacterStateType.THROWING
+	_state_fields = ("t0", "has_thrown_yet")
 
 	def __init__(self, character, action_events=None, **kwargs):
 		super().__init__(character)
@@ -155,7 +196,7 @@ class Throwing(CharacterState):
 		"""
 		Main function for this state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return: None
 		"""
@@ -165,17 +206,14 @@ class Throwing(CharacterState):
 			vel_eff = get_velocity_efficiency(Engine.game_engine.GameEngine.get_instance().get_running_ticks() - self.t0)
 			
 			direction = get_direction_requested(action_events)
-			event.post(event.Event(THROW_EVENT, {"throwing_type": ThrowingType.THROW,
-			                                     "character": self.character,
-			                                     "direction": direction,
-			                                     "position": self.character.position,
-			                                     "velocity_efficiency": vel_eff}))
+			MessageBus.get_instance().post(ThrowMessage(ThrowingType.THROW, self.character, direction,
+															self.character.position, vel_eff))
 		
 	def next(self, action_events, **kwargs):
 		"""
 		Function called to change (or stay same) state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return a state
 		:rtype State:
@@ -194,11 +232,13 @@ class Serving(CharacterState):
 	"""
 
 	type = CharacterStateType.SERVING
+	_state_fields = ("t0", "has_served")
 
 	def __init__(self, character, action_events=None, **kwargs):
 		super().__init__(character)
 		character.reset()
 		
+		self.t0 = None
 		self.has_served = False
 		if action_events is None:
 			action_events = []
@@ -208,7 +248,7 @@ class Serving(CharacterState):
 		"""
 		Main function for this state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return: None
 		"""
@@ -217,16 +257,14 @@ class Serving(CharacterState):
 			self.t0 = Engine.game_engine.GameEngine.get_instance().get_running_ticks()
 			self.has_served = True
 			direction = get_direction_requested(action_events)
-			event.post(event.Event(THROW_EVENT, {"throwing_type": ThrowingType.SERVE,
-			                                     "character": self.character,
-			                                     "direction": direction,
-			                                     "position": self.character.position}))
+			MessageBus.get_instance().post(ThrowMessage(ThrowingType.SERVE, self.character, direction,
+															self.character.position))
 
 	def next(self, action_events, **kwargs):
 		"""
 		Function called to change (or stay same) state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return a state
 		:rtype State:
@@ -245,6 +283,7 @@ class Jumping(CharacterState):
 	"""
 
 	type = CharacterStateType.JUMPING
+	_state_fields = ("has_smashed",)
 	
 	def __init__(self, character, action_events=None, **kwargs):
 		super().__init__(character)
@@ -255,23 +294,21 @@ class Jumping(CharacterState):
 		"""
 		Main function for this state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return: None
 		"""
 		if self.character.is_colliding_ball and is_throwing_requested(action_events) and not self.has_smashed:
 			self.has_smashed = True
 			direction = get_direction_requested(action_events)
-			event.post(event.Event(THROW_EVENT, {"throwing_type": ThrowingType.SMASH,
-			                                     "character": self.character,
-			                                     "direction": direction,
-			                                     "position": self.character.position}))
+			MessageBus.get_instance().post(ThrowMessage(ThrowingType.SMASH, self.character, direction,
+															self.character.position))
 
 	def next(self, action_events, **kwargs):
 		"""
 		Function called to change (or stay same) state, usually called at each frame.
 
-		:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+		:param list[ActionMessage] action_events: list of action events
 		:param kwargs: some other parameters
 		:return a state
 		:rtype State:
@@ -292,6 +329,7 @@ class Diving(CharacterState):
 	"""
 
 	type = CharacterStateType.DIVING
+	_state_fields = ("t0", "has_touch_ball")
 
 	def __init__(self, character, action_events=None, **kwargs):
 		CharacterState.__init__(self, character)
@@ -304,9 +342,18 @@ class Diving(CharacterState):
 		if direction.x == 0 and direction.y == 0:
 			direction.y = 1 if self.character.team.id == TeamId.LEFT else -1
 
+		self.direction = direction
 		self.character.velocity = DIVE_SPEED * direction
 		self.character.set_diving_collider(direction)
 
+	def save_state(self, values):
+		CharacterState.save_state(self, values)
+		write_vector3(values, self.direction)
+
+	def load_fields(self, values):
+		CharacterState.load_fields(self, values)
+		self.direction = read_vector3(values)
+
 	def run(self, action_events, **kwargs):
 		if Engine.game_engine.GameEngine.get_instance().get_running_ticks() - self.t0 > DIVE_SLIDE_DURATION:
 			self.character.velocity = Vector3()
@@ -321,11 +368,9 @@ class Diving(CharacterState):
 			alpha = TOTAL_DURATION / DIVE_DURATION_FOR_STANDING_UP
 			vel_eff = 1.0 if x < thr else 1.0 - alpha * (x - thr)
 
-			event.post(event.Event(THROW_EVENT, {"throwing_type": ThrowingType.DRAFT,
-			                                     "character": self.character,
-			                                     "direction": get_normalized_direction_requested(action_events),
-			                                     "position": self.character.position,
-												 "velocity_efficiency": vel_eff}))
+			MessageBus.get_instance().post(ThrowMessage(ThrowingType.DRAFT, self.character,
+															get_normalized_direction_requested(action_events),
+															self.character.position, vel_eff))
 
 	def next(self, action_events, **kwargs):
 		if Engine.game_engine.GameEngine.get_instance().get_running_ticks() - self.t0 \
@@ -340,11 +385,14 @@ class Diving(CharacterState):
 		return self
 
 
+STATES_BY_TYPE = {state.type: state for state in (Idling, Running, Throwing, Serving, Jumping, Diving)}
+
+
 def is_running_requested(action_events):
 	"""
 	Return true if running action is requested.
 
-	:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+	:param list[ActionMessage] action_events: list of action events
 	:return: True if running action is requested
 	:rtype bool:
 	"""
@@ -358,7 +406,7 @@ def is_throwing_requested(action_events):
 	"""
 	Return true if throwing action is requested.
 
-	:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+	:param list[ActionMessage] action_events: list of action events
 	:return: True if throwing action is requested
 	:rtype bool:
 	"""
@@ -372,7 +420,7 @@ def is_jumping_requested(action_events):
 	"""
 	Return true if jumping action is requested.
 
-	:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+	:param list[ActionMessage] action_events: list of action events
 	:return: True if jumping action is requested
 	:rtype bool:
 	"""
@@ -386,7 +434,7 @@ def is_diving_requested(action_events):
 	"""
 	Return true if diving action is requested.
 
-	:param list[pygame.event.Event(ACTION_EVENT)] action_events: list of action events
+	:param list[ActionMessage] action_events: list of action events
 	:return: True if diving action is requested
 	:rtype bool:
 	"""
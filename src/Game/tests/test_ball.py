@@ -0,0 +1,39 @@
+# encoding : UTF-8
+
+from Game.ball import Ball
+from Engine.Trajectory import Trajectory, find_initial_velocity
+from pygame import Vector3
+
+import pytest
+
+
+@pytest.fixture()
+def ball():
+	return Ball(Vector3(0, -3, 1), radius=0.5)
+
+
+def test_analytic_physics_does_not_depend_on_time_step(ball):
+	origin_pos = Vector3(ball.position)
+	velocity = find_initial_velocity(origin_pos, Vector3(1, 3, 0.5), 4)
+	trajectory = Trajectory(origin_pos, Vector3(1, 3, 0.5), velocity)
+
+	positions = []
+	for dt in (7, 33):
+		ball.position = Vector3(origin_pos)
+		ball.velocity = Vector3(velocity)
+		ball.set_trajectory(trajectory)
+		for _ in range(231 // dt):
+			ball.update_physics(dt)
+		positions.append(Vector3(ball.position))
+
+	assert positions[0] == positions[1] == trajectory.get_position_at(0.231)
+	assert ball.velocity == trajectory.get_velocity_at(0.231)
+
+
+def test_euler_physics_without_trajectory(ball):
+	ball.velocity = Vector3(1, 0, 0)
+	ball.update_physics(100)
+
+	assert ball.previous_position == Vector3(0, -3, 1)
+	assert ball.position.x == pytest.approx(0.1)
+	assert ball.position.z < 1
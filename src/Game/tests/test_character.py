@@ -112,4 +112,8 @@ def test_change_collider(character):
 	assert character.collider_relative_position == char_original_collider_rel_pos
 
 
-
+def test_character_is_slotted(character):
+	assert not hasattr(character, "__dict__")
+	assert not hasattr(character.collider, "__dict__")
+	with pytest.raises(AttributeError):
+		character.unknown_attribute = 0
@@ -12,13 +12,38 @@ FORCE_WINDOW_SCALE_FACTOR = None  # None to disable or a float
 IS_WINDOW_SCALE_FACTOR_2POW = True
 IS_WINDOW_SCALE_FACTOR_INT = True
 IS_WINDOW_IN_FULL_SCREEN_MODE = False
+SCALED_SURFACE_CACHE_MAX_SIZE = 4 * 2**20  # in bytes, max memory of scaled sprite images kept for reuse
 
 # TIME
-NOMINAL_FRAME_RATE = 30
+NOMINAL_FRAME_RATE = 60  # max render frame rate, 0 to not limit it
+PHYSICS_FRAME_RATE = 120  # physics steps per simulated second, whatever render frame rate
 TIME_SPEED = 1  # < 1 to slow down, > 1 to speed up
+FIXED_DT = 1000 / PHYSICS_FRAME_RATE  # in ms, time between 2 physics steps
+MAX_FRAME_DURATION = 250  # in ms, max time simulated for a rendered frame, to recover from long hitches
+
+# REPLAY
+REPLAY_KEYFRAME_INTERVAL = 10 * PHYSICS_FRAME_RATE  # in frames, time between 2 world state keyframes in replay files
+
+# NETPLAY
+NETPLAY_PORT = 7000
+NETPLAY_INPUT_DELAY = 8  # in frames, delay before using local inputs, to reduce rollbacks
+NETPLAY_MAX_ROLLBACK_FRAMES = 32  # in frames, maximum number of frames simulated without confirmed inputs
+
+# PROFILING
+PROFILER_FRAMES_NB = 1000  # number of last frames which phases timings are kept by profiler
+BENCHMARK_REPEATS = 21  # number of timed samples of each benchmark, median one is compared
+BENCHMARK_REGRESSION_THRESHOLD = 0.2  # relative slowdown from baseline, over samples spreads, of a regression
 
 # PHYSICS
 G = 10
+BALL_ANALYTIC_INTEGRATION = True  # if True, ball position is evaluated from its trajectory, else gravity is integrated
+SOLVER_CACHE_SIZE = 1024  # max number of cached results for each trajectory solver function
+SOLVER_CACHE_QUANTUM = 1e-3  # in m, m/s or s, solver inputs are rounded to multiples of this value to be cached
+
+# COLLISIONS
+BROADPHASE_CELL_SIZE = 1  # in m, size of broadphase grid cells over court area
+BROADPHASE_MIN_COLLIDERS_NB = 12  # under this number of colliders, all pairs are tested without broadphase grid
+BATCHED_COLLISIONS_MIN_PAIRS_NB = 48  # under this number of candidate pairs, pairs are tested one by one
 
 # CAMERA
 CAMERA_POS = (11, -1, 7)
@@ -60,6 +85,11 @@ DIVE_SPEED = 6							# in m/s
 DIVE_SLIDE_DURATION = 170				# in ms
 DIVE_DURATION_FOR_STANDING_UP = 500		# in ms
 
+# AI REACHABILITY TABLES
+REACHABILITY_TIME_STEP = 10				# in ms, time step of run and dive reach tables
+REACHABILITY_MAX_TIME = 3000			# in ms, reach is constant after this time
+REACHABILITY_HEIGHT_STEP = 0.02			# in m, height step of jump time table
+
 # THROW PARAMETERS
 THROW_CENTER = Vector3(0, 3, BALL_RADIUS)
 THROW_AMP_DIR = (2, 1.4)
@@ -92,10 +122,8 @@ class PlayerAction(Enum):
 	SPACE_TEST = 13
 
 
-# events
-ACTION_EVENT = USEREVENT + 1
-THROW_EVENT = USEREVENT + 2
-RULES_BREAK_EVENT = USEREVENT + 3
+# messages
+MESSAGE_BUS_CAPACITY = 64  # initial number of messages of each type in a frame, buffers grow if needed
 
 
 # throwing type
@@ -144,6 +172,7 @@ class GEStateType(Enum):
 	PAUSING = 0
 	RUNNING = 1
 	ON_MENU = 2
+	REPLAYING = 3
 
 
 # CHARACTER STATES
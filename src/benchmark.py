@@ -0,0 +1,55 @@
+# encoding : UTF-8
+
+from os import environ, path
+environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # disable welcome message from pygame
+environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # benchmarks are headless, no window is needed
+import argparse
+import sys
+
+import pygame
+
+from Settings import *
+
+
+DEFAULT_BASELINE = "Engine/Benchmark/baseline.json"
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Time engine hot paths and compare them to a baseline.")
+	parser.add_argument("-o", "--output", default=None, help="JSON file to write results in")
+	parser.add_argument("-b", "--baseline", default=DEFAULT_BASELINE, help="JSON results to compare with")
+	parser.add_argument("-t", "--threshold", type=float, default=BENCHMARK_REGRESSION_THRESHOLD,
+						help="relative slowdown above which a benchmark is a regression, 0.2 for 20 %%")
+	parser.add_argument("-r", "--repeats", type=int, default=BENCHMARK_REPEATS, help="number of samples of benchmarks")
+	parser.add_argument("-k", "--only", nargs="+", default=None, metavar="NAME", help="names of benchmarks to run")
+	parser.add_argument("--update-baseline", action="store_true", help="write results in baseline file")
+	args = parser.parse_args()
+
+	pygame.init()
+	from Engine.Benchmark import BENCHMARKS, MEMORY_BENCHMARKS, run_benchmarks, compare_to_baseline, merge_results, \
+		save_results, load_results
+
+	results = run_benchmarks(BENCHMARKS, args.only, args.repeats, verbose=True, memory_benchmarks=MEMORY_BENCHMARKS)
+	if args.output is not None:
+		save_results(results, args.output)
+
+	if args.update_baseline:
+		# only run benchmarks are replaced, with --only
+		baseline = load_results(args.baseline) if path.exists(args.baseline) else {}
+		save_results(merge_results(baseline, results), args.baseline)
+		print("baseline {} updated".format(args.baseline))
+		sys.exit(0)
+
+	if not path.exists(args.baseline):
+		print("\nno baseline {}, record one on this machine with --update-baseline".format(args.baseline))
+		sys.exit(2)
+	baseline = load_results(args.baseline)
+	ratios, regressions = compare_to_baseline(results, baseline, args.threshold)
+	print("\ncompared to {}:".format(args.baseline))
+	for name, ratio in ratios.items():
+		print("{:<40}{:>+8.1f} %{}".format(name, 100 * (ratio - 1), "  REGRESSION" if name in regressions else ""))
+	for name, result in results["memory"].items():
+		reference = baseline.get("memory", {}).get(name)
+		if reference is not None:
+			print("{:<40}{:>+8.0f} B/object".format(name, result["bytes_per_object"] - reference["bytes_per_object"]))
+	sys.exit(1 if regressions else 0)
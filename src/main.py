@@ -2,17 +2,38 @@
 
 from os import environ
 environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # disable welcome message from pygame
+import argparse
 import pygame
 
 from Engine import GameEngine
+from Engine.Actions import ActionRecorder
+from Engine.Replay import ReplayReader
 
 
 if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Volley-ball game")
+	parser.add_argument("--seed", type=int, default=None, help="seed of random generator, for a deterministic game")
+	parser.add_argument("--record", metavar="PATH", default=None, help="record actions of the game in a JSON file")
+	parser.add_argument("--replay", metavar="PATH", default=None, help="replay actions recorded in a JSON file")
+	parser.add_argument("--save-replay", metavar="PATH", default=None, help="write game frames in a binary replay file")
+	parser.add_argument("--play-replay", metavar="PATH", default=None, help="play back a binary replay file")
+	parser.add_argument("--profile", metavar="PATH", default=None,
+						help="time phases of each frame and export last frames timings in a CSV or JSON file")
+	args = parser.parse_args()
+
 	pygame.init()
 
-	game_engine = GameEngine()
+	replay = ActionRecorder.load(args.replay) if args.replay is not None else None
+	playback = ReplayReader(args.play_replay) if args.play_replay is not None else None
+	game_engine = GameEngine(seed=args.seed, record_actions=args.record is not None, replay=replay,
+							 replay_filename=args.save_replay, playback=playback,
+							 profiler_filename=args.profile)
 	game_engine.run()
 
+	if args.record is not None:
+		game_engine.action_recorder.save(args.record)
+	if playback is not None:
+		playback.close()
+
 	pygame.display.quit()
 	pygame.quit()
-	
\ No newline at end of file
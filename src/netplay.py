@@ -0,0 +1,125 @@
+# encoding : UTF-8
+
+from os import environ
+environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # disable welcome message from pygame
+import argparse
+import sys
+from time import perf_counter, sleep
+
+import pygame
+
+from Settings import *
+
+
+def run_netplay(player, local_port, remote_address, frames_nb=None, bots=False, headless=False, seed=0,
+				latency=0, loss=0., frame_rate=None, timeout=None):
+	"""
+	Play a 1v1 game against a remote peer with rollback netcode.
+
+	Each peer simulates the game and only sends actions of its local player. Both peers must use same seed and players
+	type.
+
+	:param int player: index of local player (0: left team, 1: right team)
+	:param int local_port: local UDP port
+	:param tuple(str, int) remote_address: host and UDP port of remote peer
+	:param int frames_nb: if specified, game stops when this number of frames is simulated and synchronized
+	:param bool bots: if True, local player is a bot
+	:param bool headless: if True, nothing is displayed and inputs are not read
+	:param int seed: seed of game engine random generator
+	:param float latency: artificial latency in ms of outgoing packets
+	:param float loss: artificial loss probability of outgoing packets
+	:param float frame_rate: simulated frames per second, default is physics frame rate of game engine time step
+	:param float timeout: if specified, game stops after this time in s, even if peers are not synchronized
+	:return: number of simulated frames, final checksum and rollback session
+	:rtype tuple(int, int, RollbackSession):
+	"""
+	from Engine import GameEngine
+	from Engine.Network import RollbackSession, UdpTransport, GameSimulation, encode_inputs_packet, \
+		decode_inputs_packet
+
+	pygame.init()
+	player_id_list = [AIId.AI_ID_1, AIId.AI_ID_2] if bots else [PlayerId.PLAYER_ID_1, PlayerId.PLAYER_ID_2]
+	game_engine = GameEngine(headless=headless, player_id_list=player_id_list, seed=seed)
+
+	simulation = GameSimulation(game_engine)
+	session = RollbackSession(simulation, players_nb=2, local_player=player)
+	remote_player = 1 - player
+	transport = UdpTransport(local_port, remote_address, latency, loss)
+
+	remote_ack_frame = -1  # last local input frame received by remote peer
+	frame_duration = 1 / frame_rate if frame_rate is not None else game_engine.fixed_dt / 1000
+	render_duration = 1 / NOMINAL_FRAME_RATE if NOMINAL_FRAME_RATE > 0 else 0
+	t0 = next_frame_time = next_render_time = perf_counter()
+	end_time = None
+
+	while not game_engine.done:
+		# remote inputs
+		for packet in transport.receive():
+			ack_frame, first_frame, remote_inputs = decode_inputs_packet(packet)
+			remote_ack_frame = max(remote_ack_frame, ack_frame)
+			for i, remote_input in enumerate(remote_inputs):
+				session.add_remote_input(remote_player, first_frame + i, remote_input)
+
+		if frames_nb is not None and session.current_frame >= frames_nb:
+			# wait for all inputs, then let some time for remote peer to receive acknowledgment
+			if end_time is None and session.get_confirmed_frame() >= frames_nb - 1 \
+					and remote_ack_frame >= frames_nb - 1:
+				end_time = perf_counter() + 0.5
+			if end_time is not None and perf_counter() > end_time:
+				break
+		elif session.can_advance():
+			session.add_local_input(simulation.get_local_input(player))
+			session.advance()
+
+			# frames are simulated at physics rate, and displayed at most at nominal frame rate
+			if not headless and perf_counter() >= next_render_time:
+				game_engine.render(interpolation_alpha=1.)
+				next_render_time = perf_counter() + render_duration
+
+		# local inputs which are not acknowledged yet are sent again
+		transport.send(encode_inputs_packet(session.get_confirmed_frame(remote_player), remote_ack_frame + 1,
+											session.get_local_inputs(remote_ack_frame + 1)))
+
+		if timeout is not None and perf_counter() - t0 > timeout:
+			print("timeout")
+			break
+
+		next_frame_time += frame_duration
+		sleep(max(0., next_frame_time - perf_counter()))
+
+	session.synchronize()
+	transport.close()
+	return session.current_frame, simulation.get_checksum(), session
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="1v1 game between 2 peers with rollback netcode")
+	parser.add_argument("player", type=int, choices=(0, 1), help="local player: 0 (left team) or 1 (right team)")
+	parser.add_argument("--port", type=int, default=None, help="local UDP port, default is NETPLAY_PORT + player")
+	parser.add_argument("--remote-host", default="127.0.0.1", help="host of remote peer")
+	parser.add_argument("--remote-port", type=int, default=None,
+						help="UDP port of remote peer, default is NETPLAY_PORT + remote player")
+	parser.add_argument("-f", "--frames", type=int, default=None, help="number of frames to play")
+	parser.add_argument("--bots", action="store_true", help="local player is a bot")
+	parser.add_argument("--headless", action="store_true", help="no window and no inputs, with --bots")
+	parser.add_argument("--seed", type=int, default=0, help="seed of random generator, same for both peers")
+	parser.add_argument("--latency", type=float, default=0, help="artificial latency in ms")
+	parser.add_argument("--loss", type=float, default=0, help="artificial packet loss probability")
+	parser.add_argument("--fps", type=float, default=None, help="simulated frame rate, default is physics frame rate")
+	parser.add_argument("--timeout", type=float, default=None, help="max duration in s")
+	args = parser.parse_args()
+
+	if args.headless:
+		environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+	port = args.port if args.port is not None else NETPLAY_PORT + args.player
+	remote_port = args.remote_port if args.remote_port is not None else NETPLAY_PORT + 1 - args.player
+
+	frame, checksum, rollback_session = run_netplay(args.player, port, (args.remote_host, remote_port), args.frames,
+													args.bots, args.headless, args.seed, args.latency, args.loss,
+													args.fps, args.timeout)
+	print("frame {} checksum {:08x} rollbacks {} rolled back frames {}".format(
+		frame, checksum, rollback_session.rollbacks_nb, rollback_session.rollback_frames_nb))
+
+	pygame.quit()
+	sys.exit(0 if args.frames is None or frame >= args.frames else 1)
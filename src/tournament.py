@@ -0,0 +1,131 @@
+# encoding : UTF-8
+
+from os import environ, devnull, cpu_count
+environ['PYGAME_HIDE_SUPPORT_PROMPT'] = '1'  # disable welcome message from pygame
+environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # matches are headless, no window is needed
+import argparse
+import json
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout, nullcontext
+from time import perf_counter
+
+import pygame
+
+from Settings import *
+
+
+# bots configurations, by name: function which builds behaviour tree of an AIEntity, None for default 1v1 behaviour
+# tree. Configurations are given to worker processes by name.
+AI_CONFIGURATIONS = {
+	"1v1": None,
+}
+DEFAULT_AI_CONFIGURATION = "1v1"
+
+
+def play_match(match_id, target_score, max_duration, seed,
+			   configurations=(DEFAULT_AI_CONFIGURATION, DEFAULT_AI_CONFIGURATION)):
+	"""
+	Play a headless match between 2 bots, until a team reaches target score.
+
+	This function is run in a worker process, which builds its own game engine. A match is deterministic: it is played
+	again with same results from its seed.
+
+	:param int match_id: match index
+	:param int target_score: score to reach to win match
+	:param float max_duration: max running time in ms of match, to stop a match which never ends
+	:param int seed: seed of game engine
+	:param tuple(str, str) configurations: names of configurations of left and right bots, in AI_CONFIGURATIONS
+	:return: match results
+	:rtype dict:
+	"""
+	from Engine import GameEngine
+
+	t0 = perf_counter()
+	with open(devnull, "w") as null_output, redirect_stdout(null_output):  # game engine prints rules breaks
+		pygame.init()
+		player_id_list = [AIId.AI_ID_1, AIId.AI_ID_2]
+		factories = {ai_id: AI_CONFIGURATIONS[name] for ai_id, name in zip(player_id_list, configurations)}
+		game_engine = GameEngine(headless=True, player_id_list=player_id_list, seed=seed,
+								 behaviour_tree_factories=factories)
+
+		teams = game_engine.teams
+		while max(team.score for team in teams.values()) < target_score \
+				and game_engine.get_running_ticks() < max_duration:
+			game_engine.step()
+
+	l_score, r_score = teams[TeamId.LEFT].score, teams[TeamId.RIGHT].score
+	winner = None
+	if l_score != r_score:
+		winner = AIId.AI_ID_1.name if l_score > r_score else AIId.AI_ID_2.name
+
+	return {"match": match_id,
+			"seed": seed,
+			"configurations": list(configurations),
+			"score": [l_score, r_score],
+			"winner": winner,
+			"duration": round(game_engine.get_running_ticks() / 1000, 1),
+			"frames": game_engine.frame_count,
+			"wall_time": round(perf_counter() - t0, 2)}
+
+
+def run_tournament(matches_nb, target_score, max_duration, workers=None, output=None, seed=None,
+				   configurations=(DEFAULT_AI_CONFIGURATION, DEFAULT_AI_CONFIGURATION)):
+	"""
+	Spread matches between bots across a process pool and print results as soon as each match ends.
+
+	:param int matches_nb: number of matches to play
+	:param int target_score: score to reach to win a match
+	:param float max_duration: max running time in ms of a match
+	:param int workers: number of worker processes, number of CPUs if None
+	:param str output: if specified, path of JSON lines file where results are written
+	:param int seed: base seed of matches, seed of a match is base seed + match index. Random if None.
+	:param tuple(str, str) configurations: names of configurations of left and right bots, in AI_CONFIGURATIONS
+	:return: list of results, in matches ending order
+	:rtype list(dict):
+	"""
+	results = []
+	t0 = perf_counter()
+	if seed is None:
+		seed = random.randrange(2**32)
+	print("base seed {}, {} against {}".format(seed, *configurations))
+
+	with open(output, "w") if output is not None else nullcontext() as out_file, \
+			ProcessPoolExecutor(max_workers=workers) as executor:
+		futures = [executor.submit(play_match, i, target_score, max_duration, seed + i, configurations)
+				   for i in range(matches_nb)]
+		for future in as_completed(futures):
+			result = future.result()
+			results.append(result)
+			print("match {match}: {score[0]} - {score[1]}, winner {winner}, {duration} s simulated in {wall_time} s"
+				  .format(**result))
+			if out_file is not None:
+				out_file.write(json.dumps(result) + "\n")
+				out_file.flush()
+
+	# summary
+	wall_time = perf_counter() - t0
+	simulated_time = sum(res["duration"] for res in results)
+	for ai_id, name in zip(AIId, configurations):
+		print("{} ({}): {} wins".format(ai_id.name, name, sum(res["winner"] == ai_id.name for res in results)))
+	print("{} matches, {} s simulated in {} s".format(len(results), round(simulated_time, 1), round(wall_time, 1)))
+
+	return results
+
+
+if __name__ == "__main__":
+	parser = argparse.ArgumentParser(description="Play headless matches between bots across several processes.")
+	parser.add_argument("-n", "--matches", type=int, default=8, help="number of matches")
+	parser.add_argument("-s", "--target-score", type=int, default=5, help="score to reach to win a match")
+	parser.add_argument("-d", "--max-duration", type=float, default=600, help="max duration of a match in s")
+	parser.add_argument("-w", "--workers", type=int, default=cpu_count(), help="number of worker processes")
+	parser.add_argument("-o", "--output", default=None, help="JSON lines file to write results in")
+	parser.add_argument("--seed", type=int, default=None, help="base seed of matches, random if not specified")
+	parser.add_argument("--left", choices=AI_CONFIGURATIONS, default=DEFAULT_AI_CONFIGURATION,
+						help="configuration of left bot")
+	parser.add_argument("--right", choices=AI_CONFIGURATIONS, default=DEFAULT_AI_CONFIGURATION,
+						help="configuration of right bot")
+	args = parser.parse_args()
+
+	run_tournament(args.matches, args.target_score, 1000 * args.max_duration, args.workers, args.output, args.seed,
+				   (args.left, args.right))